@@ -0,0 +1,205 @@
+"""
+End-to-end benchmark: run the dashboard through Streamlit's AppTest
+harness against a local stub of the data-status endpoint.
+
+Usage:
+    python benchmarks/bench_app.py [payload.json] [--scales 1,10,100]
+                                   [--reruns N] [--budget benchmarks/budget.json]
+                                   [--output results.json]
+
+The recorded payload (see `stub_server.py --record`), or without one a
+synthetic catalog of --datasets datasets (see `generate_payload`), is
+served at each scale from a local stub server, so no network is needed. Every scale runs
+in a fresh process with an empty cache directory, so its first run is a
+true cold load: fetch, parse, normalize, summarize and render. The same
+session is then rerun to time a warm rerun. Sections are timed from one
+page heading (`st.title` / `st.header`) to the next; "Load" is everything
+before the first heading. Peak memory is the peak RSS of that process.
+
+With --budget, the run fails if any result exceeds its limit. The budget
+is JSON keyed by scale, e.g.
+    {"1x": {"cold_s": 7, "warm_s": 1.5, "peak_rss_mb": 500,
+            "sections": {"Published Data": 3.5}}}
+The limits in benchmarks/budget.json are the worst of three runs on the
+default synthetic catalog plus about half again, so a regression of that
+size fails while run-to-run noise does not. Re-derive them the same way
+when the page or the machine it is measured on changes.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stub_server import StubServer, generate_payload, scale_payload  # noqa: E402
+
+APP = os.path.join(ROOT, "streamlit_app.py")
+METRICS = ("cold_s", "warm_s", "peak_rss_mb")
+
+
+def peak_rss_mb() -> float:
+    """
+    Peak resident set size of this process in MB.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+def measure(url: str, reruns: int, timeout: float) -> dict:
+    """
+    Cold-load the dashboard from `url`, then rerun it; runs in a fresh
+    process so nothing is cached yet.
+
+    Returns:
+    dict: cold_s, warm_s (median rerun), peak_rss_mb and, per section,
+    its cold and median warm time.
+    """
+    cache_dir = tempfile.mkdtemp(prefix="fair-bench-")
+    os.environ["FAIR_DATA_STATUS_URL"] = url
+    os.environ["FAIR_CACHE_DIR"] = cache_dir
+    os.environ["FAIR_CACHE_BACKEND"] = ""
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    marks: List[Tuple[str, float]] = []
+
+    def timed(heading):
+        def wrapper(body, *args, **kwargs):
+            marks.append((str(body), time.perf_counter()))
+            return heading(body, *args, **kwargs)
+
+        return wrapper
+
+    st.title = timed(st.title)
+    st.header = timed(st.header)
+
+    at = AppTest.from_file(APP, default_timeout=timeout)
+
+    def run() -> Tuple[float, Dict[str, float]]:
+        marks.clear()
+        started = time.perf_counter()
+        at.run()
+        finished = time.perf_counter()
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        bounds = [("Load", started), *marks, ("", finished)]
+        sections = {
+            name: end - start for (name, start), (_, end) in zip(bounds, bounds[1:])
+        }
+        return finished - started, sections
+
+    try:
+        cold, cold_sections = run()
+        warm_runs = [run() for _ in range(reruns)]
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    warm = statistics.median(total for total, _ in warm_runs)
+    sections = {
+        name: {
+            "cold_s": seconds,
+            "warm_s": statistics.median(
+                run_sections.get(name, 0.0) for _, run_sections in warm_runs
+            ),
+        }
+        for name, seconds in cold_sections.items()
+    }
+    return {
+        "cold_s": cold,
+        "warm_s": warm,
+        "peak_rss_mb": peak_rss_mb(),
+        "sections": sections,
+    }
+
+
+def over_budget(results: Dict[str, dict], budget: Dict[str, dict]) -> List[str]:
+    """
+    Every result that exceeds its limit in `budget`.
+
+    Returns:
+    List[str]: One line per exceeded limit; empty if within budget.
+    """
+    failures = []
+    for scale, limits in budget.items():
+        result = results.get(scale)
+        if result is None:
+            continue
+        for metric in METRICS:
+            if metric in limits and result[metric] > limits[metric]:
+                failures.append(
+                    f"{scale} {metric}: {result[metric]:.2f} > {limits[metric]}"
+                )
+        for section, limit in limits.get("sections", {}).items():
+            seconds = result["sections"].get(section, {}).get("cold_s")
+            if seconds is not None and seconds > limit:
+                failures.append(f"{scale} {section}: {seconds:.2f}s > {limit}s")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("payload", nargs="?", help="recorded data-status payload")
+    parser.add_argument(
+        "--datasets", type=int, default=3000, help="synthetic catalog size"
+    )
+    parser.add_argument("--scales", default="1,10,100", help="comma-separated")
+    parser.add_argument("--reruns", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=600.0, help="per run, in s")
+    parser.add_argument("--budget", help="JSON file of limits per scale")
+    parser.add_argument("--output", help="write the results as JSON")
+    args = parser.parse_args()
+
+    if args.payload:
+        with open(args.payload, "rb") as f:
+            recorded = f.read()
+    else:
+        recorded = generate_payload(args.datasets)
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for scale in (int(scale) for scale in args.scales.split(",")):
+        label = f"{scale}x"
+        content = scale_payload(recorded, scale)
+        with StubServer(content) as stub:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                result = pool.submit(
+                    measure, stub.url, args.reruns, args.timeout
+                ).result()
+        result["payload_mb"] = len(content) / 1e6
+        results[label] = result
+        print(
+            f"{label:>5s}  payload {result['payload_mb']:7.1f} MB  "
+            f"cold {result['cold_s']:6.2f}s  warm {result['warm_s']:6.2f}s  "
+            f"peak {result['peak_rss_mb']:7.0f} MB"
+        )
+        for section, times in result["sections"].items():
+            print(
+                f"       {section:28.28s} cold {times['cold_s']:6.2f}s  "
+                f"warm {times['warm_s']:6.2f}s"
+            )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.budget:
+        with open(args.budget) as f:
+            failures = over_budget(results, json.load(f))
+        for failure in failures:
+            print(f"Over budget: {failure}")
+        if failures:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
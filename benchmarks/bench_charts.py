@@ -0,0 +1,70 @@
+"""
+Compare the server cost of the two chart modes.
+
+Usage:
+    python benchmarks/bench_charts.py payload.json [--reruns N]
+
+For every chart that has a Plotly version, measures the time to rasterize
+the matplotlib image against building and serializing the Plotly figure,
+and the bytes each sends to the browser.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fair.charts import (  # noqa: E402
+    CHARTS,
+    PUBLISHED_CHARTS,
+    UNPUBLISHED_CHARTS,
+    chart_counts,
+)
+from fair.figures import render_png  # noqa: E402
+from fair.normalize import normalize  # noqa: E402
+from fair.parse import parse_datasets  # noqa: E402
+from fair.plots import PLOTS  # noqa: E402
+from fair.snapshot import Snapshot  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("payload", help="saved data-status payload")
+    parser.add_argument("--reruns", type=int, default=3)
+    args = parser.parse_args()
+
+    with open(args.payload, "rb") as f:
+        snapshot = Snapshot.from_frame(normalize(parse_datasets(f.read())))
+    counts = chart_counts(snapshot, PUBLISHED_CHARTS + UNPUBLISHED_CHARTS)
+
+    print(
+        f"{'chart':30} {'image ms':>9} {'image KB':>9} {'plotly ms':>10} {'plotly KB':>10}"
+    )
+    totals = [0.0, 0, 0.0, 0]
+    for name, series in counts.items():
+        start = time.perf_counter()
+        for _ in range(args.reruns):
+            image = render_png(CHARTS[name], series)
+        image_time = (time.perf_counter() - start) / args.reruns
+
+        start = time.perf_counter()
+        for _ in range(args.reruns):
+            spec = PLOTS[name](series).to_json()
+        plot_time = (time.perf_counter() - start) / args.reruns
+
+        row = [image_time * 1000, len(image), plot_time * 1000, len(spec)]
+        totals = [total + value for total, value in zip(totals, row)]
+        print(
+            f"{name:30} {row[0]:9.1f} {row[1] / 1024:9.1f}"
+            f" {row[2]:10.1f} {row[3] / 1024:10.1f}"
+        )
+    print(
+        f"{'total':30} {totals[0]:9.1f} {totals[1] / 1024:9.1f}"
+        f" {totals[2]:10.1f} {totals[3] / 1024:10.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Startup benchmark: how long the dashboard's imports take before the
+first element can be sent, measured with `python -X importtime`.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs N] [--against REF]
+                                       [--max-ms MS]
+
+The module-level imports of streamlit_app.py are run in a fresh
+interpreter N times. Reported are the median cumulative import time of
+each package the app imports (a dependency counts toward whichever
+package imports it first), and the time spent in the modules of each of
+the heavy visualization packages (matplotlib, wordcloud, plotly),
+wherever they were imported from; "-" means not loaded at all. With
+--against, the same is measured for another git revision, exported to a
+temporary directory, so an improvement shows up side by side. Exits
+non-zero if the median total exceeds --max-ms.
+"""
+
+import argparse
+import ast
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+from collections import defaultdict
+from typing import Dict, Set, Tuple
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+HEAVY = ("matplotlib", "wordcloud", "plotly")
+TOTAL = "total"
+
+
+def app_imports(root: str) -> Tuple[str, Set[str]]:
+    """
+    The module-level import statements of streamlit_app.py under `root`.
+
+    Returns:
+    Tuple[str, Set[str]]: The statements, and the top-level packages
+    they name.
+    """
+    with open(os.path.join(root, "streamlit_app.py")) as f:
+        tree = ast.parse(f.read())
+    nodes = [
+        node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))
+    ]
+    packages = set()
+    for node in nodes:
+        if isinstance(node, ast.Import):
+            packages.update(alias.name.split(".")[0] for alias in node.names)
+        else:
+            packages.add(node.module.split(".")[0])
+    return "\n".join(ast.unparse(node) for node in nodes), packages
+
+
+def import_times(root: str, code: str, packages: Set[str]) -> Dict[str, float]:
+    """
+    Run `code` under -X importtime in a fresh interpreter.
+
+    Returns:
+    Dict[str, float]: Cumulative ms per package in `packages`, per heavy
+    package loaded, and in total.
+    """
+    env = dict(os.environ, PYTHONPATH=root)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=root,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = defaultdict(float)
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:") :].split("|")
+        package = name.strip().split(".")[0]
+        if package in HEAVY:
+            times[f"{package} loaded"] += int(own) / 1000
+        top_level = name[1:2] != " "  # Not imported by another module
+        if top_level and package in packages:
+            times[package] += int(cumulative) / 1000
+            times[TOTAL] += int(cumulative) / 1000
+    return times
+
+
+def measure(root: str, runs: int) -> Dict[str, float]:
+    """
+    Median import times over `runs` fresh interpreters.
+    """
+    code, packages = app_imports(root)
+    samples = [import_times(root, code, packages) for _ in range(runs)]
+    names = {name for sample in samples for name in sample}
+    return {
+        name: statistics.median(sample.get(name, 0.0) for sample in samples)
+        for name in names
+    }
+
+
+def export(ref: str, directory: str) -> str:
+    """
+    Extract the tree of git revision `ref` into `directory`.
+    """
+    archive = os.path.join(directory, "tree.tar")
+    subprocess.run(
+        ["git", "archive", "--format=tar", "-o", archive, ref], cwd=ROOT, check=True
+    )
+    with tarfile.open(archive) as tar:
+        tar.extractall(directory, filter="data")
+    return directory
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--against", metavar="REF", help="git revision to compare")
+    parser.add_argument("--max-ms", type=float, help="fail above this median total")
+    args = parser.parse_args()
+
+    results = {"working tree": measure(ROOT, args.runs)}
+    if args.against:
+        with tempfile.TemporaryDirectory() as directory:
+            results[args.against] = measure(export(args.against, directory), args.runs)
+
+    columns = list(results)
+    packages = sorted(
+        {name for times in results.values() for name in times if " " not in name},
+        key=lambda name: (name == TOTAL, -results[columns[0]].get(name, 0.0)),
+    )
+    print(f"{'package':20s}" + "".join(f"{column:>16.16s}" for column in columns))
+    for package in packages:
+        row = "".join(
+            f"{results[column].get(package, 0.0):14.1f}ms" for column in columns
+        )
+        print(f"{package:20s}{row}")
+    for package in HEAVY:
+        loaded = [results[column].get(f"{package} loaded") for column in columns]
+        row = "".join(f"{'-':>16s}" if ms is None else f"{ms:14.1f}ms" for ms in loaded)
+        print(f"{package + ' loaded':20s}{row}")
+
+    total = results["working tree"][TOTAL]
+    if args.max_ms is not None and total > args.max_ms:
+        print(
+            f"Startup imports take {total:.0f}ms, over the {args.max_ms:.0f}ms budget"
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
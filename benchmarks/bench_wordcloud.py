@@ -0,0 +1,88 @@
+"""
+Measure what caching the group word cloud saves on each rerun.
+
+Usage:
+    python benchmarks/bench_wordcloud.py [payload.json] [--reruns N]
+
+Compares drawing the word cloud from scratch, as every rerun used to,
+with fetching it from a ChartCache: first from memory, then from a cold
+process that only has the on-disk (SQLite) copy. Without a payload file a
+synthetic set of group frequencies is used.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fair.backends import SQLiteBackend  # noqa: E402
+from fair.charts import CHARTS, ChartCache, counts_hash  # noqa: E402
+from fair.figures import render_png  # noqa: E402
+
+
+def group_counts(path: str) -> pd.Series:
+    """
+    Published datasets per group, from a payload file or made up.
+    """
+    if path is None:
+        names = [f"Research Group {i} TMC" for i in range(40)]
+        return pd.Series(range(400, 0, -10), index=names)
+
+    from fair.normalize import normalize
+    from fair.parse import parse_datasets
+    from fair.snapshot import Snapshot
+
+    with open(path, "rb") as f:
+        snapshot = Snapshot.from_frame(normalize(parse_datasets(f.read())))
+    return snapshot.published_summary.by_group
+
+
+def timed(fn, repeat: int) -> float:
+    """
+    Mean seconds per call of `fn` over `repeat` calls.
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("payload", nargs="?", help="saved data-status payload")
+    parser.add_argument("--reruns", type=int, default=5)
+    args = parser.parse_args()
+
+    counts = group_counts(args.payload)
+    key = ("group_wordcloud", counts_hash(counts))
+
+    def render():
+        return render_png(CHARTS["group_wordcloud"], counts)
+
+    with tempfile.TemporaryDirectory() as directory:
+        backend = SQLiteBackend(os.path.join(directory, "cache.sqlite3"))
+        uncached = timed(render, args.reruns)
+
+        cache = ChartCache(backend=backend)
+        cache.get_or_render(key, render)  # first rerun after a snapshot change
+        memory = timed(lambda: cache.get_or_render(key, render), args.reruns * 100)
+
+        def cold_process():
+            ChartCache(backend=backend).get_or_render(key, render)
+
+        disk = timed(cold_process, args.reruns * 10)
+
+    print(f"groups:            {len(counts)}")
+    print(f"render every time: {uncached * 1000:9.2f} ms per rerun")
+    print(f"memory cache hit:  {memory * 1000:9.4f} ms per rerun")
+    print(f"disk cache hit:    {disk * 1000:9.2f} ms per process start")
+    print(f"saving per rerun:  {(uncached - memory) * 1000:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
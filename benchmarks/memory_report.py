@@ -0,0 +1,69 @@
+"""
+Compare the memory footprint of the compact snapshot frame with the
+frame the dashboard used to build straight from the JSON payload.
+
+Usage:
+    python benchmarks/memory_report.py [payload.json]
+
+Without a file the live data-status endpoint is fetched.
+"""
+
+import json
+import os
+import sys
+
+import pandas as pd
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fair.client import DATA_STATUS_URL  # noqa: E402
+from fair.normalize import normalize  # noqa: E402
+from fair.parse import parse_datasets  # noqa: E402
+
+
+def legacy_frame(content: bytes) -> pd.DataFrame:
+    """
+    The frame as the dashboard built it before the compact schema.
+    """
+    # Object columns, as pandas < 3 builds them from a list of dicts
+    df = pd.DataFrame(json.loads(content)["data"]).astype(object)
+    df["dataset_status"] = df["dataset_type"].map(
+        lambda t: "Derived" if "[" in t and "]" in t else "Primary"
+    )
+    return df
+
+
+def memory_report(content: bytes) -> pd.DataFrame:
+    """
+    Deep memory use per column of the legacy and compact frames.
+
+    Returns:
+    pd.DataFrame: Bytes per column for both frames, plus a total row.
+    """
+    legacy = legacy_frame(content).memory_usage(deep=True, index=False)
+    compact = normalize(parse_datasets(content)).memory_usage(deep=True, index=False)
+    report = pd.DataFrame({"legacy": legacy, "compact": compact})
+    report.loc["total"] = report.sum()
+    return report.fillna(0).astype("int64")
+
+
+def main() -> None:
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], "rb") as f:
+            content = f.read()
+    else:
+        content = requests.get(DATA_STATUS_URL, timeout=(5, 60)).content
+
+    report = memory_report(content)
+    print(report.to_string())
+    total = report.loc["total"]
+    print(
+        f"\nlegacy {total['legacy'] / 1e6:.1f} MB, "
+        f"compact {total['compact'] / 1e6:.1f} MB, "
+        f"{total['legacy'] / total['compact']:.1f}x smaller"
+    )
+
+
+if __name__ == "__main__":
+    main()
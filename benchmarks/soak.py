@@ -0,0 +1,148 @@
+"""
+Soak test: rerun the dashboard and redraw every chart many times and check
+that resident memory and the number of live matplotlib figures stay flat.
+
+Usage:
+    python benchmarks/soak.py payload.json [--reruns N] [--renders N]
+                                           [--max-growth-mb MB]
+
+The payload is preloaded into a temporary snapshot store, so no network is
+needed. Exits non-zero if memory grows by more than the budget after the
+warm-up, or if any matplotlib Figure is still alive after a collection.
+"""
+
+import argparse
+import gc
+import os
+import resource
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+
+def rss_mb() -> float:
+    """
+    Current resident set size in MB (peak RSS where /proc is unavailable).
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+def seed_store(payload_path: str, cache_dir: str) -> None:
+    """
+    Point the dashboard at `cache_dir` and store the payload there as fresh.
+    """
+    os.environ["FAIR_CACHE_DIR"] = cache_dir
+    os.environ["FAIR_CACHE_BACKEND"] = ""
+    os.environ["FAIR_MAX_AGE"] = str(24 * 60 * 60)
+    from fair.store import SnapshotStore, StoredPayload
+
+    with open(payload_path, "rb") as f:
+        SnapshotStore().write(StoredPayload(content=f.read(), fetched_at=time.time()))
+
+
+def live_figures() -> int:
+    """
+    Number of matplotlib Figure objects still reachable after a collection.
+
+    Charts are built with the object-oriented API and never registered
+    with pyplot, so `plt.get_fignums()` would not see a leaked one.
+    """
+    from matplotlib.figure import Figure
+
+    gc.collect()
+    return sum(isinstance(obj, Figure) for obj in gc.get_objects())
+
+
+def soak(label: str, step, iterations: int, warmup: int) -> tuple:
+    """
+    Call `step(i)` repeatedly; return (memory growth after warm-up, figures).
+    """
+    baseline = None
+    for i in range(iterations):
+        step(i)
+        if i + 1 == warmup:
+            gc.collect()
+            baseline = rss_mb()
+    gc.collect()
+    growth = rss_mb() - (baseline if baseline is not None else rss_mb())
+    figures = live_figures()
+    print(
+        f"{label:8s} {iterations:5d} iterations  +{growth:6.1f} MB  {figures} figures"
+    )
+    return growth, figures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("payload", help="saved data-status payload")
+    parser.add_argument("--reruns", type=int, default=50)
+    parser.add_argument("--renders", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--max-growth-mb", type=float, default=25.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        seed_store(args.payload, cache_dir)
+
+        from streamlit.testing.v1 import AppTest
+
+        from fair.charts import CHARTS, chart_counts
+        from fair.figures import render_png
+        from fair.normalize import normalize
+        from fair.parse import parse_datasets
+        from fair.scoring import FairScores
+        from fair.trends import Trends
+        from fair.snapshot import Snapshot
+
+        app = AppTest.from_file(os.path.join(ROOT, "streamlit_app.py"))
+        app.default_timeout = 120
+        app.run()
+        options = [tab.label for tab in app.tabs]
+
+        def rerun(i):
+            app.session_state["unpublished_view"] = options[i % len(options)]
+            app.run()
+            if app.exception:
+                raise RuntimeError(app.exception[0].message)
+
+        with open(args.payload, "rb") as f:
+            snapshot = Snapshot.from_frame(normalize(parse_datasets(f.read())))
+        trends = Trends.from_frame(snapshot.frame)
+        counts = {
+            **chart_counts(snapshot),
+            "score_distribution": FairScores.from_frame(snapshot.frame).distribution(),
+            "trend_growth": trends.growth("organ"),
+            "trend_backlog": trends.backlog(),
+            "trend_has_donor_metadata": trends.share("has_donor_metadata"),
+            "trend_has_contributors": trends.share("has_contributors", "group_name"),
+            "trend_has_contacts": trends.share("has_contacts"),
+        }
+
+        def render(i):
+            for name, draw in CHARTS.items():
+                render_png(draw, counts[name])
+
+        results = [
+            soak("reruns", rerun, args.reruns, args.warmup),
+            soak("renders", render, args.renders, args.warmup),
+        ]
+
+    failed = False
+    for growth, figures in results:
+        if growth > args.max_growth_mb or figures:
+            failed = True
+    print("FAIL" if failed else "OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+"""
+Local stand-in for the data-status endpoint, serving a recorded payload
+as is or scaled up, so the dashboard runs without network access.
+
+Usage:
+    python benchmarks/stub_server.py payload.json [--scale N] [--port PORT]
+    python benchmarks/stub_server.py --generate 3000 [--seed S] [--port PORT]
+    python benchmarks/stub_server.py --record payload.json
+
+Then point the dashboard at it:
+    FAIR_DATA_STATUS_URL=http://127.0.0.1:8765/datasets/data-status \\
+        streamlit run streamlit_app.py
+
+A scaled payload repeats every dataset N times, each copy with its own
+uuid and HuBMAP ID, so it looks like a catalog N times the size. Without
+a recorded payload, --generate serves a synthetic catalog that is the
+same for the same size and seed, so benchmarks can run offline.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+PATH = "/datasets/data-status"
+PORTAL = "https://portal.hubmapconsortium.org"
+ORGANS = (
+    "Heart",
+    "Kidney (Left)",
+    "Kidney (Right)",
+    "Liver",
+    "Lung (Left)",
+    "Lymph Node",
+    "Small Intestine",
+    "Spleen",
+)
+DATASET_TYPES = (
+    "CODEX",
+    "CODEX [Cytokit + SPRM]",
+    "Histology",
+    "MALDI",
+    "snATAC-seq [SnapATAC]",
+    "snRNA-seq",
+    "Visium [Salmon]",
+)
+GROUPS = (
+    "Broad Institute RTI",
+    "California Institute of Technology TMC",
+    "Stanford TMC",
+    "University of California San Diego TMC",
+    "University of Florida TMC",
+    "Vanderbilt TMC",
+)
+STATUSES = ("Published",) * 6 + ("QA", "New", "Invalid", "Error", "Submitted")
+
+
+def generate_payload(datasets: int = 3000, seed: int = 0) -> bytes:
+    """
+    A synthetic data-status payload shaped like the real one: the same
+    fields, a little over half the datasets published, and a few hundred
+    donors.
+
+    Returns:
+    bytes: The payload as JSON; the same for the same arguments.
+    """
+    rng = random.Random(seed)
+    data = []
+    for i in range(datasets):
+        status = rng.choice(STATUSES)
+        public = status == "Published" and rng.random() < 0.7
+        uuid = f"{rng.getrandbits(128):032x}"
+        data.append(
+            {
+                "uuid": uuid,
+                "hubmap_id": f"HBM{i // 1000:03d}.ABCD.{i % 1000:03d}",
+                "organ": rng.choice(ORGANS),
+                "dataset_type": rng.choice(DATASET_TYPES),
+                "group_name": rng.choice(GROUPS),
+                "created_timestamp": 1546300800000 + rng.randint(0, 5 * 365 * 86400000),
+                "last_touch": "2024-07-01 12:00:00",
+                "data_access_level": (
+                    "public" if public else rng.choice(("protected", "consortium"))
+                ),
+                "status": status,
+                "donor_hubmap_id": f"HBM{rng.randint(0, 300):03d}.DONR.000",
+                "has_data": rng.random() < 0.95,
+                "has_donor_metadata": rng.random() < 0.8,
+                "has_contributors": rng.random() < 0.7,
+                "has_contacts": rng.random() < 0.6,
+                "has_rui_info": rng.choice(("True", "False")),
+                "provider_experiment_id": f"exp-{i}",
+                "portal_url": f"{PORTAL}/browse/dataset/{uuid}",
+                "ingest_url": f"https://ingest.hubmapconsortium.org/dataset/{uuid}",
+                "globus_url": f"https://app.globus.org/file-manager?origin_id={uuid}",
+                "is_primary": "True",
+                "descendants": [],
+                "processing_type": "",
+            }
+        )
+    return json.dumps({"data": data, "last_updated": 1720000000000}).encode()
+
+
+def scale_payload(content: bytes, scale: int) -> bytes:
+    """
+    Repeat every dataset of a payload `scale` times with distinct keys.
+
+    Returns:
+    bytes: The payload as JSON; unchanged for a scale of 1.
+    """
+    if scale == 1:
+        return content
+    payload = json.loads(content)
+    datasets = []
+    for copy in range(scale):
+        for dataset in payload["data"]:
+            dataset = dict(dataset)
+            if copy:
+                for key in ("uuid", "hubmap_id"):
+                    if dataset.get(key):
+                        dataset[key] = f"{dataset[key]}-{copy}"
+            datasets.append(dataset)
+    payload["data"] = datasets
+    return json.dumps(payload).encode()
+
+
+class StubServer:
+    """
+    Serve one payload on 127.0.0.1 from a background thread, with an ETag
+    so revalidation gets a 304 like it does upstream. `requests` counts
+    the requests it has answered for the payload. With an error `status`,
+    e.g. 503, every request for the payload fails with it instead, like an
+    upstream outage.
+    """
+
+    def __init__(self, content: bytes, port: int = 0, status: int = 200):
+        etag = f'"{hashlib.sha256(content).hexdigest()[:16]}"'
+        self.requests = 0
+        lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != PATH:
+                    self.send_error(404)
+                    return
+                with lock:
+                    stub.requests += 1
+                if status != 200:
+                    self.send_error(status)
+                    return
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, name="stub-server", daemon=True
+        )
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}{PATH}"
+
+    def __enter__(self) -> "StubServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+
+def record(path: str) -> None:
+    """
+    Save the live data-status payload to `path` for later replay.
+    """
+    from fair.client import DATA_STATUS_URL, IngestClient
+
+    response = IngestClient().get(DATA_STATUS_URL)
+    response.raise_for_status()
+    with open(path, "wb") as f:
+        f.write(response.content)
+    print(f"Recorded {len(response.content) / 1e6:.1f} MB to {path}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("payload", nargs="?", help="recorded data-status payload")
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--record", metavar="PATH", help="save the live payload")
+    parser.add_argument(
+        "--generate", type=int, metavar="N", help="serve N synthetic datasets"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.record)
+        return 0
+    if args.generate:
+        content = generate_payload(args.generate, args.seed)
+    elif args.payload:
+        with open(args.payload, "rb") as f:
+            content = f.read()
+    else:
+        parser.error("a payload file or --generate is required")
+    content = scale_payload(content, args.scale)
+    with StubServer(content, args.port) as stub:
+        print(f"Serving {len(content) / 1e6:.1f} MB at {stub.url}")
+        try:
+            stub.thread.join()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,3 @@
+"""
+Data loading and caching helpers for the FAIR assessment dashboard.
+"""
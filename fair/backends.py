@@ -0,0 +1,222 @@
+"""
+Pluggable key/value backends shared by every dashboard process.
+
+`st.cache_data` lives inside one process, so each replica behind a load
+balancer would otherwise fetch and hold its own catalog. A backend stores
+bytes under string keys where every replica can see them: SQLite for
+replicas on one host, or Redis (or anything speaking its get/set/delete
+API) for replicas spread across hosts.
+"""
+
+import os
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Iterator, Optional
+from urllib.parse import urlparse
+
+DEFAULT_BACKEND_URL = os.environ.get("FAIR_CACHE_BACKEND", "")
+DEFAULT_CACHE_DIR = os.environ.get(
+    "FAIR_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "hubmap-fair")
+)
+SWEEP_INTERVAL = 60  # seconds between deletes of expired SQLite rows
+
+
+class CacheBackend(ABC):
+    """
+    Minimal byte store with optional expiry and an atomic set-if-absent.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Return the value stored under `key`, or None if missing or expired.
+        """
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        """
+        Store `value` under `key`, expiring after `ttl` seconds if given.
+        """
+
+    @abstractmethod
+    def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        """
+        Store `value` only if `key` is absent; True if this call stored it.
+
+        Used as a cross-process lock so a single replica does a refresh.
+        """
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """
+        Remove `key` if present.
+        """
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    Store values in a SQLite file shared by every process on one host.
+
+    Expired rows are skipped on read and deleted by a sweep that runs on
+    a write at most every `sweep_interval` seconds, so keys that are
+    never read again do not grow the file without bound.
+
+    Parameters:
+    path (str): Location of the database file; created if missing.
+    sweep_interval (float): Minimum seconds between sweeps.
+    """
+
+    def __init__(self, path: str, sweep_interval: float = SWEEP_INTERVAL):
+        self.path = path
+        self.sweep_interval = sweep_interval
+        self._swept_at = 0.0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache "
+                "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS cache_expires_at ON cache (expires_at)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # A connection per call keeps the backend safe to share across threads
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value FROM cache WHERE key = ? "
+                "AND (expires_at IS NULL OR expires_at > ?)",
+                (key, time.time()),
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) "
+                "VALUES (?, ?, ?)",
+                (key, value, _expires_at(ttl)),
+            )
+            self._sweep(conn)
+
+    def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "DELETE FROM cache WHERE key = ? AND expires_at <= ?",
+                    (key, time.time()),
+                )
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO cache (key, value, expires_at) "
+                    "VALUES (?, ?, ?)",
+                    (key, value, _expires_at(ttl)),
+                )
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            self._sweep(conn)
+        return cursor.rowcount == 1
+
+    def delete(self, key: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def _sweep(self, conn: sqlite3.Connection) -> None:
+        now = time.time()
+        if now - self._swept_at < self.sweep_interval:
+            return
+        self._swept_at = now
+        conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+
+
+class RedisBackend(CacheBackend):
+    """
+    Store values in Redis, or any client exposing the same get/set/delete.
+
+    Parameters:
+    client: An object with redis-py's `get`, `set(..., nx=, px=)` and
+        `delete` methods, e.g. `redis.Redis` or a local stand-in.
+    prefix (str): Namespace prepended to every key.
+    """
+
+    def __init__(self, client, prefix: str = "hubmap-fair:"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, prefix: str = "hubmap-fair:") -> "RedisBackend":
+        """
+        Connect with the optional `redis` package.
+        """
+        try:
+            import redis
+        except ImportError as e:
+            raise ImportError(
+                "The redis package is required for a redis:// cache backend"
+            ) from e
+        return cls(redis.Redis.from_url(url), prefix=prefix)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        self.client.set(self.prefix + key, value, px=_milliseconds(ttl))
+
+    def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        return bool(
+            self.client.set(self.prefix + key, value, nx=True, px=_milliseconds(ttl))
+        )
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+
+def backend_from_url(url: str, default_directory: str) -> CacheBackend:
+    """
+    Build a backend from a FAIR_CACHE_BACKEND style URL.
+
+    An empty URL means a SQLite file in `default_directory`;
+    `sqlite:///path/to/file.db` picks another file and `redis://...` /
+    `rediss://...` connects to Redis.
+
+    Returns:
+    CacheBackend: The configured backend.
+    """
+    if not url:
+        return SQLiteBackend(os.path.join(default_directory, "cache.sqlite3"))
+    scheme = urlparse(url).scheme
+    if scheme == "sqlite":
+        return SQLiteBackend(url[len("sqlite:///") :])
+    if scheme in ("redis", "rediss", "unix"):
+        return RedisBackend.from_url(url)
+    raise ValueError(f"Unsupported cache backend: {url}")
+
+
+def default_backend() -> CacheBackend:
+    """
+    The backend named by FAIR_CACHE_BACKEND, or SQLite in FAIR_CACHE_DIR.
+    """
+    return backend_from_url(DEFAULT_BACKEND_URL, DEFAULT_CACHE_DIR)
+
+
+def _expires_at(ttl: Optional[float]) -> Optional[float]:
+    return None if ttl is None else time.time() + ttl
+
+
+def _milliseconds(ttl: Optional[float]) -> Optional[int]:
+    return None if ttl is None else max(1, int(ttl * 1000))
@@ -0,0 +1,518 @@
+"""
+Matplotlib charts for the report and a cache of their rendered images.
+
+Each chart is a function from a count series (see `FairSummary`) to a
+figure built with the object-oriented API (see `fair.figures`).
+Rendering one means laying out and rasterizing it, which is by far the
+most expensive part of a rerun, yet its input only changes when the
+catalog snapshot does. `ChartCache` keeps the finished PNG bytes keyed by
+chart and snapshot, so reruns on the same snapshot only send images.
+
+matplotlib and wordcloud are imported by the chart functions on their
+first call, so importing this module, e.g. for `ChartCache`, does not
+load them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from importlib.metadata import PackageNotFoundError, version
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+import pandas as pd
+
+from fair.backends import CacheBackend
+from fair.figures import new_figure
+from fair.metrics import increment, span
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+    from fair.snapshot import Snapshot
+
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+DEFAULT_BACKEND_TTL = 7 * 24 * 60 * 60  # seconds a stored image is kept
+
+
+def group_wordcloud_chart(counts: pd.Series) -> Figure:
+    """
+    Word cloud of research groups sized by their number of datasets.
+    """
+    from wordcloud import WordCloud
+
+    with span("wordcloud_layout"):
+        wordcloud = WordCloud(
+            width=800, height=400, background_color="white"
+        ).generate_from_frequencies(counts)
+    fig, ax = new_figure((10, 5))
+    ax.imshow(wordcloud, interpolation="bilinear")
+    ax.axis("off")
+    return fig
+
+
+def has_data_chart(counts: pd.Series) -> Figure:
+    """
+    Donut chart of datasets with and without data.
+    """
+    from matplotlib.patches import Circle
+
+    fig, ax = new_figure((5, 5))
+    # A pie chart with a hole in the middle is a donut chart
+    wedges, texts, autotexts = ax.pie(
+        counts,
+        autopct="%1.1f%%",
+        startangle=90,
+        wedgeprops=dict(width=0.3),
+        colors=["#cadF9E"],
+    )
+    ax.add_artist(Circle((0, 0), 0.70, fc="white"))
+    ax.legend(
+        wedges,
+        counts.index,
+        title="Contributors",
+        loc="center right",
+        bbox_to_anchor=(1.2, 0.5),
+    )
+    ax.axis("equal")  # Keep the donut round
+    ax.set_title("Percentages of Dataset with Data")
+    fig.tight_layout()
+    return fig
+
+
+def has_donor_metadata_chart(counts: pd.Series) -> Figure:
+    """
+    Donut chart of datasets with and without donor metadata.
+    """
+    from matplotlib.patches import Circle
+
+    fig, ax = new_figure((3, 3))
+    wedges, texts, autotexts = ax.pie(
+        counts, autopct="%1.1f%%", startangle=90, colors=["#cadF9E"]
+    )
+    ax.add_artist(Circle((0, 0), 0.70, fc="white"))
+    ax.legend(wedges, counts.index, title="Has Metadata", loc="center")
+    ax.axis("equal")
+    ax.set_title("Percentage of Datasets with Donor Metadata")
+    fig.tight_layout()
+    return fig
+
+
+def _flag_pie(
+    counts: pd.Series,
+    figsize: tuple,
+    colors: list,
+    text_colors: list,
+    legend: str,
+    title: str,
+    labels=None,
+) -> Figure:
+    fig, ax = new_figure(figsize)
+    wedges, texts, autotexts = ax.pie(
+        counts, autopct="%1.1f%%", startangle=90, colors=colors, shadow=True
+    )
+    for autotext, color in zip(autotexts, text_colors):
+        autotext.set_color(color)
+    ax.legend(
+        wedges,
+        counts.index if labels is None else labels,
+        title=legend,
+        loc="center left",
+        bbox_to_anchor=(1, 0, 0.5, 1),
+    )
+    ax.axis("equal")
+    ax.set_title(title)
+    fig.tight_layout()
+    return fig
+
+
+def has_contributors_chart(counts: pd.Series) -> Figure:
+    """
+    Pie chart of datasets with and without contributors.
+    """
+    return _flag_pie(
+        counts,
+        (3, 3),
+        ["#5b6255", "#cadF9E"],
+        ["white", "black"],
+        "Contributors",
+        'Distribution of "has contributors"',
+    )
+
+
+def has_contacts_chart(counts: pd.Series) -> Figure:
+    """
+    Pie chart of datasets with and without contacts.
+    """
+    return _flag_pie(
+        counts,
+        (6, 6),
+        ["#3d5a6c", "#a4c4d7"],
+        ["white", "black"],
+        "Contacts",
+        'Distribution of "has contacts"',
+    )
+
+
+def access_level_pie_chart(counts: pd.Series) -> Figure:
+    """
+    Pie chart of datasets per data access level.
+    """
+    return _flag_pie(
+        counts,
+        (3, 3),
+        ["#5b6255", "#cadF9E"],
+        ["white", "black"],
+        "Access Level",
+        "Data Access Level Distribution",
+        labels=[s.capitalize() for s in counts.index],
+    )
+
+
+def group_bar_chart(counts: pd.Series) -> Figure:
+    """
+    Bar chart of datasets per research group.
+    """
+    from matplotlib.artist import setp
+
+    fig, ax = new_figure((10, 6))
+    counts.plot(kind="bar", color="skyblue", width=0.8, ax=ax)
+    ax.set_title("Research group name", fontsize=16)
+    ax.set_xlabel("University", fontsize=14, labelpad=15)
+    ax.set_ylabel("Count", fontsize=14)
+    setp(ax.get_xticklabels(), rotation=45, fontsize=12, ha="right")
+    ax.grid(axis="y", linestyle="--")
+    fig.tight_layout()
+    return fig
+
+
+def access_level_bar_chart(counts: pd.Series) -> Figure:
+    """
+    Bar chart of datasets per data access level.
+    """
+    from matplotlib.artist import setp
+
+    fig, ax = new_figure((10, 6))
+    counts.plot(kind="bar", color=["skyblue", "coral", "lightgreen"], ax=ax)
+    ax.set_title("Data Access Level Distribution")
+    ax.set_xlabel("Data Access Level")
+    ax.set_ylabel("Count")
+    setp(ax.get_xticklabels(), rotation=45)
+    fig.tight_layout()
+    return fig
+
+
+def unpublished_has_contributors_chart(counts: pd.Series) -> Figure:
+    """
+    Pie chart of unpublished datasets with and without contributors.
+    """
+    return _flag_pie(
+        counts,
+        (3, 3),
+        ["#cadF9E", "#5b6255"],
+        ["black", "white"],
+        "Contributors",
+        'Distribution of "has contributors" in Unpublished Data',
+    )
+
+
+def unpublished_has_contacts_chart(counts: pd.Series) -> Figure:
+    """
+    Pie chart of unpublished datasets with and without contacts.
+    """
+    return _flag_pie(
+        counts,
+        (3, 3),
+        ["#a4c4d7", "#3d5a6c"],
+        ["black", "white"],
+        "Contributors",
+        'Distribution of "has contacts" in Unpublished Data',
+    )
+
+
+def unpublished_access_level_chart(counts: pd.Series) -> Figure:
+    """
+    Pie chart of unpublished datasets per data access level.
+    """
+    return _flag_pie(
+        counts,
+        (3, 3),
+        ["#5b6255", "#cadF9E"],
+        ["white", "black"],
+        "Access Level",
+        "Data Acess Level Distribution in Unpublished Data",
+        labels=[s.capitalize() for s in counts.index],
+    )
+
+
+def score_distribution_chart(counts: pd.Series) -> Figure:
+    """
+    Bar chart of datasets per FAIR score range.
+    """
+    from matplotlib.artist import setp
+
+    fig, ax = new_figure((10, 6))
+    counts.plot(kind="bar", color="#5b6255", width=0.9, ax=ax)
+    ax.set_title("Distribution of FAIR Scores")
+    ax.set_xlabel("Score")
+    ax.set_ylabel("Datasets")
+    setp(ax.get_xticklabels(), rotation=0)
+    ax.grid(axis="y", linestyle="--")
+    fig.tight_layout()
+    return fig
+
+
+def _trend(
+    frame: pd.DataFrame, title: str, ylabel: str, stacked: bool = False
+) -> Figure:
+    fig, ax = new_figure((10, 5))
+    if stacked:
+        frame.plot.area(ax=ax, color=["#5b6255", "#cadF9E"], linewidth=0)
+    else:
+        frame.plot(ax=ax, linewidth=2)
+    ax.set_title(title)
+    ax.set_xlabel("Created")
+    ax.set_ylabel(ylabel)
+    ax.grid(axis="y", linestyle="--")
+    if frame.shape[1] > 10:
+        ax.legend(fontsize=7, ncol=2, loc="upper left", bbox_to_anchor=(1, 1))
+    fig.tight_layout()
+    return fig
+
+
+def trend_growth_chart(frame: pd.DataFrame) -> Figure:
+    """
+    Line chart of the datasets created up to each period.
+    """
+    return _trend(frame, "Cumulative Datasets", "Datasets")
+
+
+def trend_backlog_chart(frame: pd.DataFrame) -> Figure:
+    """
+    Stacked area chart of published and unpublished datasets over time.
+    """
+    return _trend(frame, "Published and Unpublished Datasets", "Datasets", True)
+
+
+def trend_has_donor_metadata_chart(frame: pd.DataFrame) -> Figure:
+    """
+    Line chart of the share of datasets with donor metadata over time.
+    """
+    return _trend(frame, "Datasets with Donor Metadata", "% of datasets")
+
+
+def trend_has_contributors_chart(frame: pd.DataFrame) -> Figure:
+    """
+    Line chart of the share of datasets with contributors over time.
+    """
+    return _trend(frame, "Datasets with Contributors", "% of datasets")
+
+
+def trend_has_contacts_chart(frame: pd.DataFrame) -> Figure:
+    """
+    Line chart of the share of datasets with contacts over time.
+    """
+    return _trend(frame, "Datasets with Contacts", "% of datasets")
+
+
+# Trend charts take a frame of series (see fair.trends), the rest a series
+CHARTS: Dict[str, Callable[..., Figure]] = {
+    "group_wordcloud": group_wordcloud_chart,
+    "has_data": has_data_chart,
+    "has_donor_metadata": has_donor_metadata_chart,
+    "has_contributors": has_contributors_chart,
+    "has_contacts": has_contacts_chart,
+    "access_level_pie": access_level_pie_chart,
+    "group_bar": group_bar_chart,
+    "access_level_bar": access_level_bar_chart,
+    "unpublished_has_contributors": unpublished_has_contributors_chart,
+    "unpublished_has_contacts": unpublished_has_contacts_chart,
+    "unpublished_access_level": unpublished_access_level_chart,
+    "score_distribution": score_distribution_chart,
+    "trend_growth": trend_growth_chart,
+    "trend_backlog": trend_backlog_chart,
+    "trend_has_donor_metadata": trend_has_donor_metadata_chart,
+    "trend_has_contributors": trend_has_contributors_chart,
+    "trend_has_contacts": trend_has_contacts_chart,
+}
+
+# The charts drawn from a snapshot's summaries: which view's FairSummary
+# and which of its counts (a flag, or a `by_*` attribute)
+SUMMARY_CHARTS: Dict[str, Tuple[str, str]] = {
+    "group_wordcloud": ("published", "by_group"),
+    "has_data": ("published", "has_data"),
+    "has_donor_metadata": ("published", "has_donor_metadata"),
+    "has_contributors": ("published", "has_contributors"),
+    "has_contacts": ("published", "has_contacts"),
+    "access_level_pie": ("published", "by_access_level"),
+    "group_bar": ("published", "by_group"),
+    "access_level_bar": ("published", "by_access_level"),
+    "unpublished_has_contributors": ("unpublished", "has_contributors"),
+    "unpublished_has_contacts": ("unpublished", "has_contacts"),
+    "unpublished_access_level": ("unpublished", "by_access_level"),
+}
+# The graphs under each section of the report, in page order
+PUBLISHED_CHARTS = (
+    "has_data",
+    "has_donor_metadata",
+    "has_contributors",
+    "has_contacts",
+    "access_level_pie",
+    "group_bar",
+    "access_level_bar",
+)
+UNPUBLISHED_CHARTS = (
+    "unpublished_has_contributors",
+    "unpublished_has_contacts",
+    "unpublished_access_level",
+)
+
+
+def chart_counts(
+    snapshot: Snapshot, names: Iterable[str] = SUMMARY_CHARTS
+) -> Dict[str, pd.Series]:
+    """
+    The counts each of the summary charts `names` is drawn from.
+
+    Returns:
+    Dict[str, pd.Series]: Count series by chart name.
+    """
+    counts = {}
+    for name in names:
+        view, key = SUMMARY_CHARTS[name]
+        summary = getattr(snapshot, f"{view}_summary")
+        counts[name] = (
+            summary.flags[key] if key in summary.flags else getattr(summary, key)
+        )
+    return counts
+
+
+def counts_hash(counts: pd.Series) -> str:
+    """
+    Fingerprint a count series by its values, independent of order.
+
+    Use it instead of the snapshot hash for charts, such as the word cloud,
+    that are expensive enough to be worth keeping across snapshots whose
+    counts did not change.
+
+    Returns:
+    str: A hex digest of the (label, count) pairs.
+    """
+    pairs = sorted((str(label), int(count)) for label, count in counts.items())
+    return hashlib.sha256(json.dumps(pairs).encode()).hexdigest()
+
+
+def chart_version() -> str:
+    """
+    Fingerprint of what draws the charts: the source of this module and
+    of `fair.figures`, and the matplotlib and wordcloud versions.
+
+    Returns:
+    str: 16 hex digits; changes whenever any of those does.
+    """
+    digest = hashlib.sha256()
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for module in ("charts.py", "figures.py"):
+        with open(os.path.join(directory, module), "rb") as f:
+            digest.update(f.read())
+    for package in ("matplotlib", "wordcloud"):
+        try:
+            digest.update(f"{package}=={version(package)}".encode())
+        except PackageNotFoundError:
+            pass
+    return digest.hexdigest()[:16]
+
+
+CHART_VERSION = chart_version()
+
+
+class ChartCache:
+    """
+    Size-bounded LRU cache of rendered chart images.
+
+    Keys should identify both the chart and the data it was drawn from,
+    e.g. (chart name, snapshot content hash). Once the stored images exceed
+    `max_bytes`, the least recently used ones are evicted. With a `backend`,
+    images are also written there, so a restarted process, or another
+    replica, reuses them instead of rendering again. Keys in the backend
+    also carry `version`, so images drawn by older chart code, e.g. before
+    a deploy, are never served.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_CACHE_BYTES,
+        backend: Optional[CacheBackend] = None,
+        backend_ttl: float = DEFAULT_BACKEND_TTL,
+        version: str = CHART_VERSION,
+    ):
+        self.max_bytes = max_bytes
+        self.backend = backend
+        self.backend_ttl = backend_ttl
+        self.version = version
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._images: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_render(
+        self, key: Hashable, render: Callable[[], bytes], persist: bool = True
+    ) -> bytes:
+        """
+        Return the cached image for `key`, rendering and storing it on a miss.
+
+        Parameters:
+        key (Hashable): Identifies the chart and its data.
+        render (Callable[[], bytes]): Draws the image on a miss.
+        persist (bool): Also look the image up in, and write it to, the
+        backend; short-lived images, such as those of one filter
+        selection, are better kept in memory only.
+        """
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+                self.hits += 1
+                increment("cache_requests_total", cache="chart", result="hit")
+                return image
+            self.misses += 1
+        increment("cache_requests_total", cache="chart", result="miss")
+
+        image = self._load(key) if persist else None
+        if image is None:
+            image = render()
+            if persist:
+                self._store(key, image)
+        with self._lock:
+            if key not in self._images:
+                self._images[key] = image
+                self.size += len(image)
+            while self.size > self.max_bytes and len(self._images) > 1:
+                _, evicted = self._images.popitem(last=False)
+                self.size -= len(evicted)
+        return image
+
+    def _backend_key(self, key: Hashable) -> str:
+        parts = key if isinstance(key, tuple) else (key,)
+        return f"chart:{self.version}:" + ":".join(str(part) for part in parts)
+
+    def _load(self, key: Hashable) -> Optional[bytes]:
+        if self.backend is None:
+            return None
+        try:
+            return self.backend.get(self._backend_key(key))
+        except Exception as e:
+            print(f"Chart cache read failed: {e}")
+            return None
+
+    def _store(self, key: Hashable, image: bytes) -> None:
+        if self.backend is None:
+            return
+        try:
+            self.backend.set(self._backend_key(key), image, ttl=self.backend_ttl)
+        except Exception as e:
+            print(f"Chart cache write failed: {e}")
@@ -0,0 +1,149 @@
+"""
+HTTP client for the HuBMAP ingest API.
+
+Every request goes through one pooled `requests.Session` with explicit
+connect/read timeouts, gzip negotiation and bounded retries with
+exponential backoff and full jitter. A circuit breaker stops calling an
+upstream that keeps failing, so callers can fall back to the last good
+snapshot immediately instead of waiting out every timeout.
+"""
+
+import os
+import random
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DATA_STATUS_URL = os.environ.get(
+    "FAIR_DATA_STATUS_URL",
+    "https://ingest.api.hubmapconsortium.org/datasets/data-status",
+)
+DEFAULT_TIMEOUT = (
+    float(os.environ.get("FAIR_CONNECT_TIMEOUT", 5)),
+    float(os.environ.get("FAIR_READ_TIMEOUT", 60)),
+)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(requests.RequestException):
+    """
+    Raised instead of calling an upstream whose circuit is open.
+    """
+
+
+class CircuitBreaker:
+    """
+    Fail fast after repeated upstream failures.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    every call is refused for `reset_timeout` seconds. The first call after
+    that is let through as a trial: success closes the circuit, failure
+    opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 60):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """
+        True if a call may go to the upstream now.
+        """
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at >= self.reset_timeout:
+                # Half-open: let this caller try, keep refusing the others
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+class IngestClient:
+    """
+    Pooled, retrying, circuit-broken GET client.
+
+    Parameters:
+    timeout (Tuple[float, float]): Connect and read timeouts in seconds.
+    retries (int): Extra attempts after the first one fails.
+    backoff (float): Base delay in seconds, doubled on every retry.
+    max_backoff (float): Upper bound on a single delay.
+    breaker (CircuitBreaker): Shared failure tracker for the upstream.
+    """
+
+    def __init__(
+        self,
+        timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+        retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 8.0,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.breaker = breaker or CircuitBreaker()
+        self.session = requests.Session()
+        self.session.headers["Accept-Encoding"] = "gzip, deflate"
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None):
+        """
+        GET `url`, retrying transient failures.
+
+        Request errors, e.g. connection errors, timeouts and truncated
+        bodies, and 429/5xx responses are retried up to `retries` times and
+        count as one failure towards the circuit breaker. Any other
+        response, including 304 and 4xx, is returned to the caller as is.
+
+        Returns:
+        requests.Response: The final response.
+
+        Raises:
+        CircuitOpenError: If the upstream has been failing and is skipped.
+        requests.RequestException: If every attempt failed.
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"Circuit open, not calling {url}")
+
+        for attempt in range(self.retries + 1):
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+                if response.status_code not in RETRY_STATUSES:
+                    self.breaker.record_success()
+                    return response
+                error = requests.HTTPError(
+                    f"{response.status_code} from {url}", response=response
+                )
+            except requests.RequestException as e:
+                # e.g. a connection reset or a body cut off mid-read
+                error = e
+            if attempt < self.retries:
+                time.sleep(self._delay(attempt))
+
+        self.breaker.record_failure()
+        raise error
+
+    def _delay(self, attempt: int) -> float:
+        # Full jitter keeps replicas from retrying in lockstep
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
@@ -0,0 +1,118 @@
+"""
+What changed between two catalog snapshots.
+
+Datasets are matched on their uuid with a hash join: one hash table of the
+old keys, probed once per new key. Each side's raw fields are reduced to a
+64-bit row hash, so telling changed rows from unchanged ones compares one
+integer per dataset instead of every field.
+"""
+
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from fair.parse import DATASET_COLUMNS
+
+DIFF_KEY = "uuid"
+DEFAULT_INCREMENTAL = os.environ.get("FAIR_INCREMENTAL", "1") != "0"
+
+
+@dataclass(frozen=True)
+class SnapshotDiff:
+    """
+    The datasets added, removed and changed from one frame to the next.
+
+    `changed` holds the new version of every dataset whose fields changed,
+    and `previous` its old version, row for row.
+    """
+
+    added: pd.DataFrame
+    removed: pd.DataFrame
+    changed: pd.DataFrame
+    previous: pd.DataFrame
+
+    @classmethod
+    def between(
+        cls, old: pd.DataFrame, new: pd.DataFrame, key: str = DIFF_KEY
+    ) -> "SnapshotDiff":
+        """
+        Diff two normalized catalog frames by `key`.
+
+        Raises:
+        ValueError: If `key` is missing or not unique in either frame.
+
+        Returns:
+        SnapshotDiff: Rows taken from `old` and `new` as they are.
+        """
+        for frame in (old, new):
+            if key not in frame or frame[key].hasnans or not frame[key].is_unique:
+                raise ValueError(f"Cannot diff snapshots on non-unique '{key}'")
+
+        matches = pd.Index(old[key]).get_indexer(new[key])
+        found = matches >= 0
+        kept = np.zeros(len(old), dtype=bool)
+        kept[matches[found]] = True
+
+        matched_new = np.flatnonzero(found)
+        matched_old = matches[found]
+        differs = _row_hashes(new)[matched_new] != _row_hashes(old)[matched_old]
+        return cls(
+            added=new.iloc[np.flatnonzero(~found)],
+            removed=old.iloc[np.flatnonzero(~kept)],
+            changed=new.iloc[matched_new[differs]],
+            previous=old.iloc[matched_old[differs]],
+        )
+
+    @property
+    def empty(self) -> bool:
+        """
+        True if no dataset was added, removed or changed.
+        """
+        return not (len(self.added) or len(self.removed) or len(self.changed))
+
+    @property
+    def upserted(self) -> pd.DataFrame:
+        """
+        New versions of every added or changed dataset.
+        """
+        return pd.concat([self.added, self.changed])
+
+    @property
+    def status_changes(self) -> pd.DataFrame:
+        """
+        Changed datasets whose status moved, with the old and new status.
+
+        Returns:
+        pd.DataFrame: hubmap_id, uuid, previous_status and status.
+        """
+        before = self.previous["status"].astype(object).to_numpy()
+        after = self.changed["status"].astype(object).to_numpy()
+        # A status missing on both sides has not moved
+        moved = (before != after) & ~(pd.isna(before) & pd.isna(after))
+        return pd.DataFrame(
+            {
+                "hubmap_id": self.changed["hubmap_id"].to_numpy()[moved],
+                "uuid": self.changed["uuid"].to_numpy()[moved],
+                "previous_status": before[moved],
+                "status": after[moved],
+            }
+        )
+
+    @property
+    def newly_published(self) -> pd.DataFrame:
+        """
+        Status changes that ended in 'Published'.
+        """
+        changes = self.status_changes
+        return changes[changes["status"] == "Published"]
+
+
+def _row_hashes(frame: pd.DataFrame) -> np.ndarray:
+    """
+    One 64-bit hash per row over the raw catalog fields. Categorical
+    values hash by value, so frames with different categories compare.
+    """
+    columns = [column for column in DATASET_COLUMNS if column in frame]
+    return pd.util.hash_pandas_object(frame[columns], index=False).to_numpy()
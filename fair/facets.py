@@ -0,0 +1,168 @@
+"""
+Faceted filtering over a snapshot with precomputed bitmap indexes.
+
+For every facet column, `FacetIndex` keeps one bitmap per value, a packed
+array with a bit set for each dataset that has the value. A selection
+(e.g. organ in {Kidney, Liver} and status = Published) is the bitwise OR
+of the chosen values within a facet, ANDed across facets. The count of
+every value under a selection is a popcount of its bitmap ANDed with that
+mask. All of this works on machine words, n / 64 of them per bitmap, so
+a filter change recounts every facet without rescanning the frame.
+"""
+
+import hashlib
+import json
+from typing import Dict, Iterable, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+FACET_COLUMNS = (
+    "organ",
+    "dataset_type",
+    "group_name",
+    "data_access_level",
+    "dataset_status",
+    "status",
+)
+
+Selection = Mapping[str, Sequence[str]]
+
+
+class FacetIndex:
+    """
+    Per-value bitmaps for the facet columns of one frame, built once per
+    snapshot and read-only afterwards, so it is safe to share.
+    """
+
+    def __init__(
+        self, size: int, values: Dict[str, pd.Index], bitmaps: Dict[str, np.ndarray]
+    ):
+        self.size = size
+        self.values = values
+        self.bitmaps = bitmaps
+        self._words = _words(size)
+        # Bits past `size` in the last word stay clear in every bitmap
+        self._all = _pack(np.ones(size, dtype=bool), self._words)
+
+    @classmethod
+    def from_frame(
+        cls, frame: pd.DataFrame, columns: Iterable[str] = FACET_COLUMNS
+    ) -> "FacetIndex":
+        """
+        Index the facet columns of a frame; missing columns are skipped.
+
+        Returns:
+        FacetIndex: A (values, words) bitmap matrix for every column.
+        """
+        size = len(frame)
+        words = _words(size)
+        values = {}
+        bitmaps = {}
+        for column in columns:
+            if column not in frame:
+                continue
+            categorical = frame[column].astype("category")
+            labels = categorical.cat.categories
+            codes = categorical.cat.codes.to_numpy()
+            present = codes >= 0  # Missing values are in no bitmap
+            onehot = np.zeros((len(labels), size), dtype=bool)
+            onehot[codes[present], np.flatnonzero(present)] = True
+            values[column] = labels
+            bitmaps[column] = _pack(onehot, words)
+        return cls(size, values, bitmaps)
+
+    def mask(self, selection: Selection, exclude: str = None) -> np.ndarray:
+        """
+        The packed bitmap of datasets matching `selection`, ignoring the
+        facet `exclude`. Facets with nothing selected do not filter.
+
+        Returns:
+        np.ndarray: uint64 words, one bit per dataset.
+        """
+        mask = self._all.copy()
+        for column, chosen in selection.items():
+            if column == exclude or not chosen or column not in self.bitmaps:
+                continue
+            positions = self.values[column].get_indexer(list(chosen))
+            positions = positions[positions >= 0]
+            mask &= np.bitwise_or.reduce(
+                self.bitmaps[column][positions], axis=0, initial=0
+            )
+        return mask
+
+    def rows(self, selection: Selection) -> np.ndarray:
+        """
+        Positions of the datasets matching `selection`, in frame order.
+
+        Returns:
+        np.ndarray: Integer positions into the indexed frame.
+        """
+        bits = np.unpackbits(self.mask(selection).view(np.uint8), bitorder="little")
+        return np.flatnonzero(bits[: self.size])
+
+    def count(self, selection: Selection) -> int:
+        """
+        Number of datasets matching `selection`.
+        """
+        return int(_popcount(self.mask(selection)).sum())
+
+    def counts(self, selection: Selection) -> Dict[str, pd.Series]:
+        """
+        For every facet, how many datasets each of its values would match.
+
+        Each facet is counted under the selection on the other facets only,
+        so the counts show what picking another value of it would give.
+
+        Returns:
+        Dict[str, pd.Series]: Counts indexed by value, in category order.
+        """
+        counts = {}
+        for column, bitmaps in self.bitmaps.items():
+            mask = self.mask(selection, exclude=column)
+            counts[column] = pd.Series(
+                _popcount(bitmaps & mask).sum(axis=1, dtype=np.int64),
+                index=self.values[column],
+                name="count",
+            )
+        return counts
+
+
+def selection_key(selection: Selection) -> str:
+    """
+    A stable digest of a selection, for caching what is derived from it.
+
+    Returns:
+    str: A hex digest; the same for selections that differ only in order.
+    """
+    canonical = sorted(
+        (column, sorted(map(str, chosen)))
+        for column, chosen in selection.items()
+        if chosen
+    )
+    return hashlib.sha256(json.dumps(canonical).encode()).hexdigest()
+
+
+def _words(size: int) -> int:
+    return max(1, -(-size // 64))
+
+
+def _pack(bits: np.ndarray, words: int) -> np.ndarray:
+    """
+    Pack boolean rows into little-endian uint64 words.
+    """
+    packed = np.packbits(bits, axis=-1, bitorder="little")
+    padding = [(0, 0)] * (packed.ndim - 1) + [(0, words * 8 - packed.shape[-1])]
+    return np.ascontiguousarray(np.pad(packed, padding)).view(np.uint64)
+
+
+if hasattr(np, "bitwise_count"):
+    _popcount = np.bitwise_count
+else:  # numpy < 2.0
+    _BYTE_COUNTS = np.array(
+        [bin(byte).count("1") for byte in range(256)], dtype=np.uint8
+    )
+
+    def _popcount(words: np.ndarray) -> np.ndarray:
+        counts = _BYTE_COUNTS[words.view(np.uint8)]
+        return counts.reshape(words.shape + (8,)).sum(axis=-1)
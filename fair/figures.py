@@ -0,0 +1,79 @@
+"""
+Figure lifecycle for chart rendering without pyplot's global state.
+
+Figures made through `matplotlib.pyplot` are registered in a process-wide
+figure manager and live until explicitly closed, so a long-running server
+that forgets a `plt.close` grows with every rerun. Figures here are plain
+`matplotlib.figure.Figure` objects that pyplot never sees; `render_png`
+rasterizes one and always releases its artists, even if drawing fails.
+
+matplotlib itself is only imported when the first figure is made. The
+non-interactive Agg backend is selected up front, through MPLBACKEND, so
+that import never probes for a GUI toolkit.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Iterator, Tuple
+
+from fair.metrics import span
+
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
+    from matplotlib.figure import Figure
+
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+DEFAULT_DPI = 200  # What st.pyplot uses
+
+
+def new_figure(figsize: Tuple[float, float]) -> Tuple[Figure, Axes]:
+    """
+    Create a figure with one set of axes, outside pyplot's registry.
+
+    Returns:
+    Tuple[Figure, Axes]: The figure and its axes.
+    """
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    return fig, fig.subplots()
+
+
+@contextmanager
+def released(fig: Figure) -> Iterator[Figure]:
+    """
+    Clear a figure on exit so its artists and image buffers can be freed.
+    """
+    try:
+        yield fig
+    finally:
+        fig.clear()
+
+
+def figure_png(fig: Figure, dpi: int = DEFAULT_DPI) -> bytes:
+    """
+    Rasterize a figure the way `st.pyplot` does, then release it.
+
+    Returns:
+    bytes: The PNG image.
+    """
+    buffer = io.BytesIO()
+    with released(fig), span("rasterize"):
+        fig.savefig(buffer, format="png", dpi=dpi, bbox_inches="tight")
+    return buffer.getvalue()
+
+
+def render_png(draw: Callable[..., Figure], *args, dpi: int = DEFAULT_DPI) -> bytes:
+    """
+    Draw a figure with `draw(*args)` and return it as PNG bytes.
+
+    Returns:
+    bytes: The PNG image.
+    """
+    with span("draw"):
+        fig = draw(*args)
+    return figure_png(fig, dpi=dpi)
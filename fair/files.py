@@ -0,0 +1,47 @@
+"""
+Replace files that other processes read without exposing partial writes.
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import IO, Iterator, Optional
+
+FILE_MODE = 0o644
+
+
+@contextmanager
+def atomic_write(
+    path: str, mode: str = "w", encoding: Optional[str] = None
+) -> Iterator[IO]:
+    """
+    Write to a temporary file next to `path`, then rename it over `path`.
+
+    Readers see either the old file or the whole new one. mkstemp creates
+    the file readable by its owner only, so before the rename it gets
+    FILE_MODE less the umask, like a file opened normally would, e.g. so a
+    scraper running as another user can read it. On error the temporary
+    file is removed and `path` is left as it was.
+
+    Parameters:
+    path (str): The file to replace.
+    mode (str): "w" for text or "wb" for bytes.
+    encoding (str): Text encoding; the locale's by default.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    handle, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(handle, mode, encoding=encoding) as f:
+            yield f
+        os.chmod(temporary, FILE_MODE & ~_umask())
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def _umask() -> int:
+    # The umask can only be read by setting it
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
@@ -0,0 +1,267 @@
+"""
+Local history of every catalog snapshot, stored as Parquet files.
+
+Each distinct payload is kept once, as `<content hash>.parquet`. The time
+it was first fetched is recorded in the file's metadata. Files are read
+through a memory map and only the requested columns are decoded, so
+opening a past snapshot, or a few columns of every snapshot, skips the
+JSON parse.
+
+A snapshot that differs from the one before it in only a few datasets is
+stored as a delta: the raw fields of the added and changed datasets, plus
+the keys of the removed ones, on top of its base snapshot. Every
+MAX_DELTA_DEPTH deltas, or when a lot changed, the whole frame is stored
+again, so rebuilding a snapshot never reads a long chain of files.
+"""
+
+import json
+import os
+import threading
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from fair.backends import DEFAULT_CACHE_DIR
+from fair.delta import DIFF_KEY, SnapshotDiff
+from fair.files import atomic_write
+from fair.normalize import normalize
+from fair.parse import COLUMN_DTYPES, DATASET_COLUMNS
+from fair.snapshot import Snapshot
+from fair.summary import FairSummary
+
+DEFAULT_HISTORY_DIR = os.environ.get(
+    "FAIR_HISTORY_DIR", os.path.join(DEFAULT_CACHE_DIR, "history")
+)
+FETCHED_AT_KEY = b"fair.fetched_at"
+DATASETS_KEY = b"fair.datasets"
+BASE_KEY = b"fair.base"  # Only in deltas: the snapshot they apply to
+REMOVED_KEY = b"fair.removed"
+DEPTH_KEY = b"fair.depth"
+MAX_DELTA_DEPTH = 16
+MAX_DELTA_SHARE = 0.25  # Store the whole frame if more datasets changed
+
+
+@dataclass(frozen=True)
+class HistoryEntry:
+    """
+    One stored snapshot.
+    """
+
+    content_hash: str
+    fetched_at: float
+    datasets: int
+    path: str
+
+
+class HistoryStore:
+    """
+    Parquet files of past snapshots in one directory, one per payload.
+    """
+
+    def __init__(self, directory: str = DEFAULT_HISTORY_DIR, compression: str = "zstd"):
+        self.directory = directory
+        self.compression = compression
+        self._entries: List[HistoryEntry] = []
+        self._listed_at = None
+        self._lock = threading.Lock()
+
+    def path(self, content_hash: str) -> str:
+        """
+        Where the snapshot of the payload with `content_hash` is stored.
+        """
+        return os.path.join(self.directory, f"{content_hash}.parquet")
+
+    def __contains__(self, content_hash: str) -> bool:
+        return os.path.exists(self.path(content_hash))
+
+    def save(
+        self,
+        snapshot: Snapshot,
+        previous: Optional[str] = None,
+        diff: Optional[SnapshotDiff] = None,
+    ) -> bool:
+        """
+        Store a snapshot unless one with the same content is stored already.
+
+        Given the hash of the stored snapshot it was fetched after and the
+        diff between the two, only the changed datasets are stored when
+        few changed. The file is written next to its final name and renamed
+        into place, so readers never see a partial file.
+
+        Parameters:
+        snapshot (Snapshot): The snapshot to keep.
+        previous (str): Content hash of the snapshot `diff` starts from.
+        diff (SnapshotDiff): How `snapshot` differs from `previous`.
+
+        Returns:
+        bool: True if a new file was written.
+        """
+        if snapshot.content_hash is None or snapshot.content_hash in self:
+            return False
+        metadata = {
+            FETCHED_AT_KEY: repr(snapshot.fetched_at or 0.0).encode(),
+            DATASETS_KEY: str(len(snapshot.frame)).encode(),
+        }
+        depth = self._depth(previous) if diff is not None and previous else None
+        changed = 0 if diff is None else len(diff.upserted) + len(diff.removed)
+        if (
+            depth is not None
+            and depth < MAX_DELTA_DEPTH
+            and changed <= MAX_DELTA_SHARE * len(snapshot.frame)
+        ):
+            frame = diff.upserted[list(DATASET_COLUMNS)]
+            metadata[BASE_KEY] = previous.encode()
+            metadata[REMOVED_KEY] = json.dumps(
+                diff.removed[DIFF_KEY].astype(str).tolist()
+            ).encode()
+            metadata[DEPTH_KEY] = str(depth + 1).encode()
+        else:
+            frame = snapshot.frame
+
+        os.makedirs(self.directory, exist_ok=True)
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        table = table.replace_schema_metadata(
+            {**(table.schema.metadata or {}), **metadata}
+        )
+        with atomic_write(self.path(snapshot.content_hash), "wb") as f:
+            pq.write_table(table, f, compression=self.compression)
+        return True
+
+    def entries(self) -> List[HistoryEntry]:
+        """
+        The stored snapshots, oldest first.
+
+        Only file footers are read, and only again once the directory
+        changes.
+
+        Returns:
+        List[HistoryEntry]: One entry per stored snapshot.
+        """
+        try:
+            listed_at = os.stat(self.directory).st_mtime_ns
+        except FileNotFoundError:
+            return []
+        with self._lock:
+            if listed_at == self._listed_at:
+                return list(self._entries)
+
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".parquet"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                metadata = pq.read_metadata(path)
+            except (OSError, pa.ArrowException) as e:
+                print(f"Skipping unreadable snapshot {name}: {e}")
+                continue
+            values = metadata.metadata or {}
+            fetched_at = float(values.get(FETCHED_AT_KEY, b"0"))
+            datasets = int(values.get(DATASETS_KEY, metadata.num_rows))
+            entries.append(
+                HistoryEntry(name[: -len(".parquet")], fetched_at, datasets, path)
+            )
+        entries.sort(key=lambda entry: entry.fetched_at)
+
+        with self._lock:
+            self._entries = entries
+            self._listed_at = listed_at
+        return list(entries)
+
+    def read(
+        self, content_hash: str, columns: Optional[Sequence[str]] = None
+    ) -> pd.DataFrame:
+        """
+        The frame of a stored snapshot, or only some of its columns.
+
+        Raises:
+        FileNotFoundError: If no snapshot with that hash is stored.
+
+        Returns:
+        pd.DataFrame: The frame with the dtypes it was stored with. Frames
+        rebuilt from deltas list the changed datasets last.
+        """
+        if self._metadata(content_hash).get(BASE_KEY) is None:
+            return self._read_table(content_hash, columns).to_pandas()
+        if columns is not None and set(columns) <= set(DATASET_COLUMNS):
+            return self._read_raw(content_hash, columns)[list(columns)]
+        frame = normalize(self._read_raw(content_hash, DATASET_COLUMNS))
+        return frame if columns is None else frame[list(columns)]
+
+    def load(
+        self,
+        content_hash: str,
+        fetched_at: Optional[float] = None,
+        summaries: Optional[Tuple[FairSummary, FairSummary]] = None,
+    ) -> Optional[Snapshot]:
+        """
+        A stored snapshot, ready to display, or None if it is not stored.
+
+        Parameters:
+        content_hash (str): Hash of the payload the snapshot came from.
+        fetched_at (float): When its payload was last fetched; the time it
+        was first stored by default.
+        summaries (Tuple[FairSummary, FairSummary]): Its counts, if known.
+
+        Returns:
+        Optional[Snapshot]: The snapshot, split and summarized.
+        """
+        try:
+            metadata = self._metadata(content_hash)
+            frame = self.read(content_hash)
+        except FileNotFoundError:
+            return None
+        if fetched_at is None:
+            fetched_at = float(metadata.get(FETCHED_AT_KEY, b"0"))
+        return Snapshot.from_frame(frame, fetched_at, content_hash, summaries)
+
+    def _metadata(self, content_hash: str) -> dict:
+        return pq.read_schema(self.path(content_hash)).metadata or {}
+
+    def _depth(self, content_hash: str) -> Optional[int]:
+        """
+        How many deltas lead up to a stored snapshot; None if not stored.
+        """
+        try:
+            return int(self._metadata(content_hash).get(DEPTH_KEY, b"0"))
+        except FileNotFoundError:
+            return None
+
+    def _read_table(
+        self, content_hash: str, columns: Optional[Sequence[str]] = None
+    ) -> pa.Table:
+        return pq.read_table(
+            self.path(content_hash),
+            columns=None if columns is None else list(columns),
+            memory_map=True,
+        )
+
+    def _read_raw(self, content_hash: str, columns: Sequence[str]) -> pd.DataFrame:
+        """
+        Raw catalog columns of a stored snapshot, following deltas back to
+        the last whole frame.
+        """
+        wanted = list(dict.fromkeys([DIFF_KEY, *columns]))
+        metadata = self._metadata(content_hash)
+        rows = self._read_table(content_hash, wanted).to_pandas()
+        base = metadata.get(BASE_KEY)
+        if base is None:
+            return rows
+        frame = self._read_raw(base.decode(), wanted)
+        replaced = (
+            json.loads(metadata.get(REMOVED_KEY, b"[]"))
+            + rows[DIFF_KEY].astype(str).tolist()
+        )
+        frame = frame[~frame[DIFF_KEY].isin(replaced)]
+        frame = pd.concat([frame, rows], ignore_index=True)
+        # Categories differ between the parts; recategorize like parse does
+        return frame.astype(
+            {
+                column: COLUMN_DTYPES[column]
+                for column in wanted
+                if column in COLUMN_DTYPES
+            }
+        )
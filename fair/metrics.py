@@ -0,0 +1,275 @@
+"""
+Timing spans and counters for telling where a rerun spends its time.
+
+`span("parse")` times a block, `increment` adds to a counter and
+`set_gauge` records a current value, each optionally with labels, e.g.
+`span("chart", chart="group_bar")`. Everything goes into one process-wide
+registry, shared by every session and the background refresher, so the
+numbers cover the whole server. They can be rendered in the Prometheus
+text exposition format for a local scraper: written to FAIR_METRICS_FILE
+(e.g. for node_exporter's textfile collector) or served over HTTP on
+FAIR_METRICS_PORT. With FAIR_DEBUG=1, or `?debug=1` in the page URL, the
+dashboard also shows them in a sidebar panel.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+import pandas as pd
+
+from fair.files import atomic_write
+
+DEBUG_PANEL = os.environ.get("FAIR_DEBUG", "0") != "0"
+DEFAULT_METRICS_FILE = os.environ.get("FAIR_METRICS_FILE", "")
+DEFAULT_METRICS_PORT = int(os.environ.get("FAIR_METRICS_PORT", 0))
+PREFIX = "fair_"
+
+Key = Tuple[str, Tuple[Tuple[str, str], ...]]  # name, sorted labels
+
+
+@dataclass
+class SpanStats:
+    """
+    How often a span ran and how long it took.
+    """
+
+    count: int = 0
+    total: float = 0.0
+    last: float = 0.0
+    max: float = 0.0
+
+
+class Metrics:
+    """
+    Thread-safe registry of spans, counters and gauges.
+    """
+
+    def __init__(self):
+        self.spans: Dict[Key, SpanStats] = {}
+        self.counters: Dict[Key, float] = {}
+        self.gauges: Dict[Key, float] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, **labels: str) -> Iterator[None]:
+        """
+        Time the enclosed block, whether or not it raises.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def timed(self, name: str, **labels: str) -> Callable:
+        """
+        Decorator that times every call of a function as span `name`.
+        """
+
+        def decorate(function: Callable) -> Callable:
+            @wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.span(name, **labels):
+                    return function(*args, **kwargs)
+
+            return wrapper
+
+        return decorate
+
+    def observe(self, name: str, seconds: float, **labels: str) -> None:
+        """
+        Record one run of span `name` that took `seconds`.
+        """
+        key = _key(name, labels)
+        with self._lock:
+            stats = self.spans.setdefault(key, SpanStats())
+            stats.count += 1
+            stats.total += seconds
+            stats.last = seconds
+            stats.max = max(stats.max, seconds)
+
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        """
+        Add `value` to counter `name`.
+        """
+        key = _key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels: str) -> None:
+        """
+        Set gauge `name` to its current `value`.
+        """
+        with self._lock:
+            self.gauges[_key(name, labels)] = value
+
+    def span_frame(self) -> pd.DataFrame:
+        """
+        Every span with its run count and timings, slowest in total first.
+
+        Returns:
+        pd.DataFrame: span, labels, runs, last / mean / max ms and total s.
+        """
+        with self._lock:
+            spans = [
+                (key, SpanStats(**vars(stats))) for key, stats in self.spans.items()
+            ]
+        frame = pd.DataFrame(
+            [
+                {
+                    "span": name,
+                    "labels": _label_text(labels),
+                    "runs": stats.count,
+                    "last ms": 1000 * stats.last,
+                    "mean ms": 1000 * stats.total / stats.count,
+                    "max ms": 1000 * stats.max,
+                    "total s": stats.total,
+                }
+                for (name, labels), stats in spans
+            ],
+            columns=[
+                "span",
+                "labels",
+                "runs",
+                "last ms",
+                "mean ms",
+                "max ms",
+                "total s",
+            ],
+        )
+        return frame.sort_values("total s", ascending=False, ignore_index=True)
+
+    def value_frame(self) -> pd.DataFrame:
+        """
+        Every counter and gauge with its current value.
+
+        Returns:
+        pd.DataFrame: metric, labels and value, sorted by metric.
+        """
+        with self._lock:
+            values = list(self.counters.items()) + list(self.gauges.items())
+        frame = pd.DataFrame(
+            [
+                {"metric": name, "labels": _label_text(labels), "value": value}
+                for (name, labels), value in values
+            ],
+            columns=["metric", "labels", "value"],
+        )
+        return frame.sort_values(["metric", "labels"], ignore_index=True)
+
+    def hit_rate(self, cache: str) -> Optional[float]:
+        """
+        Share of the lookups in `cache` that were hits, counted by the
+        "cache_requests_total" counter; None before the first lookup.
+        """
+        with self._lock:
+            results = {
+                dict(labels).get("result"): value
+                for (name, labels), value in self.counters.items()
+                if name == "cache_requests_total" and dict(labels).get("cache") == cache
+            }
+        total = sum(results.values())
+        return results.get("hit", 0) / total if total else None
+
+    def prometheus(self) -> str:
+        """
+        Render everything in the Prometheus text exposition format.
+
+        Spans become one summary, `fair_span_seconds`, labelled by span.
+
+        Returns:
+        str: The exposition, ending in a newline.
+        """
+        with self._lock:
+            spans = {key: SpanStats(**vars(stats)) for key, stats in self.spans.items()}
+            counters = dict(self.counters)
+            gauges = dict(self.gauges)
+
+        lines = []
+        if spans:
+            metric = f"{PREFIX}span_seconds"
+            lines.append(f"# HELP {metric} Time spent in each stage of a rerun.")
+            lines.append(f"# TYPE {metric} summary")
+            for (name, labels), stats in sorted(spans.items()):
+                labels = (("span", name),) + labels
+                lines.append(f"{metric}_sum{_label_text(labels, True)} {stats.total!r}")
+                lines.append(f"{metric}_count{_label_text(labels, True)} {stats.count}")
+        for kind, values in (("counter", counters), ("gauge", gauges)):
+            named = None
+            for (name, labels), value in sorted(values.items()):
+                if name != named:
+                    lines.append(f"# TYPE {PREFIX}{name} {kind}")
+                    named = name
+                lines.append(
+                    f"{PREFIX}{name}{_label_text(labels, True)} {float(value)!r}"
+                )
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        """
+        Write the Prometheus exposition to `path`, replacing it atomically
+        so a scraper never reads a partial file.
+        """
+        with atomic_write(path) as f:
+            f.write(self.prometheus())
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """
+        Serve the Prometheus exposition at /metrics from a daemon thread.
+
+        Returns:
+        ThreadingHTTPServer: The running server.
+        """
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(
+            target=server.serve_forever, name="metrics-server", daemon=True
+        ).start()
+        return server
+
+
+def _key(name: str, labels: Dict[str, str]) -> Key:
+    return name, tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+
+def _label_text(labels: Tuple[Tuple[str, str], ...], braces: bool = False) -> str:
+    """
+    Labels as `a="x",b="y"`, escaped as the exposition format requires.
+    """
+    text = ",".join(
+        '{}="{}"'.format(
+            label,
+            value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for label, value in labels
+    )
+    return f"{{{text}}}" if braces and text else text
+
+
+METRICS = Metrics()
+span = METRICS.span
+timed = METRICS.timed
+increment = METRICS.increment
+set_gauge = METRICS.set_gauge
@@ -0,0 +1,124 @@
+"""
+Parse the data-status payload into a frame holding only what the
+dashboard reads.
+
+`response.json()` followed by `pd.DataFrame(...)` materializes every
+field of every dataset twice: once as Python dicts and once as object
+columns. Here the `data` array is walked incrementally with ijson, only
+the projected columns are kept, and each column is built as one typed
+array, so memory tracks the number of datasets times the number of
+columns we actually use. Columns use the compact types in COLUMN_DTYPES.
+Without ijson the payload is decoded with the standard library and
+projected before the frame is built.
+"""
+
+import io
+import json
+from typing import Dict, Iterable, List
+
+import pandas as pd
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional dependency
+    ijson = None
+
+DATASET_COLUMNS = (
+    "uuid",
+    "hubmap_id",
+    "organ",
+    "dataset_type",
+    "group_name",
+    "status",
+    "data_access_level",
+    "donor_hubmap_id",
+    "created_timestamp",
+    "has_data",
+    "has_donor_metadata",
+    "has_contributors",
+    "has_contacts",
+)
+# Low-cardinality strings become categoricals, flags nullable booleans and
+# the timestamp a nullable integer; identifiers stay plain strings.
+COLUMN_DTYPES = {
+    "uuid": "string",
+    "hubmap_id": "string",
+    "organ": "category",
+    "dataset_type": "category",
+    "group_name": "category",
+    "status": "category",
+    "data_access_level": "category",
+    "donor_hubmap_id": "category",
+    "created_timestamp": "Int64",
+    "has_data": "boolean",
+    "has_donor_metadata": "boolean",
+    "has_contributors": "boolean",
+    "has_contacts": "boolean",
+}
+# Some flags arrive as "True"/"False" strings rather than JSON booleans
+_FLAG_VALUES = {
+    True: True,
+    False: False,
+    "True": True,
+    "False": False,
+    "true": True,
+    "false": False,
+}
+
+
+def parse_datasets(
+    content: bytes, columns: Iterable[str] = DATASET_COLUMNS
+) -> pd.DataFrame:
+    """
+    Build a DataFrame from the 'data' array of a data-status payload.
+
+    Parameters:
+    content (bytes): The raw JSON response body.
+    columns (Iterable[str]): Fields to keep; missing fields become nulls.
+
+    Returns:
+    pd.DataFrame: One row per dataset and one typed column per field.
+
+    Raises:
+    KeyError: If the payload has no 'data' key.
+    ValueError: If the payload is not valid JSON.
+    """
+    columns = tuple(columns)
+    if ijson is not None:
+        values = _project_streaming(content, columns)
+    else:
+        values = _project_loaded(content, columns)
+    return pd.DataFrame(
+        {column: _typed_array(column, values[column]) for column in columns}
+    )
+
+
+def _typed_array(column: str, values: List):
+    dtype = COLUMN_DTYPES.get(column)
+    if dtype == "boolean":
+        values = [_FLAG_VALUES.get(value) for value in values]
+    return pd.array(values, dtype=dtype)
+
+
+def _project_streaming(content: bytes, columns: tuple) -> Dict[str, List]:
+    values = {column: [] for column in columns}
+    try:
+        # One dataset dict exists at a time; it is dropped after projection
+        for record in ijson.items(io.BytesIO(content), "data.item", use_float=True):
+            for column in columns:
+                values[column].append(record.get(column))
+    except ijson.JSONError as e:
+        raise ValueError(f"Invalid data-status payload: {e}") from e
+
+    if not values[columns[0]]:
+        # Nothing streamed: tell an empty catalog from a missing 'data' key
+        return _project_loaded(content, columns)
+    return values
+
+
+def _project_loaded(content: bytes, columns: tuple) -> Dict[str, List]:
+    json_data = json.loads(content)
+    if "data" not in json_data:
+        raise KeyError("'data' key not found in the JSON response")
+    records = json_data["data"]
+    return {column: [record.get(column) for record in records] for column in columns}
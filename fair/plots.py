@@ -0,0 +1,352 @@
+"""
+Plotly versions of the report charts, drawn in the browser.
+
+The matplotlib charts in `fair.charts` are rasterized on the server and
+sent as PNGs. The figures here carry only the aggregated counts plus a
+little layout, so the browser does the drawing and the reader gets hover
+and zoom for free. Set FAIR_CHART_MODE=image to go back to the
+matplotlib images, which remain the renderer for static export and for
+charts, such as the word cloud, that have no Plotly counterpart.
+
+Plotly is imported by the functions that build figures, so importing
+this module for PLOTS or DEFAULT_CHART_MODE does not load it.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING, Callable, Dict, List
+
+import pandas as pd
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+DEFAULT_CHART_MODE = os.environ.get("FAIR_CHART_MODE", "plotly")
+
+
+def _pie(
+    counts: pd.Series,
+    colors: List[str],
+    text_colors: List[str],
+    legend: str,
+    title: str,
+    hole: float = 0,
+    labels=None,
+) -> go.Figure:
+    import plotly.graph_objects as go
+
+    fig = go.Figure(
+        go.Pie(
+            labels=[str(label) for label in counts.index] if labels is None else labels,
+            values=counts.to_list(),
+            hole=hole,
+            sort=False,
+            direction="clockwise",
+            rotation=90,
+            marker=dict(colors=colors),
+            insidetextfont=dict(color=text_colors),
+            texttemplate="%{percent:.1%}",
+        )
+    )
+    fig.update_layout(
+        title=title,
+        legend_title_text=legend,
+        margin=dict(l=10, r=10, t=50, b=10),
+    )
+    return fig
+
+
+def _bar(counts: pd.Series, color, title: str, xlabel: str, ylabel: str) -> go.Figure:
+    import plotly.graph_objects as go
+
+    fig = go.Figure(
+        go.Bar(
+            x=[str(label) for label in counts.index],
+            y=counts.to_list(),
+            marker_color=color,
+        )
+    )
+    fig.update_layout(
+        title=title,
+        xaxis_title=xlabel,
+        yaxis_title=ylabel,
+        xaxis_tickangle=-45,
+        margin=dict(l=10, r=10, t=50, b=10),
+    )
+    fig.update_yaxes(showgrid=True, griddash="dash")
+    return fig
+
+
+def has_data_plot(counts: pd.Series) -> go.Figure:
+    """
+    Donut chart of datasets with and without data.
+    """
+    return _pie(
+        counts,
+        ["#cadF9E"],
+        ["black"],
+        "Contributors",
+        "Percentages of Dataset with Data",
+        hole=0.7,
+    )
+
+
+def has_donor_metadata_plot(counts: pd.Series) -> go.Figure:
+    """
+    Donut chart of datasets with and without donor metadata.
+    """
+    return _pie(
+        counts,
+        ["#cadF9E"],
+        ["black"],
+        "Has Metadata",
+        "Percentage of Datasets with Donor Metadata",
+        hole=0.7,
+    )
+
+
+def has_contributors_plot(counts: pd.Series) -> go.Figure:
+    """
+    Pie chart of datasets with and without contributors.
+    """
+    return _pie(
+        counts,
+        ["#5b6255", "#cadF9E"],
+        ["white", "black"],
+        "Contributors",
+        'Distribution of "has contributors"',
+    )
+
+
+def has_contacts_plot(counts: pd.Series) -> go.Figure:
+    """
+    Pie chart of datasets with and without contacts.
+    """
+    return _pie(
+        counts,
+        ["#3d5a6c", "#a4c4d7"],
+        ["white", "black"],
+        "Contacts",
+        'Distribution of "has contacts"',
+    )
+
+
+def access_level_pie_plot(counts: pd.Series) -> go.Figure:
+    """
+    Pie chart of datasets per data access level.
+    """
+    return _pie(
+        counts,
+        ["#5b6255", "#cadF9E"],
+        ["white", "black"],
+        "Access Level",
+        "Data Access Level Distribution",
+        labels=[str(s).capitalize() for s in counts.index],
+    )
+
+
+def group_bar_plot(counts: pd.Series) -> go.Figure:
+    """
+    Bar chart of datasets per research group.
+    """
+    return _bar(counts, "skyblue", "Research group name", "University", "Count")
+
+
+def access_level_bar_plot(counts: pd.Series) -> go.Figure:
+    """
+    Bar chart of datasets per data access level.
+    """
+    return _bar(
+        counts,
+        ["skyblue", "coral", "lightgreen"][: len(counts)],
+        "Data Access Level Distribution",
+        "Data Access Level",
+        "Count",
+    )
+
+
+def unpublished_has_contributors_plot(counts: pd.Series) -> go.Figure:
+    """
+    Pie chart of unpublished datasets with and without contributors.
+    """
+    return _pie(
+        counts,
+        ["#cadF9E", "#5b6255"],
+        ["black", "white"],
+        "Contributors",
+        'Distribution of "has contributors" in Unpublished Data',
+    )
+
+
+def unpublished_has_contacts_plot(counts: pd.Series) -> go.Figure:
+    """
+    Pie chart of unpublished datasets with and without contacts.
+    """
+    return _pie(
+        counts,
+        ["#a4c4d7", "#3d5a6c"],
+        ["black", "white"],
+        "Contributors",
+        'Distribution of "has contacts" in Unpublished Data',
+    )
+
+
+def unpublished_access_level_plot(counts: pd.Series) -> go.Figure:
+    """
+    Pie chart of unpublished datasets per data access level.
+    """
+    return _pie(
+        counts,
+        ["#5b6255", "#cadF9E"],
+        ["white", "black"],
+        "Access Level",
+        "Data Acess Level Distribution in Unpublished Data",
+        labels=[str(s).capitalize() for s in counts.index],
+    )
+
+
+def score_distribution_plot(counts: pd.Series) -> go.Figure:
+    """
+    Bar chart of datasets per FAIR score range.
+    """
+    return _bar(
+        counts, "#5b6255", "Distribution of FAIR Scores", "Score", "Datasets"
+    ).update_layout(xaxis_tickangle=0, bargap=0.1)
+
+
+def _trend(
+    frame: pd.DataFrame, title: str, ylabel: str, stacked: bool = False
+) -> go.Figure:
+    import plotly.graph_objects as go
+
+    fig = go.Figure(
+        [
+            go.Scatter(
+                x=frame.index,
+                y=frame[column].to_list(),
+                name=str(column),
+                mode="lines",
+                stackgroup="one" if stacked else None,
+                line_color=color,
+            )
+            for column, color in zip(
+                frame.columns,
+                ["#5b6255", "#cadF9E"] if stacked else [None] * frame.shape[1],
+            )
+        ]
+    )
+    fig.update_layout(
+        title=title,
+        xaxis_title="Created",
+        yaxis_title=ylabel,
+        hovermode="x unified",
+        margin=dict(l=10, r=10, t=50, b=10),
+    )
+    return fig
+
+
+def trend_growth_plot(frame: pd.DataFrame) -> go.Figure:
+    """
+    Line chart of the datasets created up to each period.
+    """
+    return _trend(frame, "Cumulative Datasets", "Datasets")
+
+
+def trend_backlog_plot(frame: pd.DataFrame) -> go.Figure:
+    """
+    Stacked area chart of published and unpublished datasets over time.
+    """
+    return _trend(frame, "Published and Unpublished Datasets", "Datasets", True)
+
+
+def trend_has_donor_metadata_plot(frame: pd.DataFrame) -> go.Figure:
+    """
+    Line chart of the share of datasets with donor metadata over time.
+    """
+    return _trend(frame, "Datasets with Donor Metadata", "% of datasets")
+
+
+def trend_has_contributors_plot(frame: pd.DataFrame) -> go.Figure:
+    """
+    Line chart of the share of datasets with contributors over time.
+    """
+    return _trend(frame, "Datasets with Contributors", "% of datasets")
+
+
+def trend_has_contacts_plot(frame: pd.DataFrame) -> go.Figure:
+    """
+    Line chart of the share of datasets with contacts over time.
+    """
+    return _trend(frame, "Datasets with Contacts", "% of datasets")
+
+
+# Contributing sites per state, for the map in "About Us"
+SITES_BY_STATE = {
+    "Massachusetts": ("MA", 1),
+    "New York": ("NY", 1),
+    "Missouri": ("MO", 1),
+    "Kentucky": ("KY", 1),
+    "New Jersey": ("NJ", 1),
+    "Alabama": ("AL", 1),
+    "California": ("CA", 3),
+    "Georgia": ("GA", 1),
+    "Texas": ("TX", 2),
+    "Illinois": ("IL", 1),
+    "Pennsylvania": ("PA", 1),
+}
+
+
+def sites_map_plot() -> go.Figure:
+    """
+    Choropleth of the US states with contributing sites.
+    """
+    import plotly.graph_objects as go
+
+    codes = [code for code, _ in SITES_BY_STATE.values()]
+    sites = [count for _, count in SITES_BY_STATE.values()]
+    hovertext = [
+        f"{state}<br>Population: {count:,}"
+        for state, (_, count) in SITES_BY_STATE.items()
+    ]
+    data = go.Choropleth(
+        locations=codes,
+        z=sites,
+        locationmode="USA-states",
+        colorscale="Reds",
+        hoverinfo="location+text",
+        hovertext=hovertext,
+        marker_line_color="black",
+        colorbar=dict(title="Population", tickvals=[1, 2, 3], ticktext=["1", "2", "3"]),
+    )
+    layout = go.Layout(
+        geo=dict(
+            scope="usa",
+            projection=dict(type="albers usa"),
+            showlakes=False,
+            showland=True,
+            landcolor="rgb(217, 217, 217)",
+        )
+    )
+    return go.Figure(data=[data], layout=layout)
+
+
+# Keyed like fair.charts.CHARTS; charts missing here are always images
+PLOTS: Dict[str, Callable[..., go.Figure]] = {
+    "has_data": has_data_plot,
+    "has_donor_metadata": has_donor_metadata_plot,
+    "has_contributors": has_contributors_plot,
+    "has_contacts": has_contacts_plot,
+    "access_level_pie": access_level_pie_plot,
+    "group_bar": group_bar_plot,
+    "access_level_bar": access_level_bar_plot,
+    "unpublished_has_contributors": unpublished_has_contributors_plot,
+    "unpublished_has_contacts": unpublished_has_contacts_plot,
+    "unpublished_access_level": unpublished_access_level_plot,
+    "score_distribution": score_distribution_plot,
+    "trend_growth": trend_growth_plot,
+    "trend_backlog": trend_backlog_plot,
+    "trend_has_donor_metadata": trend_has_donor_metadata_plot,
+    "trend_has_contributors": trend_has_contributors_plot,
+    "trend_has_contacts": trend_has_contacts_plot,
+}
@@ -0,0 +1,110 @@
+"""
+Stale-while-revalidate refresh of a value in a background thread.
+"""
+
+import threading
+from typing import Callable, Generic, Optional, TypeVar
+
+from fair.singleflight import SingleFlight
+
+T = TypeVar("T")
+
+
+class BackgroundRefresher(Generic[T]):
+    """
+    Serve the last loaded value while a worker thread reloads it.
+
+    `load` is called every `interval` seconds on a daemon thread. A
+    successful result replaces the current value in a single reference
+    assignment, so readers always see either the old or the new value and
+    never wait for the reload. A failed reload keeps the old value.
+
+    Loads are coalesced: however many callers hit a cold refresher at once,
+    and whether or not the worker is reloading at the same moment, `load`
+    runs once and every caller gets its result.
+
+    Parameters:
+    load (Callable[[], T]): Produces a fresh value; may raise.
+    interval (float): Seconds between reloads.
+    name (str): Name of the worker thread.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[], T],
+        interval: float,
+        name: str = "background-refresher",
+    ):
+        self.load = load
+        self.interval = interval
+        self.name = name
+        self._value: Optional[T] = None
+        self._flight = SingleFlight()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "BackgroundRefresher[T]":
+        """
+        Start the worker thread if it is not already running.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name=self.name, daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Ask the worker thread to exit after its current reload.
+        """
+        self._stop.set()
+
+    @property
+    def current(self) -> Optional[T]:
+        """
+        The current value, without loading; None before the first load.
+        """
+        return self._value
+
+    def get(self) -> Optional[T]:
+        """
+        Return the current value, loading it inline only if there is none.
+
+        Returns:
+        Optional[T]: The current value, or None if no load has succeeded.
+        """
+        if self._value is None:
+            # Cold start: nothing to serve yet, so this caller has to wait
+            self._reload(cold=True)
+        return self._value
+
+    def refresh(self) -> bool:
+        """
+        Reload the value now and swap it in if the load succeeds.
+
+        Returns:
+        bool: True if a new value was installed.
+        """
+        return self._reload(cold=False)
+
+    def _reload(self, cold: bool) -> bool:
+        try:
+            self._flight.do(self.name, lambda: self._load(cold))
+        except Exception as e:
+            print(f"Background refresh failed: {e}")
+            return False
+        return True
+
+    def _load(self, cold: bool) -> T:
+        # Runs inside the flight, so the value is in place before the key is
+        # released and a caller arriving after that never starts another load
+        if cold and self._value is not None:
+            return self._value  # A load finished while this caller queued
+        self._value = self.load()
+        return self._value
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.refresh()
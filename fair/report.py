@@ -0,0 +1,345 @@
+"""
+Headless FAIR report: the dashboard's numbers and charts as one static
+HTML file, without a Streamlit server.
+
+The snapshot comes from a saved file (a data-status payload as JSON, or a
+Parquet file from the snapshot history) or, by default, from the live
+API through the same cache the app uses. The word cloud and the
+published and unpublished charts are rasterized in a pool of worker
+processes, since matplotlib rendering is CPU-bound and not thread-safe,
+and every image is embedded in the page, so the report is one file that
+loads nothing when opened. With the optional kaleido package (see
+requirements-report.txt) the map of HuBMAP sites is exported as an image
+too; without it, or if the export fails, e.g. offline, the sites are
+listed as a table instead and the report is still complete.
+
+Usage:
+    python -m fair.report --snapshot data-status.json --output report.html
+    python -m fair.report --snapshot ~/.cache/fair/history/<hash>.parquet
+    python -m fair.report  # live API, or the cached payload when offline
+"""
+
+import argparse
+import base64
+import hashlib
+import html
+import importlib.util
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from fair.charts import CHARTS, PUBLISHED_CHARTS, UNPUBLISHED_CHARTS, chart_counts
+from fair.client import DATA_STATUS_URL, IngestClient
+from fair.files import atomic_write
+from fair.figures import render_png
+from fair.history import HistoryStore
+from fair.normalize import normalize
+from fair.parse import parse_datasets
+from fair.plots import SITES_BY_STATE, sites_map_plot
+from fair.snapshot import Snapshot
+from fair.store import SnapshotStore, fetch_payload
+from fair.summary import FairSummary
+
+MAP = "sites_map"
+# Static export of Plotly figures needs kaleido, plus a Chrome it can drive
+# and network access for the state outlines
+STATIC_MAP = importlib.util.find_spec("kaleido") is not None
+
+Job = Tuple[str, Optional[pd.Series]]
+
+
+def load_snapshot(path: Optional[str] = None) -> Snapshot:
+    """
+    Read a snapshot from a saved file, or fetch the current one.
+
+    Parameters:
+    path (str): A data-status payload (JSON) or a snapshot history file
+    (`<content hash>.parquet`); the live API when None.
+
+    Raises:
+    FileNotFoundError: If `path` does not exist.
+
+    Returns:
+    Snapshot: All datasets, split and summarized.
+    """
+    if path is None:
+        payload = fetch_payload(DATA_STATUS_URL, SnapshotStore(), IngestClient())
+        content, fetched_at = payload.content, payload.fetched_at
+    elif path.endswith(".parquet"):
+        directory, name = os.path.split(os.path.abspath(path))
+        snapshot = HistoryStore(directory).load(name[: -len(".parquet")])
+        if snapshot is None:
+            raise FileNotFoundError(path)
+        return snapshot
+    else:
+        with open(path, "rb") as f:
+            content = f.read()
+        fetched_at = os.path.getmtime(path)
+    frame = normalize(parse_datasets(content))
+    return Snapshot.from_frame(frame, fetched_at, hashlib.sha256(content).hexdigest())
+
+
+def chart_jobs(snapshot: Snapshot) -> List[Job]:
+    """
+    Every image in the report, as a chart name and the counts it draws.
+
+    Returns:
+    List[Job]: In page order; empty sections have no charts.
+    """
+    names = []
+    if snapshot.published_summary.datasets:
+        names.extend(("group_wordcloud",) + PUBLISHED_CHARTS)
+    if snapshot.unpublished_summary.datasets:
+        names.extend(UNPUBLISHED_CHARTS)
+    jobs = [(MAP, None)] if STATIC_MAP else []
+    return jobs + list(chart_counts(snapshot, names).items())
+
+
+def render_charts(
+    jobs: Sequence[Job], workers: Optional[int] = None
+) -> Dict[str, bytes]:
+    """
+    Render charts to PNG in a pool of worker processes.
+
+    Workers are spawned rather than forked, so they never inherit a
+    half-held lock from a thread in this process.
+
+    Parameters:
+    jobs (Sequence[Job]): Chart names and their counts.
+    workers (int): Pool size; one per CPU by default.
+
+    Returns:
+    Dict[str, bytes]: PNG images by chart name; charts that failed to
+    render are left out.
+    """
+    images = {}
+    if not jobs:
+        return images
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = {name: pool.submit(_render, name, counts) for name, counts in jobs}
+        for name, future in futures.items():
+            try:
+                images[name] = future.result()
+            except Exception as e:
+                print(f"Could not render {name}: {e}")
+    return images
+
+
+def build_html(snapshot: Snapshot, images: Dict[str, bytes]) -> str:
+    """
+    Lay out the report as a self-contained HTML page.
+
+    Parameters:
+    snapshot (Snapshot): The catalog the report describes.
+    images (Dict[str, bytes]): PNG images by chart name.
+
+    Returns:
+    str: The page; images are inline data URIs.
+    """
+    published = snapshot.published_summary
+    unpublished = snapshot.unpublished_summary
+    parts = [
+        "<h1>FAIR Assessment of HuBMAP data</h1>",
+        f"<p>{pd.Timestamp.today():%m-%d-%Y}</p>",
+    ]
+    if snapshot.fetched_at:
+        fetched = time.strftime("%m-%d-%Y %H:%M UTC", time.gmtime(snapshot.fetched_at))
+        parts.append(f'<p class="caption">HuBMAP data as of {fetched}</p>')
+
+    parts.append("<h1>About Us</h1>")
+    if MAP in images:
+        parts.append(_image(images, MAP))
+    else:
+        parts.append(_sites_table())
+
+    parts.append("<h2>Published Data</h2>")
+    if not published.datasets:
+        parts.append("<p>There are no published datasets to show.</p>")
+    else:
+        parts.append("<h3>At a Glance</h3>")
+        parts.append(_image(images, "group_wordcloud"))
+        parts.append(_glance(published, True))
+        parts.append("<h2>Graphs</h2>")
+        parts.append(_grid(images, PUBLISHED_CHARTS))
+
+    parts.append("<h2>Unpublished Data</h2>")
+    if not unpublished.datasets:
+        parts.append("<p>There are no unpublished datasets to show.</p>")
+    else:
+        parts.append("<h3>At A Glance</h3>")
+        parts.append(_glance(unpublished, False))
+        parts.append(_grid(images, UNPUBLISHED_CHARTS))
+
+    return PAGE.format(body="\n".join(parts))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Build the FAIR report as a static HTML file."
+    )
+    parser.add_argument(
+        "--snapshot",
+        help="payload JSON or snapshot history Parquet file; the live API by default",
+    )
+    parser.add_argument("--output", default="report.html", help="HTML file to write")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="render processes (default: CPUs)"
+    )
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    try:
+        snapshot = load_snapshot(args.snapshot)
+    except Exception as e:
+        print(f"Could not load the snapshot: {e}")
+        return 1
+    jobs = chart_jobs(snapshot)
+    images = render_charts(jobs, args.workers)
+    page = build_html(snapshot, images)
+
+    with atomic_write(args.output, "w", encoding="utf-8") as f:
+        f.write(page)
+    print(
+        f"Wrote {args.output}: {len(snapshot.frame)} datasets, "
+        f"{len(images)}/{len(jobs)} charts in {time.perf_counter() - started:.1f}s"
+    )
+    if MAP not in images:
+        print("The sites map was not exported; the report lists the sites instead.")
+    # The map has a table to fall back on, the charts do not
+    missing = [name for name, _ in jobs if name not in images and name != MAP]
+    return 1 if missing else 0
+
+
+def _render(name: str, counts: Optional[pd.Series]) -> bytes:
+    """
+    Rasterize one chart; runs in a worker process.
+    """
+    if name == MAP:
+        # Needs kaleido; see STATIC_MAP
+        return sites_map_plot().to_image(format="png", scale=2)
+    return render_png(CHARTS[name], counts)
+
+
+def _image(images: Dict[str, bytes], name: str) -> str:
+    if name not in images:
+        return ""
+    data = base64.b64encode(images[name]).decode("ascii")
+    return f'<img src="data:image/png;base64,{data}" alt="{html.escape(name)}">'
+
+
+def _sites_table() -> str:
+    """
+    The contributing sites per state, in place of the map.
+    """
+    rows = "".join(
+        f"<tr><td>{html.escape(state)}</td><td>{sites}</td></tr>"
+        for state, (_, sites) in sorted(SITES_BY_STATE.items())
+    )
+    return (
+        "<table><caption>Contributing sites by state</caption>"
+        f"<tr><th>State</th><th>Sites</th></tr>{rows}</table>"
+    )
+
+
+def _grid(images: Dict[str, bytes], names: Sequence[str]) -> str:
+    cells = "".join(f"<div>{_image(images, name)}</div>" for name in names)
+    return f'<div class="grid">{cells}</div>'
+
+
+def _glance(summary: FairSummary, published: bool) -> str:
+    """
+    The "At a Glance" sentences of the app as a nested HTML list.
+    """
+    prefix = "" if published else "unpublished "
+    access = summary.by_access_level
+    status = summary.by_dataset_status
+    access_details = [
+        (
+            f"The number of {prefix}datasets that are protected is",
+            access.get("protected", 0),
+        )
+    ]
+    if published:
+        access_details.append(
+            ("The number of datasets that are public is", access.get("public", 0))
+        )
+    items = [
+        (f"The number of {prefix}datasets are", summary.datasets, access_details),
+        (
+            f"The number of {prefix}dataset types are",
+            summary.dataset_types,
+            [
+                (
+                    f"The number of {prefix}datasets with a derived status is",
+                    status.get("Derived", 0),
+                ),
+                (
+                    f"The number of {prefix}datasets with a primary status is",
+                    status.get("Primary", 0),
+                ),
+            ],
+        ),
+        (f"The number of {prefix}organ types are", summary.organs, []),
+        (
+            (
+                "The number of donors for the datasets are"
+                if published
+                else "The number of donors for unpublished datasets are"
+            ),
+            summary.donors,
+            [],
+        ),
+        (
+            (
+                "The number of groups for the datasets are"
+                if published
+                else "The number of groups with unpublished datasets are"
+            ),
+            summary.groups,
+            [],
+        ),
+    ]
+    lines = ["<ul>"]
+    for sentence, value, details in items:
+        lines.append(f"<li>{sentence} <b>{value}</b>.")
+        if details:
+            lines.append("<ul>")
+            lines.extend(
+                f"<li>{detail} <b>{count}</b>.</li>" for detail, count in details
+            )
+            lines.append("</ul>")
+        lines.append("</li>")
+    lines.append("</ul>")
+    return "\n".join(lines)
+
+
+PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>FAIR Assessment of HuBMAP data</title>
+<style>
+body {{ font-family: sans-serif; max-width: 1100px; margin: 2em auto; padding: 0 1em; }}
+img {{ max-width: 100%; }}
+.caption {{ color: #666; font-size: 0.9em; }}
+table {{ border-collapse: collapse; }}
+th, td {{ border: 1px solid #ccc; padding: 0.2em 0.6em; text-align: left; }}
+.grid {{ display: grid; grid-template-columns: repeat(auto-fill, minmax(320px, 1fr)); gap: 1em; }}
+</style>
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+
+if __name__ == "__main__":
+    sys.exit(main())
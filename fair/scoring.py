@@ -0,0 +1,155 @@
+"""
+Weighted FAIR scores for every dataset, with rollups and distributions.
+
+Each dataset meets or misses a handful of criteria (does it have data,
+donor metadata, contributors, contacts; is it public), grouped under the
+Findable and Accessible principles. A score is the weighted share of the
+criteria met, from 0 to 100.
+
+Scores are linear in the criteria, so everything weight-independent is
+computed once per snapshot: the criteria matrix, the share of datasets
+meeting each criterion within every group of each rollup column, and how
+many datasets share each combination of criteria. Re-scoring after a
+weight change is then a few small matrix-vector products.
+"""
+
+from typing import Dict, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+CRITERIA = (
+    "has_data",
+    "has_donor_metadata",
+    "has_contributors",
+    "has_contacts",
+    "public_access",
+)
+PRINCIPLES = {
+    "Findable": ("has_donor_metadata", "has_contributors", "has_contacts"),
+    "Accessible": ("has_data", "public_access"),
+}
+DEFAULT_WEIGHTS = {criterion: 1.0 for criterion in CRITERIA}
+ROLLUP_COLUMNS = ("group_name", "organ", "dataset_type", "status")
+
+Weights = Mapping[str, float]
+
+
+class FairScores:
+    """
+    The weight-independent parts of the FAIR scores of one frame.
+    """
+
+    def __init__(
+        self,
+        criteria: pd.DataFrame,
+        rollups: Dict[str, pd.DataFrame],
+        patterns: pd.DataFrame,
+    ):
+        self.criteria = criteria
+        self.rollups = rollups
+        self.patterns = patterns
+
+    @classmethod
+    def from_frame(
+        cls, frame: pd.DataFrame, columns: Sequence[str] = ROLLUP_COLUMNS
+    ) -> "FairScores":
+        """
+        Evaluate every criterion for every dataset and aggregate them.
+
+        Missing flags count as not met.
+
+        Returns:
+        FairScores: Criteria per dataset, per-group criteria shares for
+        every rollup column present, and datasets per criteria combination.
+        """
+        criteria = pd.DataFrame(index=frame.index)
+        for criterion in CRITERIA[:-1]:
+            if criterion in frame:
+                met = frame[criterion].fillna(False).to_numpy(dtype=bool)
+            else:
+                met = np.zeros(len(frame), dtype=bool)
+            criteria[criterion] = met
+        if "data_access_level" in frame:
+            criteria["public_access"] = (
+                (frame["data_access_level"] == "public")
+                .fillna(False)
+                .to_numpy(dtype=bool)
+            )
+        else:
+            criteria["public_access"] = np.zeros(len(frame), dtype=bool)
+
+        rollups = {}
+        for column in columns:
+            if column not in frame:
+                continue
+            grouped = criteria.groupby(frame[column], observed=True)
+            shares = grouped.mean()
+            shares.insert(0, "datasets", grouped.size())
+            rollups[column] = shares
+
+        # Bit i of a pattern says whether criterion i is met
+        bits = criteria.to_numpy(dtype=np.int64) << np.arange(len(CRITERIA))
+        counts = np.bincount(bits.sum(axis=1), minlength=2 ** len(CRITERIA))
+        present = np.flatnonzero(counts)
+        patterns = pd.DataFrame(
+            (present[:, None] >> np.arange(len(CRITERIA))) & 1,
+            columns=list(CRITERIA),
+            dtype=bool,
+        )
+        patterns.insert(0, "datasets", counts[present])
+        return cls(criteria, rollups, patterns)
+
+    def scores(self, weights: Weights = DEFAULT_WEIGHTS) -> pd.DataFrame:
+        """
+        Findable, Accessible and overall score of every dataset.
+
+        Returns:
+        pd.DataFrame: One row per dataset, scores from 0 to 100.
+        """
+        return _score(self.criteria, weights)
+
+    def rollup(self, column: str, weights: Weights = DEFAULT_WEIGHTS) -> pd.DataFrame:
+        """
+        Mean scores of the datasets in each group of `column`, best first.
+
+        Returns:
+        pd.DataFrame: Datasets and mean Findable, Accessible and overall
+        score per group, sorted by overall score.
+        """
+        shares = self.rollups[column]
+        ranked = _score(shares[list(CRITERIA)], weights)
+        ranked.insert(0, "datasets", shares["datasets"])
+        return ranked.sort_values(["Score", "datasets"], ascending=False, kind="stable")
+
+    def distribution(
+        self, weights: Weights = DEFAULT_WEIGHTS, bins: int = 10
+    ) -> pd.Series:
+        """
+        How many datasets score within each of `bins` equal score ranges.
+
+        Returns:
+        pd.Series: Dataset counts indexed by score range, e.g. "40-50".
+        """
+        scores = _score(self.patterns[list(CRITERIA)], weights)["Score"]
+        edges = np.linspace(0, 100, bins + 1)
+        counts, _ = np.histogram(scores, bins=edges, weights=self.patterns["datasets"])
+        labels = [f"{low:.0f}-{high:.0f}" for low, high in zip(edges[:-1], edges[1:])]
+        return pd.Series(counts.astype(np.int64), index=labels, name="datasets")
+
+
+def _score(criteria: pd.DataFrame, weights: Weights) -> pd.DataFrame:
+    """
+    Weighted share, in percent, of the criteria met per row for each
+    principle and overall. Rows may also hold shares between 0 and 1.
+    """
+    values = criteria[list(CRITERIA)].to_numpy(dtype=np.float64)
+    vector = np.array([max(float(weights.get(c, 0)), 0.0) for c in CRITERIA])
+    scores = {}
+    for principle, members in list(PRINCIPLES.items()) + [("Score", CRITERIA)]:
+        masked = vector * np.isin(CRITERIA, members)
+        total = masked.sum()
+        scores[principle] = (
+            values @ masked * (100 / total) if total else np.zeros(len(values))
+        )
+    return pd.DataFrame(scores, index=criteria.index)
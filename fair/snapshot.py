@@ -0,0 +1,154 @@
+"""
+An immutable view of one data-status catalog fetch.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from fair.delta import SnapshotDiff
+from fair.summary import FairSummary
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """
+    All datasets from one fetch, plus the published and unpublished
+    slices that the dashboard reads and their precomputed counts.
+    """
+
+    frame: pd.DataFrame
+    published: pd.DataFrame
+    unpublished: pd.DataFrame
+    fetched_at: Optional[float] = None
+    published_summary: FairSummary = FairSummary()
+    unpublished_summary: FairSummary = FairSummary()
+    content_hash: Optional[str] = None
+
+    @classmethod
+    def from_frame(
+        cls,
+        frame: pd.DataFrame,
+        fetched_at: Optional[float] = None,
+        content_hash: Optional[str] = None,
+        summaries: Optional[Tuple[FairSummary, FairSummary]] = None,
+    ) -> "Snapshot":
+        """
+        Split a full catalog frame by publication status and summarize
+        each half. `content_hash` identifies the payload the frame was
+        parsed from, so anything derived from it can be cached by it.
+
+        Parameters:
+        summaries (Tuple[FairSummary, FairSummary]): The published and
+        unpublished counts of this frame if already known, e.g. shared by
+        another process; counted from the frame when None.
+
+        Returns:
+        Snapshot: The frame, its published / unpublished views and counts.
+        """
+        if frame.empty:
+            return cls(
+                frame, frame, frame, fetched_at=fetched_at, content_hash=content_hash
+            )
+        is_published = (frame["status"] == "Published").to_numpy(dtype=bool)
+        published = _select(frame, is_published)
+        unpublished = _select(frame, ~is_published)
+        if summaries is None:
+            summaries = tuple(map(FairSummary.from_frame, (published, unpublished)))
+        return cls(
+            frame,
+            published,
+            unpublished,
+            fetched_at=fetched_at,
+            published_summary=summaries[0],
+            unpublished_summary=summaries[1],
+            content_hash=content_hash,
+        )
+
+    @classmethod
+    def empty(cls) -> "Snapshot":
+        """
+        A snapshot with no datasets, used when nothing could be loaded.
+        """
+        return cls.from_frame(pd.DataFrame())
+
+    def subset(self, rows, content_hash: Optional[str] = None) -> "Snapshot":
+        """
+        A snapshot of only the datasets at positions `rows` of `frame`,
+        e.g. those matching a facet selection. `content_hash` should tell
+        it apart from the full snapshot.
+
+        Returns:
+        Snapshot: The rows, split and summarized like a full snapshot.
+        """
+        mask = np.zeros(len(self.frame), dtype=bool)
+        mask[rows] = True
+        return Snapshot.from_frame(
+            _select(self.frame, mask), self.fetched_at, content_hash
+        )
+
+    def updated(
+        self,
+        frame: pd.DataFrame,
+        diff: SnapshotDiff,
+        fetched_at: Optional[float] = None,
+        content_hash: Optional[str] = None,
+    ) -> "Snapshot":
+        """
+        The snapshot of `frame`, the next fetch of this snapshot's catalog,
+        with its counts updated from `diff` rather than recounted.
+
+        Parameters:
+        frame (pd.DataFrame): The new normalized catalog frame.
+        diff (SnapshotDiff): How `frame` differs from this snapshot's frame.
+
+        Returns:
+        Snapshot: Equal to `Snapshot.from_frame(frame, ...)`.
+        """
+        if frame.empty or self.frame.empty:
+            return Snapshot.from_frame(frame, fetched_at, content_hash)
+        is_published = (frame["status"] == "Published").to_numpy(dtype=bool)
+        leaving = pd.concat([diff.removed, diff.previous])
+        joining = pd.concat([diff.added, diff.changed])
+        was_published = (leaving["status"] == "Published").to_numpy(dtype=bool)
+        now_published = (joining["status"] == "Published").to_numpy(dtype=bool)
+        return Snapshot(
+            frame,
+            _select(frame, is_published),
+            _select(frame, ~is_published),
+            fetched_at=fetched_at,
+            published_summary=self.published_summary.updated(
+                leaving[was_published], joining[now_published]
+            ),
+            unpublished_summary=self.unpublished_summary.updated(
+                leaving[~was_published], joining[~now_published]
+            ),
+            content_hash=content_hash,
+        )
+
+    @property
+    def age(self) -> Optional[float]:
+        """
+        Seconds since the underlying payload was fetched, if known.
+        """
+        if self.fetched_at is None:
+            return None
+        return time.time() - self.fetched_at
+
+
+def _select(frame: pd.DataFrame, mask) -> pd.DataFrame:
+    """
+    Filter rows and drop categories that no longer occur, so counts and
+    charts over a view never list values that only exist in the other one.
+    """
+    view = frame[mask]
+    categorical = view.select_dtypes("category").columns
+    return view.assign(
+        **{
+            column: view[column].cat.remove_unused_categories()
+            for column in categorical
+        }
+    )
@@ -0,0 +1,241 @@
+"""
+Shared store for the last good data-status payload.
+
+The raw response body is kept together with the validators (ETag /
+Last-Modified) and the time it was fetched in a cache backend that every
+process can reach, so a fresh process can start warm and later revalidate
+with a conditional request instead of downloading the whole catalog
+again. When several replicas share a backend only one of them refreshes
+a stale payload; the others keep serving the stored copy meanwhile.
+
+The counts summarized from a payload are shared the same way, keyed by
+its content hash, so only the first replica to load a payload counts it.
+"""
+
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from typing import Optional, Tuple
+
+import requests
+
+from fair.backends import CacheBackend, default_backend
+from fair.metrics import increment, span
+from fair.summary import FairSummary
+
+DEFAULT_MAX_AGE = float(os.environ.get("FAIR_MAX_AGE", 15 * 60))  # seconds
+REFRESH_LOCK_TTL = 120  # seconds a replica may hold the refresh lock
+SUMMARY_TTL = 24 * 60 * 60  # seconds the counts of a payload are kept
+VIEWS = ("published", "unpublished")
+
+
+@dataclass
+class StoredPayload:
+    """
+    A data-status response body and the metadata needed to revalidate it.
+    """
+
+    content: bytes
+    fetched_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def age(self) -> float:
+        """
+        Seconds since the payload was last fetched or revalidated.
+        """
+        return time.time() - self.fetched_at
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize as one JSON metadata line followed by the raw body.
+        """
+        meta = asdict(self)
+        del meta["content"]
+        return json.dumps(meta).encode() + b"\n" + self.content
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "StoredPayload":
+        """
+        Inverse of `to_bytes`.
+        """
+        meta, _, content = data.partition(b"\n")
+        return cls(content=content, **json.loads(meta))
+
+
+class SnapshotStore:
+    """
+    Keep the last good payload for one URL in a cache backend.
+
+    Metadata and body are written as a single value, so a reader never
+    pairs a new body with stale validators.
+
+    Parameters:
+    backend (CacheBackend): Where the payload lives; defaults to the one
+        named by FAIR_CACHE_BACKEND, or a SQLite file in FAIR_CACHE_DIR.
+    max_age (float): Seconds a stored payload is served without revalidation.
+    name (str): Key prefix, so several URLs can share a backend.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        max_age: float = DEFAULT_MAX_AGE,
+        name: str = "data-status",
+    ):
+        self.backend = backend or default_backend()
+        self.max_age = max_age
+        self.key = name
+        self.lock_key = f"{name}.refresh-lock"
+
+    def read(self) -> Optional[StoredPayload]:
+        """
+        Load the stored payload, or None if nothing usable is stored.
+        """
+        data = self.backend.get(self.key)
+        if data is None:
+            return None
+        try:
+            return StoredPayload.from_bytes(data)
+        except (TypeError, ValueError):
+            return None
+
+    def write(self, payload: StoredPayload) -> None:
+        """
+        Replace the stored payload and its metadata.
+        """
+        self.backend.set(self.key, payload.to_bytes())
+
+    def is_fresh(self, payload: StoredPayload) -> bool:
+        """
+        True if the payload is younger than the configured max age.
+        """
+        return payload.age < self.max_age
+
+    def acquire_refresh(self) -> bool:
+        """
+        Try to become the one process that refreshes this payload.
+        """
+        return self.backend.add(self.lock_key, b"1", ttl=REFRESH_LOCK_TTL)
+
+    def release_refresh(self) -> None:
+        """
+        Let another process refresh the payload next time it goes stale.
+        """
+        self.backend.delete(self.lock_key)
+
+
+class SummaryStore:
+    """
+    Share the published and unpublished counts of each payload through a
+    cache backend, keyed by the payload's content hash.
+
+    Parameters:
+    backend (CacheBackend): Where the counts live; the default backend
+        when None.
+    ttl (float): Seconds the counts of one payload are kept.
+    """
+
+    def __init__(
+        self, backend: Optional[CacheBackend] = None, ttl: float = SUMMARY_TTL
+    ):
+        self.backend = backend or default_backend()
+        self.ttl = ttl
+
+    def read(self, content_hash: str) -> Optional[Tuple[FairSummary, FairSummary]]:
+        """
+        The counts of the payload with `content_hash`, or None if no
+        process has stored them.
+        """
+        data = self.backend.get(f"summary.{content_hash}")
+        result = "miss" if data is None else "hit"
+        increment("cache_requests_total", cache="summary", result=result)
+        if data is None:
+            return None
+        try:
+            views = json.loads(data)
+            return tuple(FairSummary.from_dict(views[view]) for view in VIEWS)
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def write(
+        self, content_hash: str, summaries: Tuple[FairSummary, FairSummary]
+    ) -> None:
+        """
+        Store the counts of the payload with `content_hash`.
+        """
+        views = dict(zip(VIEWS, (summary.to_dict() for summary in summaries)))
+        self.backend.set(
+            f"summary.{content_hash}", json.dumps(views).encode(), ttl=self.ttl
+        )
+
+
+def fetch_payload(url: str, store: SnapshotStore, session=None) -> StoredPayload:
+    """
+    Return the payload for `url`, going to the network only when needed.
+
+    A stored payload younger than `store.max_age` is returned as is. An
+    older one is revalidated with If-None-Match / If-Modified-Since by
+    whichever process takes the refresh lock first; a 304 just refreshes
+    its timestamp. Processes that lose the race return the stored copy.
+    With nothing stored yet the full body is downloaded and stored. If the
+    request fails, the last good payload is returned when there is one.
+
+    Parameters:
+    url (str): The data-status endpoint.
+    store (SnapshotStore): Where the last good payload is kept.
+    session: Anything with a requests-style `get(url, headers=...)`, such
+        as `fair.client.IngestClient`; defaults to plain `requests`.
+
+    Returns:
+    StoredPayload: The current response body and its validators.
+    """
+    http = session or requests
+    cached = store.read()
+    if cached is not None and store.is_fresh(cached):
+        increment("cache_requests_total", cache="payload", result="hit")
+        return cached
+    if cached is not None and not store.acquire_refresh():
+        increment("cache_requests_total", cache="payload", result="hit")
+        return cached  # Another replica is already refreshing it
+
+    try:
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        try:
+            with span("download"):
+                response = http.get(url, headers=headers)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            if cached is None:
+                raise
+            print(f"Request failed, serving the last good snapshot: {e}")
+            increment("cache_requests_total", cache="payload", result="stale")
+            return cached
+
+        if response.status_code == 304 and cached is not None:
+            increment("cache_requests_total", cache="payload", result="revalidated")
+            cached.fetched_at = time.time()
+            store.write(cached)
+            return cached
+
+        payload = StoredPayload(
+            content=response.content,
+            fetched_at=time.time(),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+        increment("cache_requests_total", cache="payload", result="miss")
+        increment("payload_downloaded_bytes_total", len(payload.content))
+        store.write(payload)
+        return payload
+    finally:
+        if cached is not None:
+            store.release_refresh()
@@ -0,0 +1,202 @@
+"""
+Precomputed counts behind the "At a Glance" text and the charts.
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from fair.metrics import timed
+
+FLAG_COLUMNS = ("has_data", "has_donor_metadata", "has_contributors", "has_contacts")
+CUBE_COLUMNS = (
+    "status",
+    "data_access_level",
+    "dataset_status",
+    "dataset_type",
+    "organ",
+    "group_name",
+) + FLAG_COLUMNS
+
+
+@dataclass(frozen=True)
+class FairSummary:
+    """
+    Counts for one view of the catalog, built once per snapshot.
+
+    The frame is grouped once over every low-cardinality column the page
+    reports on; each count below is a marginal of that cube, so nothing
+    downstream has to scan the frame again. Count series are ordered like
+    `value_counts()` (largest first) and exclude missing values.
+
+    The per-value counts of every column, missing values included, are
+    kept in `value_counts`, so `updated` can apply a change to a handful
+    of datasets without regrouping the whole frame.
+    """
+
+    datasets: int = 0
+    by_status: pd.Series = field(default_factory=lambda: _counts())
+    by_access_level: pd.Series = field(default_factory=lambda: _counts())
+    by_dataset_status: pd.Series = field(default_factory=lambda: _counts())
+    by_group: pd.Series = field(default_factory=lambda: _counts())
+    flags: Dict[str, pd.Series] = field(
+        default_factory=lambda: {flag: _counts() for flag in FLAG_COLUMNS}
+    )
+    dataset_types: int = 0
+    organs: int = 0
+    donors: int = 0
+    groups: int = 0
+    value_counts: Dict[str, pd.Series] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    @timed("summarize", mode="full")
+    def from_frame(cls, frame: pd.DataFrame) -> "FairSummary":
+        """
+        Aggregate a normalized catalog frame.
+
+        Returns:
+        FairSummary: All counts for the frame; zeros for an empty frame.
+        """
+        columns = [column for column in CUBE_COLUMNS if column in frame]
+        if frame.empty or not columns:
+            return cls()
+
+        cube = frame.groupby(columns, observed=True, dropna=False).size()
+        value_counts = {
+            column: _keyed(
+                cube.groupby(level=column, observed=True, dropna=False).sum()
+            )
+            for column in columns
+        }
+        if "donor_hubmap_id" in frame:
+            value_counts["donor_hubmap_id"] = _keyed(
+                frame["donor_hubmap_id"].value_counts(dropna=False)
+            )
+        return cls.from_value_counts(len(frame), value_counts)
+
+    @classmethod
+    def from_value_counts(
+        cls, datasets: int, value_counts: Dict[str, pd.Series]
+    ) -> "FairSummary":
+        """
+        Build a summary from the per-value counts of each column.
+
+        Returns:
+        FairSummary: The marginals and distinct counts they imply.
+        """
+
+        def marginal(column: str) -> pd.Series:
+            counts = value_counts.get(column)
+            if counts is None:
+                return _counts()
+            counts = counts[counts.index.notna() & (counts > 0)]
+            return counts.sort_values(ascending=False, kind="stable")
+
+        def distinct(column: str) -> int:
+            # Like len(frame[column].unique()), a missing value counts once
+            counts = value_counts.get(column)
+            return 0 if counts is None else int((counts > 0).sum())
+
+        return cls(
+            datasets=datasets,
+            by_status=marginal("status"),
+            by_access_level=marginal("data_access_level"),
+            by_dataset_status=marginal("dataset_status"),
+            by_group=marginal("group_name"),
+            flags={flag: marginal(flag) for flag in FLAG_COLUMNS},
+            dataset_types=distinct("dataset_type"),
+            organs=distinct("organ"),
+            donors=distinct("donor_hubmap_id"),
+            groups=distinct("group_name"),
+            value_counts=value_counts,
+        )
+
+    def to_dict(self) -> dict:
+        """
+        The dataset count and per-value counts as plain JSON-ready values,
+        from which `from_dict` rebuilds every other count.
+        """
+        return {
+            "datasets": self.datasets,
+            "value_counts": {
+                column: [
+                    [None if pd.isna(value) else _plain(value), int(count)]
+                    for value, count in counts.items()
+                ]
+                for column, counts in self.value_counts.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FairSummary":
+        """
+        Inverse of `to_dict`.
+        """
+        value_counts = {}
+        for column, pairs in data["value_counts"].items():
+            index = pd.Index(
+                [np.nan if value is None else value for value, _ in pairs],
+                dtype=object,
+            )
+            value_counts[column] = pd.Series(
+                [count for _, count in pairs], index=index, dtype="int64", name="count"
+            )
+        return cls.from_value_counts(data["datasets"], value_counts)
+
+    @timed("summarize", mode="delta")
+    def updated(self, removed: pd.DataFrame, added: pd.DataFrame) -> "FairSummary":
+        """
+        The summary after `removed` rows left the view and `added` rows
+        joined it. A dataset whose fields changed is in both, with its old
+        and new values.
+
+        Returns:
+        FairSummary: The same counts as `from_frame` on the new view.
+        """
+        if not self.value_counts:
+            raise ValueError("Summary has no value counts to update")
+        value_counts = dict(self.value_counts)
+        for column, counts in self.value_counts.items():
+            # Deltas are small, so counting them in Python beats a groupby
+            change = Counter()
+            for rows, sign in ((added, 1), (removed, -1)):
+                for value in rows[column].to_numpy(dtype=object):
+                    change[np.nan if pd.isna(value) else value] += sign
+            change = {value: count for value, count in change.items() if count}
+            if not change:
+                # e.g. a status change leaves every other column as it was
+                continue
+            change = pd.Series(
+                list(change.values()), index=pd.Index(list(change), dtype=object)
+            )
+            counts = counts.add(change, fill_value=0)
+            counts = counts[counts != 0].astype("int64")
+            value_counts[column] = counts.sort_index(na_position="last")
+        datasets = self.datasets + len(added) - len(removed)
+        return FairSummary.from_value_counts(datasets, value_counts)
+
+
+def _keyed(counts: pd.Series) -> pd.Series:
+    """
+    Counts indexed by plain Python values in sorted order, with every
+    missing value as NaN, so series from different frames align.
+    """
+    index = pd.Index(counts.index.astype(object), dtype=object)
+    counts = pd.Series(
+        counts.to_numpy(dtype="int64"),
+        index=index.where(index.notna(), np.nan),
+        name="count",
+    )
+    return counts.sort_index(na_position="last")
+
+
+def _plain(value):
+    # numpy scalars (e.g. a flag's np.True_) as the Python values json takes
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _counts() -> pd.Series:
+    return pd.Series(dtype="int64", name="count")
@@ -0,0 +1,163 @@
+"""
+Server-side paging, sorting and filtering for the dataset tables.
+
+Sending a whole table to the browser on every rerun makes both the
+payload and the browser's memory grow with the catalog. `PagedTable`
+keeps the table on the server and hands out one page at a time. The row
+order for a sort is computed once per snapshot, and the rows matching a
+filter once per query, so turning a page only gathers `page_size` rows.
+"""
+
+import math
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+PAGE_SIZES = (10, 25, 50, 100)
+DEFAULT_PAGE_SIZE = int(os.environ.get("FAIR_PAGE_SIZE", 25))
+DEFAULT_CACHED_QUERIES = 16
+
+
+@dataclass(frozen=True)
+class TableQuery:
+    """
+    Which rows of a table to show and in what order.
+
+    `filter_text` keeps the rows whose `filter_column` contains it,
+    ignoring case; an empty text keeps every row.
+    """
+
+    sort_by: Optional[str] = None
+    descending: bool = False
+    filter_column: Optional[str] = None
+    filter_text: str = ""
+
+
+@dataclass(frozen=True)
+class Page:
+    """
+    One page of a table, with what is needed to describe where it is.
+    """
+
+    rows: pd.DataFrame
+    number: int  # 1-based
+    page_size: int
+    total: int  # rows matching the query
+
+    @property
+    def pages(self) -> int:
+        """
+        Number of pages the matching rows fill; at least one.
+        """
+        return max(1, math.ceil(self.total / self.page_size))
+
+    @property
+    def start(self) -> int:
+        """
+        Position of the first row of the page among the matching rows.
+        """
+        return (self.number - 1) * self.page_size
+
+
+class PagedTable:
+    """
+    A table that is sorted, filtered and sliced on the server.
+
+    Sort orders are kept per column and direction, and the row positions of
+    the last `max_queries` queries are kept as well, so reading another
+    page of a recent query costs the same whatever the size of the table.
+    Instances are safe to share between sessions.
+    """
+
+    def __init__(self, frame: pd.DataFrame, max_queries: int = DEFAULT_CACHED_QUERIES):
+        self.frame = frame
+        self.max_queries = max_queries
+        self._orders: Dict[Tuple[str, bool], np.ndarray] = {}
+        self._rows: "OrderedDict[TableQuery, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def rows(self, query: TableQuery) -> np.ndarray:
+        """
+        Positions of the rows matching `query`, in display order.
+
+        Returns:
+        np.ndarray: Integer positions into `frame`.
+        """
+        with self._lock:
+            rows = self._rows.get(query)
+            if rows is not None:
+                self._rows.move_to_end(query)
+                return rows
+
+        if query.sort_by is None:
+            rows = np.arange(len(self.frame))
+        else:
+            rows = self._order(query.sort_by, query.descending)
+        if query.filter_column is not None and query.filter_text:
+            matches = self._matches(query.filter_column, query.filter_text)
+            rows = rows[matches[rows]]
+
+        with self._lock:
+            self._rows[query] = rows
+            while len(self._rows) > self.max_queries:
+                self._rows.popitem(last=False)
+        return rows
+
+    def page(
+        self, query: TableQuery, number: int, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> Page:
+        """
+        Page `number` (1-based) of the rows matching `query`. Numbers past
+        either end are clamped to the first or last page.
+
+        Returns:
+        Page: The rows of the page and the total number of matching rows.
+        """
+        rows = self.rows(query)
+        pages = max(1, math.ceil(len(rows) / page_size))
+        number = min(max(1, number), pages)
+        start = (number - 1) * page_size
+        return Page(
+            self.frame.iloc[rows[start : start + page_size]],
+            number,
+            page_size,
+            len(rows),
+        )
+
+    def _order(self, column: str, descending: bool) -> np.ndarray:
+        key = (column, descending)
+        order = self._orders.get(key)
+        if order is None:
+            # Categorical columns sort by category order; missing values last
+            order = (
+                self.frame[column]
+                .reset_index(drop=True)
+                .sort_values(ascending=not descending, kind="stable")
+                .index.to_numpy()
+            )
+            with self._lock:
+                self._orders[key] = order
+        return order
+
+    def _matches(self, column: str, text: str) -> np.ndarray:
+        values = self.frame[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Test each category once, then look the answers up by code
+            categories = values.cat.categories.astype(str)
+            hits = categories.str.contains(text, case=False, regex=False)
+            hits = np.append(np.asarray(hits, dtype=bool), False)
+            return hits[values.cat.codes.to_numpy()]
+        return (
+            values.astype("string")
+            .str.contains(text, case=False, regex=False)
+            .fillna(False)
+            .to_numpy(dtype=bool)
+        )
@@ -0,0 +1,124 @@
+"""
+Catalog trends over time, binned by when datasets were created.
+
+`Trends` bins `created_at` by month or quarter with datetime64 arithmetic
+on the whole column, then groups the frame once into a small cube: for
+every period, organ and group, how many datasets were created, how many
+of those are published, and how many have donor metadata, contributors
+and contacts. Every trend the page shows is a cumulative sum over a
+marginal of that cube, so it costs the same however large the catalog.
+
+Status is only known as of the snapshot, so the published / unpublished
+backlog splits the datasets created up to each period by their current
+status.
+"""
+
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+FREQUENCIES = {"M": 1, "Q": 3}  # months per period
+BREAKDOWN_COLUMNS = ("organ", "group_name")
+SHARE_COLUMNS = ("has_donor_metadata", "has_contributors", "has_contacts")
+TOTAL = "All datasets"
+
+
+class Trends:
+    """
+    Datasets created per period, per breakdown value, built once per
+    snapshot and frequency.
+    """
+
+    def __init__(self, cube: pd.DataFrame, periods: pd.DatetimeIndex, freq: str):
+        self.cube = cube
+        self.periods = periods
+        self.freq = freq
+
+    @classmethod
+    def from_frame(
+        cls,
+        frame: pd.DataFrame,
+        freq: str = "M",
+        columns: Sequence[str] = BREAKDOWN_COLUMNS,
+    ) -> "Trends":
+        """
+        Bin a normalized catalog frame by `freq`, "M" (month) or "Q"
+        (quarter). Datasets without a creation time are left out.
+
+        Returns:
+        Trends: The period x breakdown cube and every period it spans.
+        """
+        step = FREQUENCIES[freq]
+        created = frame["created_at"].to_numpy(dtype="datetime64[ns]")
+        dated = ~np.isnat(created)
+        months = created[dated].astype("datetime64[M]").astype(np.int64)
+        period = ((months // step) * step).astype("datetime64[M]")
+
+        columns = [column for column in columns if column in frame]
+        rows = frame.loc[dated, columns].copy()
+        rows["period"] = period.astype("datetime64[ns]")
+        rows["datasets"] = 1
+        rows["published"] = (frame.loc[dated, "status"] == "Published").to_numpy(
+            dtype=bool
+        )
+        for flag in SHARE_COLUMNS:
+            rows[flag] = frame.loc[dated, flag].fillna(False).to_numpy(dtype=bool)
+        measures = ["datasets", "published", *SHARE_COLUMNS]
+        cube = rows.groupby(["period", *columns], observed=True, dropna=False)[
+            measures
+        ].sum()
+
+        if len(period):
+            span = np.arange(period.min(), period.max() + 1, step)
+        else:
+            span = np.array([], dtype="datetime64[M]")
+        return cls(cube, pd.DatetimeIndex(span.astype("datetime64[ns]")), freq)
+
+    def cumulative(self, measure: str, by: Optional[str] = None) -> pd.DataFrame:
+        """
+        Running total of `measure` per period, for every value of `by`,
+        or for the whole catalog when `by` is None.
+
+        Returns:
+        pd.DataFrame: One row per period, one column per breakdown value.
+        """
+        levels = ["period"] if by is None else ["period", by]
+        per_period = self.cube[measure].groupby(level=levels, observed=True).sum()
+        if by is None:
+            per_period = per_period.to_frame(TOTAL)
+        else:
+            per_period = per_period.unstack(by, fill_value=0)
+            per_period.columns = per_period.columns.astype(str)
+        return per_period.reindex(self.periods, fill_value=0).cumsum()
+
+    def growth(self, by: Optional[str] = None) -> pd.DataFrame:
+        """
+        Total datasets created up to each period.
+        """
+        return self.cumulative("datasets", by)
+
+    def backlog(self) -> pd.DataFrame:
+        """
+        Datasets created up to each period, split by whether they are
+        published now.
+
+        Returns:
+        pd.DataFrame: "Published" and "Unpublished" columns per period.
+        """
+        datasets = self.cumulative("datasets")[TOTAL]
+        published = self.cumulative("published")[TOTAL]
+        return pd.DataFrame(
+            {"Published": published, "Unpublished": datasets - published}
+        )
+
+    def share(self, flag: str, by: Optional[str] = None) -> pd.DataFrame:
+        """
+        Percentage of the datasets created up to each period that have
+        `flag` set.
+
+        Returns:
+        pd.DataFrame: Shares from 0 to 100; NaN before the first dataset.
+        """
+        datasets = self.cumulative("datasets", by)
+        return 100 * self.cumulative(flag, by) / datasets.where(datasets > 0)
@@ -1,8 +1,46 @@
+import dataclasses
+import hashlib
+import time
+
 import streamlit as st
-import requests
 import pandas as pd
-import matplotlib.pyplot as plt
-from wordcloud import WordCloud
+
+from fair.backends import default_backend
+from fair.charts import (
+    CHARTS,
+    PUBLISHED_CHARTS,
+    UNPUBLISHED_CHARTS,
+    ChartCache,
+    chart_counts,
+    counts_hash,
+)
+from fair.figures import render_png
+from fair.client import DATA_STATUS_URL, IngestClient
+from fair.delta import DEFAULT_INCREMENTAL, SnapshotDiff
+from fair.facets import FacetIndex, selection_key
+from fair.history import HistoryStore
+from fair.metrics import (
+    DEBUG_PANEL,
+    DEFAULT_METRICS_FILE,
+    DEFAULT_METRICS_PORT,
+    METRICS,
+)
+from fair.metrics import increment, set_gauge, span, timed
+from fair.normalize import normalize
+from fair.plots import DEFAULT_CHART_MODE, PLOTS, sites_map_plot
+from fair.parse import DATASET_COLUMNS, parse_datasets
+from fair.refresh import BackgroundRefresher
+from fair.scoring import CRITERIA, DEFAULT_WEIGHTS, FairScores
+from fair.snapshot import Snapshot
+from fair.store import (
+    DEFAULT_MAX_AGE,
+    SnapshotStore,
+    StoredPayload,
+    SummaryStore,
+    fetch_payload,
+)
+from fair.table import DEFAULT_PAGE_SIZE, PAGE_SIZES, PagedTable, TableQuery
+from fair.trends import Trends
 
 
 ## DO NOT MODIFY THIS BLOCK
@@ -14,558 +52,702 @@ def determine_type(dataset_type: str) -> str:
         return "Primary"
 
 
-@st.cache_data
-def get_data() -> pd.DataFrame:
+def load_snapshot(
+    store: SnapshotStore,
+    client: IngestClient,
+    history: HistoryStore,
+    previous: Snapshot = None,
+    summaries: SummaryStore = None,
+) -> Snapshot:
     """
-    Fetch data from a predefined URL, extract the 'data' key,
-    and return it as a DataFrame.
+    Fetch the data-status catalog once, extract the 'data' key,
+    and split every dataset into published and unpublished frames.
+
+    The payload is downloaded and parsed only once for both views. The raw
+    payload is kept in the shared cache backend and revalidated once it is
+    older than FAIR_MAX_AGE seconds, so restarts start warm. Every distinct
+    payload is also kept in the snapshot history, and a payload that is
+    already there is read back from it instead of being parsed again; one
+    with the same content as `previous` is not read at all. Its published
+    and unpublished counts are shared through the cache backend too, so
+    only the first replica to load a payload counts it.
+
+    With FAIR_INCREMENTAL on (the default), a new payload is diffed against
+    the previous snapshot: its counts are updated from the changed datasets
+    only, and only those datasets are added to the history.
+
+    Parameters:
+    store (SnapshotStore): Keeps the last good payload.
+    client (IngestClient): Pooled, retrying HTTP client for the ingest API.
+    history (HistoryStore): Parquet copies of every snapshot seen.
+    previous (Snapshot): The snapshot currently served, if any.
+    summaries (SummaryStore): Counts shared by other replicas, if any.
 
     Returns:
-    pd.DataFrame: The data extracted from the 'data' key loaded into a DataFrame.
+    Snapshot: All datasets with the derived columns from fair.normalize.
     """
-    url = "https://ingest.api.hubmapconsortium.org/datasets/data-status"  # The URL to get the data from
+    with span("fetch"):
+        payload = fetch_payload(
+            DATA_STATUS_URL, store, client
+        )  # Read the data from the cache, or from the URL if it is stale
+    set_gauge("payload_bytes", len(payload.content))
+    content_hash = hashlib.sha256(payload.content).hexdigest()
+    if previous is not None and previous.content_hash == content_hash:
+        # Unchanged catalog: keep serving it, only with the new fetch time
+        return dataclasses.replace(previous, fetched_at=payload.fetched_at)
+    shared = None
+    if summaries is not None:
+        try:
+            shared = summaries.read(content_hash)
+        except Exception as e:
+            print(f"Could not read shared counts: {e}")
     try:
-        response = requests.get(url)  # Send a request to the URL to get the data
-        response.raise_for_status()  # Check if the request was successful (no errors)
-        json_data = response.json()  # Convert the response to JSON format
-
-        # Ensure 'data' key exists in the JSON
-        if "data" in json_data:  # Check if the JSON contains the key 'data'
-            df = pd.DataFrame(
-                json_data["data"]
-            )  # Create a DataFrame using the data under 'data' key
-            df = df[df["status"] == "Published"]
-            df["dataset_status"] = df["dataset_type"].apply(determine_type)
-            print("Data successfully loaded.")  # Print a message indicating success
-        else:
-            raise KeyError(
-                "'data' key not found in the JSON response"
-            )  # Raise an error if 'data' key is missing
-
-        return df  # Return the DataFrame with the data
-    except (ValueError, KeyError) as e:  # Catch errors related to value or missing keys
-        print(f"Error loading data: {e}")  # Print the error message
-        return pd.DataFrame()  # Return an empty DataFrame if there is an error
-    except requests.RequestException as e:  # Catch errors related to the request itself
-        print(f"Request failed: {e}")  # Print the error message
-        return pd.DataFrame()  # Return an empty DataFrame if the request fails
-
-
-# Unpublished dataframe
-@st.cache_data
-def get_unpublished_data() -> pd.DataFrame:
+        with span("history_load"):
+            snapshot = history.load(content_hash, payload.fetched_at, shared)
+    except Exception as e:
+        print(f"Could not read snapshot history: {e}")
+        snapshot = None
+    increment(
+        "cache_requests_total",
+        cache="history",
+        result="miss" if snapshot is None else "hit",
+    )
+    if snapshot is None:
+        snapshot = parse_snapshot(payload, content_hash, history, previous, shared)
+    if summaries is not None and shared is None and not snapshot.frame.empty:
+        try:
+            summaries.write(
+                content_hash,
+                (snapshot.published_summary, snapshot.unpublished_summary),
+            )
+        except Exception as e:
+            print(f"Could not share counts: {e}")
+    return snapshot
+
+
+def parse_snapshot(
+    payload: StoredPayload,
+    content_hash: str,
+    history: HistoryStore,
+    previous: Snapshot = None,
+    shared: tuple = None,
+) -> Snapshot:
     """
-    Fetch data from a predefined URL, extract the 'data' key,
-    and return it as a DataFrame.
+    Parse a payload that is not in the snapshot history yet, and add it.
+
+    Parameters:
+    payload (StoredPayload): The fetched payload.
+    content_hash (str): Its SHA-256.
+    history (HistoryStore): Parquet copies of every snapshot seen.
+    previous (Snapshot): The snapshot currently served, if any.
+    shared (tuple): Its published and unpublished FairSummary, if shared
+    by another replica.
 
     Returns:
-    pd.DataFrame: The data extracted from the 'data' key loaded into a DataFrame.
+    Snapshot: All datasets with the derived columns from fair.normalize.
     """
-    url = "https://ingest.api.hubmapconsortium.org/datasets/data-status"  # The URL to get the data from
+    with span("parse"):
+        df = parse_datasets(
+            payload.content
+        )  # Build a DataFrame from the 'data' key, keeping only the columns we use
+    with span("normalize"):
+        df = normalize(df)  # Derive dataset_status, dates and labels once
+    print("Data successfully loaded.")  # Print a message indicating success
+    snapshot = diff = None
+    if DEFAULT_INCREMENTAL and previous is not None and not previous.frame.empty:
+        try:
+            with span("diff"):
+                diff = SnapshotDiff.between(previous.frame, df)
+            if shared is None:
+                snapshot = previous.updated(df, diff, payload.fetched_at, content_hash)
+        except ValueError as e:
+            print(f"Incremental update failed, recounting: {e}")
+            diff = None
+    if snapshot is None:
+        snapshot = Snapshot.from_frame(df, payload.fetched_at, content_hash, shared)
     try:
-        response = requests.get(url)  # Send a request to the URL to get the data
-        response.raise_for_status()  # Check if the request was successful (no errors)
-        json_data = response.json()  # Convert the response to JSON format
-
-        # Ensure 'data' key exists in the JSON
-        if "data" in json_data:  # Check if the JSON contains the key 'data'
-            df = pd.DataFrame(
-                json_data["data"]
-            )  # Create a DataFrame using the data under 'data' key
-            df = df[df["status"] != "Published"]
-            df["dataset_status"] = df["dataset_type"].apply(determine_type)
-            print("Data successfully loaded.")  # Print a message indicating success
-        else:
-            raise KeyError(
-                "'data' key not found in the JSON response"
-            )  # Raise an error if 'data' key is missing
-
-        return df  # Return the DataFrame with the data
-    except (ValueError, KeyError) as e:  # Catch errors related to value or missing keys
-        print(f"Error loading data: {e}")  # Print the error message
-        return pd.DataFrame()  # Return an empty DataFrame if there is an error
-    except requests.RequestException as e:  # Catch errors related to the request itself
-        print(f"Request failed: {e}")  # Print the error message
-        return pd.DataFrame()  # Return an empty DataFrame if the request fails
-
-
-df = get_data()
-df2 = get_unpublished_data()
-## DO NOT MODIFY THIS BLOCK
+        with span("history_save"):
+            history.save(
+                snapshot, None if diff is None else previous.content_hash, diff
+            )
+    except Exception as e:
+        print(f"Could not save snapshot history: {e}")
+    return snapshot
 
-# Convert the dictionary into a DataFrame
-
-
-## DO NOT MODIFY THIS BLOCK
 
-logo_url = "https://hubmapconsortium.org/wp-content/uploads/2019/01/HuBMAP-Retina-Logo-Color-300x110.png"
-st.image(logo_url)
-# Display the logo with column width fitting
-
-title = "# FAIR Assessment of HuBMAP data"
-st.write(title)
-
-authors = "Bailey, T.; Chen, J.; Esmaeeli, A.; Hernandez, Y.; Ho, M.; Lampejo, M.; Ma, J.; Martinez, G.; Rubio Martinez, V.; Forchap, E.; Mathurin, S.; Omar, Y.; Segil, J.; McLeod, A.; Cao-Berg, I."
-st.write(authors)
-
-today = pd.Timestamp.today().strftime("%m-%d-%Y")
-st.write(today)
-
-abstract = """
-The Human BioMolecular Atlas Program (HuBMAP) aims to create a comprehensive 3D-map representation of the human body and improve data access while developing methods for tissue interrogation applicable to other studies. In its first phase, HuBMAP achieved significant milestones, including the development of critical resources, standardized protocols, innovative imaging and sequencing techniques, and a reliable data integration platform. These efforts have led to the creation of high-resolution molecular and cellular maps that are essential resources for biomedical research. Researchers are expanding the map from 2D to 3D environments, incorporating niche factors such as age and ethnicity. The core value of HuBMAP is to provide freely accessible data via its online portal. Future directions include investigating changes in individual cells and neighborhoods during healthy aging and diseases that will help develop better drugs, predict disease outcomes, and understand disease progression in clinical settings. The program adheres to the FAIR guiding principles for scientific data management and stewardship, ensuring findability, accessibility, interoperability, and reusability of data. We researched these properties of HuBMAP, along with whether it has rich metadata, identifiable titles, standardized communication protocols, and open access to metadata even if the data itself is no longer available.
-"""
-# Anchor point
-st.title("Abstract")
-st.sidebar.markdown("[Abstract](#abstract)", unsafe_allow_html=True)
-st.write(abstract)
+@st.cache_resource
+def get_history() -> HistoryStore:
+    """
+    Process-wide store of past snapshots.
 
-about_us = """
-# About Us
-"""
-st.write(about_us)
-import plotly.graph_objects as go
-
-state_abbreviations = {
-    "Massachusetts": "MA",
-    "New York": "NY",
-    "Missouri": "MO",
-    "Kentucky": "KY",
-    "New Jersey": "NJ",
-    "Alabama": "AL",
-    "California": "CA",
-    "Georgia": "GA",
-    "Texas": "TX",
-    "Illinois": "IL",
-    "Pennsylvania": "PA",
-}
+    Returns:
+    HistoryStore: Parquet files under FAIR_HISTORY_DIR.
+    """
+    return HistoryStore()
 
-state_population = {
-    "MA": 1,
-    "NY": 1,
-    "MO": 1,
-    "KY": 1,
-    "NJ": 1,
-    "AL": 1,
-    "CA": 3,
-    "GA": 1,
-    "TX": 2,
-    "IL": 1,
-    "PA": 1,
-}
 
-state_codes = list(state_abbreviations.values())
-state_names = list(state_abbreviations.keys())
-
-hovertext = [
-    f"{state_names[i]}<br>Population: {state_population[code]:,}"
-    for i, code in enumerate(state_codes)
-]
-
-data = go.Choropleth(
-    locations=state_codes,
-    z=[state_population[code] for code in state_codes],
-    locationmode="USA-states",
-    colorscale="Reds",
-    hoverinfo="location+text",
-    hovertext=hovertext,
-    marker_line_color="black",
-    colorbar=dict(title="Population", tickvals=[1, 2, 3], ticktext=["1", "2", "3"]),
-)
+@st.cache_resource
+def get_refresher() -> BackgroundRefresher:
+    """
+    Start the process-wide worker that reloads the catalog in the background.
 
-layout = go.Layout(
-    geo=dict(
-        scope="usa",
-        projection=dict(type="albers usa"),
-        showlakes=False,
-        showland=True,
-        landcolor="rgb(217, 217, 217)",
+    Returns:
+    BackgroundRefresher: Holds the snapshot currently being served.
+    """
+    store = SnapshotStore()
+    client = IngestClient()
+    history = get_history()
+    summaries = SummaryStore(store.backend)
+    refresher = BackgroundRefresher(
+        lambda: load_snapshot(store, client, history, refresher.current, summaries),
+        interval=max(DEFAULT_MAX_AGE, 60),
+        name="data-status-refresher",
     )
-)
-
-fig = go.Figure(data=[data], layout=layout)
-st.plotly_chart(fig)
-
-intro = """
-The Human BioMolecular Atlas Program (HuBMAP) is an initiative that aims to create a comprehensive multi-scale spatial atlas of the healthy human body. HuBMAP aims to help biomedical researchers visualize how the cells in the human body influence our health and can also help others understand the way in which the human body functions. HuBMAP can only finalize its atlas with the help of data providers, data curators and other contributors. 
-
-Data providers are crucial to HuBMAP, these providers are responsible for producing biological data from various tissues of donors. These tissues are utilized by different types of cutting-edge technologies such as, single cell transcriptomics, bulk tissue arrays, etc. These providers generate high-quality datasets that help form a structure for HuBMAP.
+    return refresher.start()
 
-Additionally, HIVE — the HuBMAP Integration, Visualization, and Engagement team holds the responsibility of curating, integrating, and standardizing the vast amount of datasets. HIVE ensures that the datasets meet quality standards before they become publicly available. HIVE also helps develop analytical tools for scientific researchers to understand and utilize the datasets.
-
-With all the data provided and curated, contributors then develop innovative tools that enhance data analysis and help transform the data into the atlas. Contributions come from 42 different sites, 14 states, and 4 countries. With these contributions, HuBMAP is able to advance its technological and scientific capabilities.
-
-Through the seamless integration of work from data providers, contributors, and HIVE, HuBMAP strives to create a high-tech transformational atlas that fosters inventions of new discoveries in the field of biomedical research.
-"""
-st.title("Introduction")
-st.sidebar.markdown("[Introduction](#introduction)", unsafe_allow_html=True)
-st.write(intro)
 
+@st.cache_resource(max_entries=4)
+def get_past_snapshot(content_hash: str) -> Snapshot:
+    """
+    A snapshot from the history, read from its Parquet file once.
 
-introImg_url = "https://media.springernature.com/full/springer-static/image/art%3A10.1038%2Fs41586-019-1629-x/MediaObjects/41586_2019_1629_Fig1_HTML.png?as=webp"
-st.image(introImg_url, use_column_width=True)
+    Parameters:
+    content_hash (str): Hash of the payload the snapshot came from.
 
-introImgCaption = """
-The TMCs will collect tissue samples and generate spatially resolved, single-cell data. Groups involved in TTD and RTI initiatives will develop emerging and more developed technologies, respectively; in later years, these will be implemented at scale. Data from all groups will be rendered useable for the biomedical community by the HuBMAP integration, visualization and engagement (HIVE) teams. The groups will collaborate closely to iteratively refine the atlas as it is gradually realized. (HuBMAP Consortium)
-"""
-st.write(introImgCaption)
+    Returns:
+    Snapshot: The stored snapshot, or an empty one if it is gone.
+    """
+    return get_history().load(content_hash) or Snapshot.empty()
 
-# Method = """
 
-method = """
+def format_time(seconds: float) -> str:
+    """
+    Format a Unix time the way the page shows snapshot times.
 
-# Overview
-The Human Biomolecular Atlas Program(HuBMAP) funded by the National Institute of Health(NIH), provides spatial molecular data which serves as a way to completely map out the human body to promote intuitive and revolutionary research. However, in order for the research to be comprehensive and understandable by professionals and the public alike, it needs to be Findable, Accessible, Interoperable, and Reusable. The FAIR guidelines provide a path for the HuBMAP data to lessen unavoidable bias, and corrupt data. The purpose of the project by the Carnegie Mellon Summer Academy for Math and Science team, serves as a means to analyze some of the HuBMAP data, and report back on the level to which the data adheres to the first two FAIR principles(Findable and Accessible). 
-"""
+    Returns:
+    str: e.g. "07-01-2024 13:05 UTC".
+    """
+    return pd.Timestamp(seconds, unit="s").strftime("%m-%d-%Y %H:%M UTC")
 
-st.sidebar.markdown("[Overview](#overview)", unsafe_allow_html=True)
-st.write(method)
 
-st.header("Published Data")
-st.sidebar.markdown("[Published Data](#published-data)", unsafe_allow_html=True)
+def snapshot_picker(live: Snapshot) -> Snapshot:
+    """
+    Sidebar choice between the live snapshot and the stored past ones.
 
-text = "### At a Glance"
-st.write(text)
+    Parameters:
+    live (Snapshot): The snapshot currently being served.
 
+    Returns:
+    Snapshot: The snapshot to show.
+    """
+    entries = [
+        entry
+        for entry in reversed(get_history().entries())
+        if entry.content_hash != live.content_hash
+    ]
+    if not entries:
+        return live
+    labels = {
+        entry.content_hash: f"{format_time(entry.fetched_at)} ({entry.datasets} datasets)"
+        for entry in entries
+    }
+    chosen = st.sidebar.selectbox(
+        "Snapshot",
+        [None] + list(labels),
+        format_func=lambda content_hash: labels.get(content_hash, "Latest"),
+        key="snapshot",
+    )
+    if chosen is None:
+        return live
+    return get_past_snapshot(chosen)
 
-# At a glance sentences
-# wordcloud
-fig, ax = plt.subplots()
-wordcloud = WordCloud(
-    width=800, height=400, background_color="white"
-).generate_from_frequencies(df["group_name"].value_counts())
-
-fig, ax = plt.subplots(figsize=(10, 5))  # Set the figure size
-ax.imshow(wordcloud, interpolation="bilinear")
-ax.axis("off")  # Hide the axis
-
-st.pyplot(fig)
-# wordcloud
-number_of_datasets = len(df)
-access_level_protected = df["data_access_level"].value_counts()["protected"]
-access_level_public = df["data_access_level"].value_counts()["public"]
-dataset_status_derived = df["dataset_status"].value_counts()["Derived"]
-dataset_status_primary = df["dataset_status"].value_counts()["Primary"]
-
-dataset_types = df["dataset_type"].unique()
-number_of_dataset_types = len(dataset_types)
-organs = df["organ"].unique()
-number_of_organs = len(organs)
-
-donors = df["donor_hubmap_id"].unique()
-number_of_donors = len(donors)
-
-groups = df["group_name"].unique()
-number_of_groups = len(groups)
-
-answer = f"""
-* The number of datasets are **{number_of_datasets}**.
-    * The number of  datasets that are protected is **{access_level_protected}**.
-    * The number of datasets that are public is **{access_level_public}**.
-* The number of dataset types are **{number_of_dataset_types}**.
-    * The number of datasets with a derived status is **{dataset_status_derived}**.
-    * The number of datasets with a primary status is **{dataset_status_primary}**.
-* The number of organ types are **{number_of_organs}**.
-* The number of donors for the datasets are **{number_of_donors}**.
-* The number of groups for the datasets are **{number_of_groups}**."""
-
-st.write(answer)
-
-# At a a glance sentences (closed)
-
-text = "## Observability"
-st.write(text)
 
-text = "### Datasets"
-st.write(text)
+@st.cache_resource(max_entries=4)
+def get_changes(version: str, _frame: pd.DataFrame):
+    """
+    How a snapshot differs from the one stored before it in the history.
 
-columns = [
-    "organ",
-    "dataset_type",
-    "group_name",
-    "created_timestamp",
-    "data_access_level",
-]
-df_display = df[columns]
-df_display["created_timestamp"] = df_display["created_timestamp"].apply(
-    lambda time: pd.to_datetime(time, unit="ms").strftime("%m-%d-%Y")
-)
-df_display["data_access_level"] = df_display["data_access_level"].str.capitalize()
-df_display.rename(
-    columns={
-        "organ": "Organ",
-        "dataset_type": "Dataset Type",
-        "created_timestamp": "Date Added",
-        "group_name": "Group Name",
-        "data_access_level": "Data Access Level",
-    },
-    inplace=True,
-)
-st.write(df_display)
+    Parameters:
+    version (str): Content hash of the snapshot.
+    _frame (pd.DataFrame): Its full catalog frame.
 
-# Title for Graphs
-st.header("Graphs")
-st.sidebar.markdown("[Graphs](#graphs)", unsafe_allow_html=True)
+    Returns:
+    Optional[Tuple[HistoryEntry, SnapshotDiff]]: The earlier snapshot and
+    the diff, or None if there is no earlier snapshot to compare with.
+    """
+    history = get_history()
+    entries = history.entries()
+    stored_at = {entry.content_hash: entry.fetched_at for entry in entries}.get(version)
+    earlier = [
+        entry
+        for entry in entries
+        if entry.content_hash != version
+        and (stored_at is None or entry.fetched_at < stored_at)
+    ]
+    if not earlier:
+        return None
+    try:
+        before = history.read(earlier[-1].content_hash, DATASET_COLUMNS)
+        return earlier[-1], SnapshotDiff.between(before, _frame)
+    except Exception as e:
+        print(f"Could not compare with the previous snapshot: {e}")
+        return None
 
-# Creating columns for graphs
 
-col1, col2, col3, col4, col5, col6, col7 = st.columns(7)
+def get_snapshot() -> Snapshot:
+    """
+    Return the snapshot currently being served, without waiting on a reload.
 
-# Count how many times each unique value appears in the 'data_access_level' column
-access_level_counts = df["has_data"].value_counts()
+    Returns:
+    Snapshot: The latest successfully loaded catalog, or an empty one.
+    """
+    snapshot = get_refresher().get() or Snapshot.empty()
+    for name, frame in (
+        ("all", snapshot.frame),
+        ("published", snapshot.published),
+        ("unpublished", snapshot.unpublished),
+    ):
+        set_gauge("rows", len(frame), frame=name)
+    return snapshot
 
 
-# Start making a donut chart
+def get_data() -> pd.DataFrame:
+    """
+    Return the published datasets from the shared snapshot.
 
-plt.clf()
-fig, ax = plt.subplots(
-    figsize=(5, 5)
-)  # Create a blank space (figure) where the chart will be drawn
-colors = ["#cadF9E"]
-# Plot a pie chart that will later become a donut chart
-wedges, texts, autotexts = ax.pie(
-    access_level_counts,  # This is the data we're using — the counts of each access level
-    autopct="%1.1f%%",  # This makes sure that each piece of the pie shows its percentage like "25.0%"
-    startangle=90,  # This starts the first piece of the pie at the top of the circle
-    wedgeprops=dict(
-        width=0.3
-    ),  # This makes the pie chart have a hole in the middle, turning it into a donut chart
-    colors=colors,
-)
+    Returns:
+    pd.DataFrame: The datasets whose status is 'Published'.
+    """
+    return get_snapshot().published
 
-# Draw a white circle in the middle to make it look like a donut instead of a pie
-centre_circle = plt.Circle(
-    (0, 0),  # This places the circle in the middle of the chart
-    0.70,  # This sets the size of the white circle, making sure it's small enough to see the data around it but big enough to make a 'hole'
-    fc="white",  # 'fc' stands for fill color, which we're setting to white here
-)
-fig.gca().add_artist(centre_circle)  # This adds the white circle to our chart
-
-ax.legend(
-    wedges,
-    access_level_counts.index,
-    title="Contributors",
-    loc="center right",
-    bbox_to_anchor=(1.2, 0.5),
-)
 
+# Unpublished dataframe
+def get_unpublished_data() -> pd.DataFrame:
+    """
+    Return the unpublished datasets from the shared snapshot.
 
-# Make sure the chart is a perfect circle
-ax.axis(
-    "equal"
-)  # This command makes sure the height and width are the same, keeping our donut round
+    Returns:
+    pd.DataFrame: The datasets whose status is not 'Published'.
+    """
+    return get_snapshot().unpublished
 
-# Add a title to the chart
-plt.title("Percentages of Dataset with Data")
 
+@st.cache_resource
+def get_chart_cache() -> ChartCache:
+    """
+    Process-wide cache of rendered chart images.
 
-# Display the plot in Streamlit
-plt.tight_layout()
-with col1:
-    st.pyplot(fig)
+    Returns:
+    ChartCache: Images keyed by chart name and data version, also kept in
+    the shared cache backend.
+    """
+    return ChartCache(backend=default_backend())
 
-text = "### Datasets"
-st.write(text)
 
-text = "### Data access level"
-st.write(text)
+def show_chart(name: str, counts: pd.Series, version: str = None) -> None:
+    """
+    Display one of fair.charts.CHARTS.
 
-# Count how many times each boolean appears in the data
-data_counts = df["has_donor_metadata"].value_counts()
+    In the default "plotly" chart mode, charts that have a Plotly version
+    are sent to the browser as counts and drawn there. Otherwise the
+    matplotlib image is shown, drawn only if it is not cached yet.
 
-# Plot pie chart using Streamlit
-fig, ax = plt.subplots(figsize=(3, 3))
-wedges, texts, autotexts = ax.pie(
-    data_counts, autopct="%1.1f%%", startangle=90, colors=["#cadF9E"]
-)
-centre_circle = plt.Circle((0, 0), 0.70, fc="white")
-fig.gca().add_artist(centre_circle)
+    Parameters:
+    name (str): Key into fair.charts.CHARTS.
+    counts (pd.Series): The counts the chart is drawn from; a frame of
+    series for the trend charts.
+    version (str): What the image depends on; the snapshot hash by default.
+    """
+    with span("chart", chart=name):
+        if DEFAULT_CHART_MODE == "plotly" and name in PLOTS:
+            st.plotly_chart(PLOTS[name](counts), key=name)
+            return
+        image = get_chart_cache().get_or_render(
+            (name, version or snapshot.content_hash),
+            lambda: render_png(CHARTS[name], counts),
+            # Charts of one filter selection stay out of the shared backend
+            persist=not any(selection.values()),
+        )
+        st.image(image, width="stretch")
+
+
+@st.cache_resource(max_entries=4)
+def get_table(name: str, version: str, _frame: pd.DataFrame) -> PagedTable:
+    """
+    Process-wide paged view of one of the dataset tables.
 
-ax.legend(wedges, data_counts.index, title="Has Metadata", loc="center")
-ax.axis("equal")
-plt.title("Percentage of Datasets with Donor Metadata")
+    Parameters:
+    name (str): Which table this is, e.g. "published".
+    version (str): The snapshot the frame comes from.
+    _frame (pd.DataFrame): The table, with display column names.
 
-# Display the plot in Streamlit
-plt.tight_layout()
-with col2:
-    st.pyplot(fig)
+    Returns:
+    PagedTable: The table, with its sort orders cached for all sessions.
+    """
+    return PagedTable(_frame)
 
 
-# Count the occurrences of each data access level in the dataframe
-access_level_counts = df["group_name"].value_counts()
+@st.fragment
+def show_table(name: str, frame: pd.DataFrame, version: str = None) -> None:
+    """
+    Display a dataset table one page at a time. Only the visible page is
+    sent to the browser, and paging, sorting or filtering reruns only this
+    fragment.
+
+    Parameters:
+    name (str): Which table this is; also prefixes the widget keys.
+    frame (pd.DataFrame): The table, with display column names.
+    version (str): What the table depends on; the snapshot hash by default.
+    """
+    table = get_table(name, version or snapshot.content_hash, frame)
+    columns = list(frame.columns)
+    page_key = f"{name}_page"
 
+    def first_page():
+        st.session_state[page_key] = 1
 
-# Increase figure size for better readability
+    sort_col, order_col, filter_col, text_col, size_col, page_col = st.columns(
+        [3, 2, 3, 3, 2, 2], vertical_alignment="bottom"
+    )
+    sort_by = sort_col.selectbox(
+        "Sort by",
+        columns,
+        index=None,
+        placeholder="Catalog order",
+        key=f"{name}_sort_by",
+        on_change=first_page,
+    )
+    descending = order_col.toggle(
+        "Descending", key=f"{name}_descending", on_change=first_page
+    )
+    filter_column = filter_col.selectbox(
+        "Filter on", columns, key=f"{name}_filter_column", on_change=first_page
+    )
+    filter_text = text_col.text_input(
+        "Contains", key=f"{name}_filter_text", on_change=first_page
+    )
+    page_size = size_col.selectbox(
+        "Rows per page",
+        PAGE_SIZES,
+        index=(
+            PAGE_SIZES.index(DEFAULT_PAGE_SIZE)
+            if DEFAULT_PAGE_SIZE in PAGE_SIZES
+            else 0
+        ),
+        key=f"{name}_page_size",
+        on_change=first_page,
+    )
+    number = page_col.number_input("Page", min_value=1, step=1, key=page_key)
+
+    query = TableQuery(sort_by, descending, filter_column, filter_text.strip())
+    with span("table", table=name):
+        page = table.page(query, int(number), page_size)
+        st.dataframe(page.rows, hide_index=True, width="stretch")
+    shown = f"{page.start + 1}-{page.start + len(page.rows)}" if page.total else "0"
+    matching = "" if page.total == len(table) else f" matching (of {len(table)})"
+    st.caption(
+        f"Page {page.number} of {page.pages}: rows {shown} of {page.total}{matching}."
+    )
 
-plt.clf()
-plt.figure(figsize=(10, 6))  # Adjust width and height as necessary
 
-# Counting the number of datasets with contributors
-data_counts = df["has_contributors"].value_counts()
-colors = ["#3d5a6c", "#a4c4d7"]
-colors = ["#5b6255", "#cadF9E"]
+FACET_LABELS = {
+    "organ": "Organ",
+    "dataset_type": "Dataset Type",
+    "group_name": "Group Name",
+    "data_access_level": "Data Access Level",
+    "dataset_status": "Dataset Status",
+    "status": "Status",
+}
 
-fig, ax = plt.subplots(figsize=(3, 3))
-wedges, texts, autotexts = ax.pie(
-    data_counts, autopct="%1.1f%%", startangle=90, colors=colors, shadow=True
-)
 
-autotexts[0].set_color("white")
-autotexts[1].set_color("black")
+@st.cache_resource(max_entries=4)
+def get_facets(version: str, _frame: pd.DataFrame) -> FacetIndex:
+    """
+    Process-wide facet bitmaps for one snapshot.
 
-ax.legend(
-    wedges,
-    data_counts.index,
-    title="Contributors",
-    loc="center left",
-    bbox_to_anchor=(1, 0, 0.5, 1),
-)
+    Parameters:
+    version (str): The snapshot the frame comes from.
+    _frame (pd.DataFrame): The full catalog frame.
 
+    Returns:
+    FacetIndex: Bitmaps for every facet in FACET_LABELS.
+    """
+    return FacetIndex.from_frame(_frame, FACET_LABELS)
 
-ax.axis("equal")
-ax.set_title('Distribution of "has contributors"')
 
-# Display the plot in Streamlit
-plt.tight_layout()
-with col3:
-    st.pyplot(fig)
+@st.cache_resource(max_entries=16)
+def get_filtered_snapshot(
+    version: str, key: str, _snapshot: Snapshot, _rows
+) -> Snapshot:
+    """
+    The part of a snapshot matching a facet selection, with its own counts.
 
-# Counting the number of datasets with contacts
-data_counts = df["has_contacts"].value_counts()
+    Parameters:
+    version (str): The snapshot being filtered.
+    key (str): Digest of the selection (see fair.facets.selection_key).
+    _snapshot (Snapshot): The snapshot being filtered.
+    _rows (np.ndarray): Positions of the matching datasets.
 
-plt.clf()
+    Returns:
+    Snapshot: The matching datasets, with a content hash of their own.
+    """
+    return _snapshot.subset(_rows, f"{version}:{key}")
 
 
-colors = ["#5b6255", "#cadF9E"]
-colors = ["#3d5a6c", "#a4c4d7"]
+def facet_filters(facets: FacetIndex) -> dict:
+    """
+    Sidebar multiselects for every facet. Each option shows how many
+    datasets it would match given the choices in the other facets.
 
+    Parameters:
+    facets (FacetIndex): The facet bitmaps of the current snapshot.
 
-fig, ax = plt.subplots(figsize=(6, 6))
-wedges, texts, autotexts = ax.pie(
-    data_counts, autopct="%1.1f%%", startangle=90, colors=colors, shadow=True
-)
+    Returns:
+    dict: The chosen values per facet column.
+    """
+    selection = {
+        column: st.session_state.get(f"facet_{column}", []) for column in FACET_LABELS
+    }
+    counts = facets.counts(selection)
+    st.sidebar.header("Filters")
+    for column, label in FACET_LABELS.items():
+        if column not in counts:
+            continue
+        st.sidebar.multiselect(
+            label,
+            list(counts[column].index),
+            key=f"facet_{column}",
+            format_func=lambda value, c=counts[column]: f"{value} ({c[value]})",
+        )
+    return selection
+
+
+@st.cache_resource
+def get_metrics_server():
+    """
+    Serve the process-wide metrics at /metrics on FAIR_METRICS_PORT.
 
-autotexts[0].set_color("white")
-autotexts[1].set_color("black")
+    Returns:
+    ThreadingHTTPServer: The running server.
+    """
+    return METRICS.serve(DEFAULT_METRICS_PORT)
 
-ax.legend(
-    wedges,
-    data_counts.index,
-    title="Contacts",
-    loc="center left",
-    bbox_to_anchor=(1, 0, 0.5, 1),
-)
 
-ax.axis("equal")
-ax.set_title('Distribution of "has contacts"')
+def debug_panel() -> None:
+    """
+    Sidebar panel with the timings and counters of this server process.
+    """
+    with st.sidebar.expander("Debug"):
+        rates = []
+        for cache in ("payload", "history", "chart"):
+            rate = METRICS.hit_rate(cache)
+            rates.append(f"{cache} {'n/a' if rate is None else f'{rate:.0%}'}")
+        st.caption("Cache hit rates: " + ", ".join(rates))
+        st.dataframe(
+            METRICS.span_frame(),
+            hide_index=True,
+            column_config={
+                "last ms": st.column_config.NumberColumn(format="%.1f"),
+                "mean ms": st.column_config.NumberColumn(format="%.1f"),
+                "max ms": st.column_config.NumberColumn(format="%.1f"),
+                "total s": st.column_config.NumberColumn(format="%.2f"),
+            },
+        )
+        st.dataframe(METRICS.value_frame(), hide_index=True)
+
+
+run_started = time.perf_counter()
+if DEFAULT_METRICS_PORT:
+    get_metrics_server()
+snapshot = snapshot_picker(get_snapshot())
+changes = None
+if not snapshot.frame.empty:
+    changes = get_changes(snapshot.content_hash, snapshot.frame)
+selection = {}
+if not snapshot.frame.empty:
+    facets = get_facets(snapshot.content_hash, snapshot.frame)
+    selection = facet_filters(facets)
+    if any(selection.values()):
+        snapshot = get_filtered_snapshot(
+            snapshot.content_hash,
+            selection_key(selection),
+            snapshot,
+            facets.rows(selection),
+        )
+df = snapshot.published
+df2 = snapshot.unpublished
+summary = snapshot.published_summary
+summary2 = snapshot.unpublished_summary
+## DO NOT MODIFY THIS BLOCK
 
-# Display the plot in Streamlit
-plt.tight_layout()
-with col4:
-    st.pyplot(fig)
+# Convert the dictionary into a DataFrame
 
 
-# Counting the number of datasets with contributors
-data_counts = df["data_access_level"].value_counts()
-colors = ["#5b6255", "#cadF9E"]
+## DO NOT MODIFY THIS BLOCK
 
-fig, ax = plt.subplots(figsize=(3, 3))
-wedges, texts, autotexts = ax.pie(
-    data_counts, autopct="%1.1f%%", startangle=90, colors=colors, shadow=True
-)
+logo_url = "https://hubmapconsortium.org/wp-content/uploads/2019/01/HuBMAP-Retina-Logo-Color-300x110.png"
+st.image(logo_url)
+# Display the logo with column width fitting
 
-autotexts[0].set_color("white")
-autotexts[1].set_color("black")
+title = "# FAIR Assessment of HuBMAP data"
+st.write(title)
 
-ax.legend(
-    wedges,
-    [s.capitalize() for s in data_counts.index],
-    title="Access Level",
-    loc="center left",
-    bbox_to_anchor=(1, 0, 0.5, 1),
-)
+authors = "Bailey, T.; Chen, J.; Esmaeeli, A.; Hernandez, Y.; Ho, M.; Lampejo, M.; Ma, J.; Martinez, G.; Rubio Martinez, V.; Forchap, E.; Mathurin, S.; Omar, Y.; Segil, J.; McLeod, A.; Cao-Berg, I."
+st.write(authors)
 
-ax.axis("equal")
-ax.set_title("Data Access Level Distribution")
+today = pd.Timestamp.today().strftime("%m-%d-%Y")
+st.write(today)
 
-# Display the plot in Streamlit
-plt.tight_layout()
-with col5:
-    st.pyplot(fig)
+if snapshot.age is not None:
+    snapshot_time = format_time(snapshot.fetched_at)
+    st.caption(
+        f"HuBMAP data as of {snapshot_time} ({snapshot.age / 60:.0f} minutes old)"
+    )
 
-# Count the occurrences of each data access level in the dataframe
-access_level_counts = df["group_name"].value_counts()
+abstract = """
+The Human BioMolecular Atlas Program (HuBMAP) aims to create a comprehensive 3D-map representation of the human body and improve data access while developing methods for tissue interrogation applicable to other studies. In its first phase, HuBMAP achieved significant milestones, including the development of critical resources, standardized protocols, innovative imaging and sequencing techniques, and a reliable data integration platform. These efforts have led to the creation of high-resolution molecular and cellular maps that are essential resources for biomedical research. Researchers are expanding the map from 2D to 3D environments, incorporating niche factors such as age and ethnicity. The core value of HuBMAP is to provide freely accessible data via its online portal. Future directions include investigating changes in individual cells and neighborhoods during healthy aging and diseases that will help develop better drugs, predict disease outcomes, and understand disease progression in clinical settings. The program adheres to the FAIR guiding principles for scientific data management and stewardship, ensuring findability, accessibility, interoperability, and reusability of data. We researched these properties of HuBMAP, along with whether it has rich metadata, identifiable titles, standardized communication protocols, and open access to metadata even if the data itself is no longer available.
+"""
+# Anchor point
+st.title("Abstract")
+st.sidebar.markdown("[Abstract](#abstract)", unsafe_allow_html=True)
+st.write(abstract)
 
+about_us = """
+# About Us
+"""
+st.write(about_us)
+# Drawn after the published data, so At a Glance does not wait on Plotly
+sites_map = st.empty()
 
-# Increase figure size for better readability
+intro = """
+The Human BioMolecular Atlas Program (HuBMAP) is an initiative that aims to create a comprehensive multi-scale spatial atlas of the healthy human body. HuBMAP aims to help biomedical researchers visualize how the cells in the human body influence our health and can also help others understand the way in which the human body functions. HuBMAP can only finalize its atlas with the help of data providers, data curators and other contributors. 
 
-plt.clf()
-plt.figure(figsize=(10, 6))  # Adjust width and height as necessary
+Data providers are crucial to HuBMAP, these providers are responsible for producing biological data from various tissues of donors. These tissues are utilized by different types of cutting-edge technologies such as, single cell transcriptomics, bulk tissue arrays, etc. These providers generate high-quality datasets that help form a structure for HuBMAP.
 
-# Start making a bar chart to visualize the data
-# This will create a bar chart where each bar represents a different data access level
-access_level_counts.plot(
-    kind="bar", color="skyblue", width=0.8
-)  # 'width' adjusts the width of the bars
+Additionally, HIVE — the HuBMAP Integration, Visualization, and Engagement team holds the responsibility of curating, integrating, and standardizing the vast amount of datasets. HIVE ensures that the datasets meet quality standards before they become publicly available. HIVE also helps develop analytical tools for scientific researchers to understand and utilize the datasets.
 
-# Add a title to the top of the chart
-plt.title("Research group name", fontsize=16)  # Increase font size for the title
+With all the data provided and curated, contributors then develop innovative tools that enhance data analysis and help transform the data into the atlas. Contributions come from 42 different sites, 14 states, and 4 countries. With these contributions, HuBMAP is able to advance its technological and scientific capabilities.
 
-# Label the x-axis (horizontal axis)
-plt.xlabel(
-    "University", fontsize=14, labelpad=15
-)  # Increase font size for the x-axis label and add padding
+Through the seamless integration of work from data providers, contributors, and HIVE, HuBMAP strives to create a high-tech transformational atlas that fosters inventions of new discoveries in the field of biomedical research.
+"""
+st.title("Introduction")
+st.sidebar.markdown("[Introduction](#introduction)", unsafe_allow_html=True)
+st.write(intro)
 
-# Label the y-axis (vertical axis)
-plt.ylabel("Count", fontsize=14)  # Increase font size for the y-axis label
 
-# Rotate the labels on the x-axis to 45 degrees for better readability
-plt.xticks(
-    rotation=45, fontsize=12, ha="right"
-)  # Increase font size and rotate x-axis labels, align them to the right
+introImg_url = "https://media.springernature.com/full/springer-static/image/art%3A10.1038%2Fs41586-019-1629-x/MediaObjects/41586_2019_1629_Fig1_HTML.png?as=webp"
+st.image(introImg_url, use_column_width=True)
 
-# Add grid lines to the plot
-plt.grid(axis="y", linestyle="--")  # Add horizontal grid lines with dashed style
+introImgCaption = """
+The TMCs will collect tissue samples and generate spatially resolved, single-cell data. Groups involved in TTD and RTI initiatives will develop emerging and more developed technologies, respectively; in later years, these will be implemented at scale. Data from all groups will be rendered useable for the biomedical community by the HuBMAP integration, visualization and engagement (HIVE) teams. The groups will collaborate closely to iteratively refine the atlas as it is gradually realized. (HuBMAP Consortium)
+"""
+st.write(introImgCaption)
 
-# Adjust the layout to make sure everything fits without clipping
-plt.tight_layout()
+# Method = """
 
+method = """
 
-# Display the chart
-with col6:
-    st.pyplot(fig)
+# Overview
+The Human Biomolecular Atlas Program(HuBMAP) funded by the National Institute of Health(NIH), provides spatial molecular data which serves as a way to completely map out the human body to promote intuitive and revolutionary research. However, in order for the research to be comprehensive and understandable by professionals and the public alike, it needs to be Findable, Accessible, Interoperable, and Reusable. The FAIR guidelines provide a path for the HuBMAP data to lessen unavoidable bias, and corrupt data. The purpose of the project by the Carnegie Mellon Summer Academy for Math and Science team, serves as a means to analyze some of the HuBMAP data, and report back on the level to which the data adheres to the first two FAIR principles(Findable and Accessible). 
+"""
 
+st.sidebar.markdown("[Overview](#overview)", unsafe_allow_html=True)
+st.write(method)
 
-# Count the occurrences of each data access level in the dataframe
+st.header("Published Data")
+st.sidebar.markdown("[Published Data](#published-data)", unsafe_allow_html=True)
 
-plt.clf()
-access_counts = df["data_access_level"].value_counts()
-plt.figure(figsize=(10, 6))
+if df.empty and any(selection.values()):
+    st.info("No published datasets match the selected filters.")
+elif df.empty:
+    st.warning("The HuBMAP catalog is unavailable right now, please try again later.")
+else:
+    text = "### At a Glance"
+    st.write(text)
+
+    # At a glance sentences
+    # wordcloud, filled in after the sentences below
+    group_wordcloud = st.empty()
+    number_of_datasets = summary.datasets
+    access_level_protected = summary.by_access_level.get("protected", 0)
+    access_level_public = summary.by_access_level.get("public", 0)
+    dataset_status_derived = summary.by_dataset_status.get("Derived", 0)
+    dataset_status_primary = summary.by_dataset_status.get("Primary", 0)
+
+    number_of_dataset_types = summary.dataset_types
+    number_of_organs = summary.organs
+    number_of_donors = summary.donors
+    number_of_groups = summary.groups
 
-# Generate a list of colors - one for each bar
-colors = ["skyblue", "coral", "lightgreen"]
+    answer = f"""
+    * The number of datasets are **{number_of_datasets}**.
+        * The number of  datasets that are protected is **{access_level_protected}**.
+        * The number of datasets that are public is **{access_level_public}**.
+    * The number of dataset types are **{number_of_dataset_types}**.
+        * The number of datasets with a derived status is **{dataset_status_derived}**.
+        * The number of datasets with a primary status is **{dataset_status_primary}**.
+    * The number of organ types are **{number_of_organs}**.
+    * The number of donors for the datasets are **{number_of_donors}**.
+    * The number of groups for the datasets are **{number_of_groups}**."""
 
-# Start making a bar chart to visualize the data
-access_counts.plot(kind="bar", color=colors)
+    st.write(answer)
 
-# Add a title to the top of the chart
+    # wordcloud, redrawn only when the group frequencies change
+    with group_wordcloud:
+        show_chart(
+            "group_wordcloud",
+            summary.by_group,
+            version=counts_hash(summary.by_group),
+        )
+    # wordcloud
+
+    # At a a glance sentences (closed)
+
+    text = "## Observability"
+    st.write(text)
+
+    text = "### Datasets"
+    st.write(text)
+
+    columns = [
+        "organ",
+        "dataset_type",
+        "group_name",
+        "date_added",
+        "access_level",
+    ]
+    df_display = df[columns].rename(
+        columns={
+            "organ": "Organ",
+            "dataset_type": "Dataset Type",
+            "date_added": "Date Added",
+            "group_name": "Group Name",
+            "access_level": "Data Access Level",
+        },
+    )
+    show_table("published", df_display)
 
-plt.title("Data Access Level Distribution")
+    # Title for Graphs
+    st.header("Graphs")
+    st.sidebar.markdown("[Graphs](#graphs)", unsafe_allow_html=True)
 
-# Label the x-axis (horizontal axis)
-plt.xlabel("Data Access Level")
+    # Creating columns for graphs
 
-# Label the y-axis (vertical axis)
-plt.ylabel("Count")
+    col1, col2, col3, col4, col5, col6, col7 = st.columns(7)
 
-# Rotate the labels on the x-axis to 45 degrees
-plt.xticks(rotation=45)
+    text = "### Datasets"
+    st.write(text)
 
-# Adjust the layout to make sure everything fits without clipping
-plt.tight_layout()
+    text = "### Data access level"
+    st.write(text)
 
-# Display the chart
-with col7:
-    st.pyplot(fig)
+    published_charts = chart_counts(snapshot, PUBLISHED_CHARTS)
+    graph_columns = (col1, col2, col3, col4, col5, col6, col7)
+    for col, (name, counts) in zip(graph_columns, published_charts.items()):
+        with col:
+            show_chart(name, counts)
+with sites_map:
+    st.plotly_chart(sites_map_plot())
 text = "To enlarge graph, click on desired"
 
 
@@ -576,22 +758,17 @@ st.sidebar.markdown("[Unpublished Data](#unpublished-data)", unsafe_allow_html=T
 st.subheader("At A Glance")
 
 
+@timed("at_a_glance")
 def at_a_glance():
-    number_of_datasets = len(df2)
-    access_level_protected = df2["data_access_level"].value_counts()["protected"]
-    dataset_status_derived = df2["dataset_status"].value_counts()["Derived"]
-    dataset_status_primary = df2["dataset_status"].value_counts()["Primary"]
+    number_of_datasets = summary2.datasets
+    access_level_protected = summary2.by_access_level.get("protected", 0)
+    dataset_status_derived = summary2.by_dataset_status.get("Derived", 0)
+    dataset_status_primary = summary2.by_dataset_status.get("Primary", 0)
 
-    dataset_types = df2["dataset_type"].unique()
-    number_of_dataset_types = len(dataset_types)
-    organs = df2["organ"].unique()
-    number_of_organs = len(organs)
-
-    donors = df2["donor_hubmap_id"].unique()
-    number_of_donors = len(donors)
-
-    groups = df2["group_name"].unique()
-    number_of_groups = len(groups)
+    number_of_dataset_types = summary2.dataset_types
+    number_of_organs = summary2.organs
+    number_of_donors = summary2.donors
+    number_of_groups = summary2.groups
 
     answer = f"""
     * The number of unpublished datasets are **{number_of_datasets}**.
@@ -605,130 +782,273 @@ def at_a_glance():
     st.write(answer)
 
 
-columns = [
-    "organ",
-    "dataset_type",
-    "status",
-    "created_timestamp",
-    "data_access_level",
-]
-df_display = df2[columns]
-df_display["created_timestamp"] = df_display["created_timestamp"].apply(
-    lambda time: pd.to_datetime(time, unit="ms").strftime("%m-%d-%Y")
-)
-df_display["data_access_level"] = df_display["data_access_level"].str.capitalize()
-df_display.rename(
-    columns={
-        "organ": "Organ",
-        "dataset_type": "Dataset Type",
-        "created_timestamp": "Date Added",
-        "status": "Status",
-        "data_access_level": "Data Access Level",
-    },
-    inplace=True,
-)
-st.write(df_display)
+if df2.empty and any(selection.values()):
+    st.info("No unpublished datasets match the selected filters.")
+elif snapshot.frame.empty:
+    st.warning("The HuBMAP catalog is unavailable right now, please try again later.")
+elif df2.empty:
+    st.info("There are no unpublished datasets to show.")
+else:
+    columns = [
+        "organ",
+        "dataset_type",
+        "status",
+        "date_added",
+        "access_level",
+    ]
+    df_display = df2[columns].rename(
+        columns={
+            "organ": "Organ",
+            "dataset_type": "Dataset Type",
+            "date_added": "Date Added",
+            "status": "Status",
+            "access_level": "Data Access Level",
+        },
+    )
+    show_table("unpublished", df_display)
 
 
 def unpublished_has_contributors():
     # st.subheader("Unpublished Dataset Plots")
-    data_counts = df2["has_contributors"].value_counts()
-    colors = ["#3d5a6c", "#a4c4d7"]
-    colors = ["#cadF9E", "#5b6255"]
+    show_chart(
+        "unpublished_has_contributors",
+        unpublished_counts["unpublished_has_contributors"],
+    )
 
-    fig, ax = plt.subplots(figsize=(3, 3))
-    wedges, texts, autotexts = ax.pie(
-        data_counts, autopct="%1.1f%%", startangle=90, colors=colors, shadow=True
+
+def unpublished_has_contacts():
+    show_chart(
+        "unpublished_has_contacts", unpublished_counts["unpublished_has_contacts"]
     )
 
-    autotexts[0].set_color("black")
-    autotexts[1].set_color("white")
 
-    ax.legend(
-        wedges,
-        data_counts.index,
-        title="Contributors",
-        loc="center left",
-        bbox_to_anchor=(1, 0, 0.5, 1),
+def unpublished_data_access_level():
+    show_chart(
+        "unpublished_access_level", unpublished_counts["unpublished_access_level"]
     )
-    ax.axis("equal")
-    ax.set_title('Distribution of "has contributors" in Unpublished Data')
-    st.pyplot(fig)
 
 
-def unpublished_has_contacts():
-    data_counts = df2["has_contacts"].value_counts()
-    colors = ["#5b6255", "#cadF9E"]
-    colors = ["#a4c4d7", "#3d5a6c"]
+unpublished_counts = chart_counts(snapshot, UNPUBLISHED_CHARTS)
+UNPUBLISHED_VIEWS = {
+    "At a Glance": at_a_glance,
+    "Contributors Plot": unpublished_has_contributors,
+    "Contacts Plot": unpublished_has_contacts,
+    "Data Access Level Plot": unpublished_data_access_level,
+}
 
-    fig, ax = plt.subplots(figsize=(3, 3))
-    wedges, texts, autotexts = ax.pie(
-        data_counts, autopct="%1.1f%%", startangle=90, colors=colors, shadow=True
-    )
 
-    autotexts[0].set_color("black")
-    autotexts[1].set_color("white")
+# Switching tabs reruns only this fragment, not the whole report
+@st.fragment
+def main():
+    # Tabs track their state, so only the open one runs its view
+    tabs = st.tabs(list(UNPUBLISHED_VIEWS), key="unpublished_view", on_change="rerun")
+    for tab, show in zip(tabs, UNPUBLISHED_VIEWS.values()):
+        if tab.open is not False:
+            with tab:
+                show()
 
-    ax.legend(
-        wedges,
-        data_counts.index,
-        title="Contributors",
-        loc="center left",
-        bbox_to_anchor=(1, 0, 0.5, 1),
-    )
 
-    ax.axis("equal")
-    ax.set_title('Distribution of "has contacts" in Unpublished Data')
-    st.pyplot(fig)
+if __name__ == "__main__" and not df2.empty:
+    main()
 
 
-def unpublished_data_access_level():
-    data_counts = df2["data_access_level"].value_counts()
-    colors = ["#5b6255", "#cadF9E"]
+# FAIR score
+CRITERIA_LABELS = {
+    "has_data": "Has data",
+    "has_donor_metadata": "Has donor metadata",
+    "has_contributors": "Has contributors",
+    "has_contacts": "Has contacts",
+    "public_access": "Public access",
+}
+ROLLUP_LABELS = {
+    "group_name": "Group Name",
+    "organ": "Organ",
+    "dataset_type": "Dataset Type",
+    "status": "Status",
+}
 
-    fig, ax = plt.subplots(figsize=(3, 3))
-    wedges, texts, autotexts = ax.pie(
-        data_counts, autopct="%1.1f%%", startangle=90, colors=colors, shadow=True
+
+@st.cache_resource(max_entries=16)
+def get_scores(version: str, _frame: pd.DataFrame) -> FairScores:
+    """
+    Process-wide FAIR score inputs for one snapshot.
+
+    Parameters:
+    version (str): The snapshot the frame comes from.
+    _frame (pd.DataFrame): All datasets of the snapshot.
+
+    Returns:
+    FairScores: Criteria and rollups, ready to be weighted.
+    """
+    return FairScores.from_frame(_frame)
+
+
+@st.fragment
+def fair_score(scores: FairScores) -> None:
+    """
+    Mean scores, a leaderboard and the score distribution. Changing a
+    weight or the ranking reruns only this fragment.
+
+    Parameters:
+    scores (FairScores): The scores of the datasets shown.
+    """
+    with st.expander("Weights"):
+        columns = st.columns(len(CRITERIA))
+        weights = {
+            criterion: column.slider(
+                CRITERIA_LABELS[criterion],
+                0.0,
+                5.0,
+                DEFAULT_WEIGHTS[criterion],
+                0.5,
+                key=f"weight_{criterion}",
+            )
+            for criterion, column in zip(CRITERIA, columns)
+        }
+
+    means = scores.scores(weights).mean()
+    for column, principle in zip(st.columns(3), ["Findable", "Accessible", "Score"]):
+        column.metric(f"Mean {principle}", f"{means[principle]:.1f}")
+
+    rollup = st.selectbox(
+        "Rank by",
+        list(ROLLUP_LABELS),
+        format_func=ROLLUP_LABELS.get,
+        key="score_rollup",
+    )
+    leaderboard = scores.rollup(rollup, weights).round(1)
+    leaderboard.index = leaderboard.index.astype(str)
+    st.dataframe(
+        leaderboard.rename_axis(ROLLUP_LABELS[rollup]).rename(
+            columns={"datasets": "Datasets"}
+        ),
+        width="stretch",
     )
+    distribution = scores.distribution(weights)
+    show_chart("score_distribution", distribution, version=counts_hash(distribution))
 
-    autotexts[0].set_color("white")
-    autotexts[1].set_color("black")
 
-    ax.legend(
-        wedges,
-        [s.capitalize() for s in data_counts.index],
-        title="Access Level",
-        loc="center left",
-        bbox_to_anchor=(1, 0, 0.5, 1),
+if not snapshot.frame.empty:
+    st.header("FAIR Score")
+    st.sidebar.markdown("[FAIR Score](#fair-score)", unsafe_allow_html=True)
+    st.write(
+        "Each dataset scores the weighted share of these criteria it meets, "
+        "from 0 to 100: Findable counts donor metadata, contributors and "
+        "contacts; Accessible counts having data and public access."
     )
+    fair_score(get_scores(snapshot.content_hash, snapshot.frame))
 
-    ax.axis("equal")
-    ax.set_title("Data Acess Level Distribution in Unpublished Data")
-    # Display the plot in Streamlit
-    st.pyplot(fig)
 
+# Trends over time
+TREND_VIEWS = {
+    "trend_growth": "Cumulative datasets",
+    "trend_backlog": "Published and unpublished",
+    "trend_has_donor_metadata": "Share with donor metadata",
+    "trend_has_contributors": "Share with contributors",
+    "trend_has_contacts": "Share with contacts",
+}
+BREAKDOWN_LABELS = {None: "Whole catalog", "organ": "Organ", "group_name": "Group Name"}
 
-# Creation of side bar (again...)
-def main():
-    # Sidebar with dropdown menu
-    option = st.sidebar.selectbox(
-        "Select an option:",
-        ["At a Glance", "Contributors Plot", "Contacts Plot", "Data Access Level Plot"],
+
+@st.cache_resource(max_entries=8)
+def get_trends(version: str, freq: str, _frame: pd.DataFrame) -> Trends:
+    """
+    Process-wide trend cube for one snapshot and binning.
+
+    Parameters:
+    version (str): The snapshot the frame comes from.
+    freq (str): "M" to bin by month, "Q" by quarter.
+    _frame (pd.DataFrame): All datasets of the snapshot.
+
+    Returns:
+    Trends: Datasets created per period, organ and group.
+    """
+    return Trends.from_frame(_frame, freq)
+
+
+@st.fragment
+def trends(frame: pd.DataFrame, version: str) -> None:
+    """
+    One trend chart, chosen with the controls above it. Changing them
+    reruns only this fragment.
+
+    Parameters:
+    frame (pd.DataFrame): All datasets shown.
+    version (str): The snapshot the frame comes from.
+    """
+    freq_col, view_col, by_col = st.columns(3)
+    freq = freq_col.radio(
+        "Bin by",
+        ["M", "Q"],
+        format_func={"M": "Month", "Q": "Quarter"}.get,
+        horizontal=True,
+        key="trend_freq",
+    )
+    view = view_col.selectbox(
+        "Show", list(TREND_VIEWS), format_func=TREND_VIEWS.get, key="trend_view"
+    )
+    by = by_col.selectbox(
+        "Break down by",
+        list(BREAKDOWN_LABELS),
+        format_func=BREAKDOWN_LABELS.get,
+        key="trend_by",
+        disabled=view == "trend_backlog",
     )
 
-    # Display content based on selected option
-    if option == "At a Glance":
-        at_a_glance()
-    elif option == "Contributors Plot":
-        unpublished_has_contributors()
-    elif option == "Contacts Plot":
-        unpublished_has_contacts()
-    elif option == "Data Access Level Plot":
-        unpublished_data_access_level()
+    cube = get_trends(version, freq, frame)
+    if view == "trend_growth":
+        data = cube.growth(by)
+    elif view == "trend_backlog":
+        data = cube.backlog()
+    else:
+        data = cube.share(view[len("trend_") :], by)
+    show_chart(view, data, version=f"{version}:{freq}:{by}")
 
 
-if __name__ == "__main__":
-    main()
+if not snapshot.frame.empty:
+    st.header("Trends")
+    st.sidebar.markdown("[Trends](#trends)", unsafe_allow_html=True)
+    st.write(
+        "Datasets by when they were created, counting each one with its "
+        "current status and metadata."
+    )
+    trends(snapshot.frame, snapshot.content_hash)
+
+
+# What changed since the previous snapshot
+if changes is not None:
+    before, diff = changes
+    status_changes = diff.status_changes
+    st.header("What Changed")
+    st.sidebar.markdown("[What Changed](#what-changed)", unsafe_allow_html=True)
+    st.write(
+        f"Since the snapshot of {format_time(before.fetched_at)}, "
+        f"**{len(diff.added)}** datasets were added, "
+        f"**{len(diff.removed)}** were removed and "
+        f"**{len(status_changes)}** changed status, "
+        f"**{len(diff.newly_published)}** of them to Published."
+    )
+    change_tables = [
+        ("Newly published", diff.newly_published[["hubmap_id", "previous_status"]]),
+        ("Newly added", diff.added[["hubmap_id", "organ", "dataset_type", "status"]]),
+        ("Status changed", status_changes[["hubmap_id", "previous_status", "status"]]),
+    ]
+    for label, rows in change_tables:
+        if len(rows):
+            with st.expander(f"{label} ({len(rows)})"):
+                st.dataframe(
+                    rows.rename(
+                        columns={
+                            "hubmap_id": "HuBMAP ID",
+                            "previous_status": "Previous Status",
+                            "status": "Status",
+                            "organ": "Organ",
+                            "dataset_type": "Dataset Type",
+                        }
+                    ),
+                    hide_index=True,
+                    width="stretch",
+                )
 
 
 # Introduction paragraph for VR
@@ -810,3 +1130,13 @@ references = """
 st.title("References")
 st.sidebar.markdown("[References](#references)", unsafe_allow_html=True)
 st.write(references)
+
+
+METRICS.observe("run", time.perf_counter() - run_started)
+if DEFAULT_METRICS_FILE:
+    try:
+        METRICS.write(DEFAULT_METRICS_FILE)
+    except OSError as e:
+        print(f"Could not write metrics: {e}")
+if DEBUG_PANEL or st.query_params.get("debug") == "1":
+    debug_panel()
@@ -0,0 +1,81 @@
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from benchmarks.stub_server import StubServer, generate_payload
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "streamlit_app.py")
+UNAVAILABLE = "The HuBMAP catalog is unavailable right now, please try again later."
+
+
+def run_app(url: str, cache_dir: str, session_state: dict) -> dict:
+    """
+    Run the dashboard once against `url`; runs in a fresh process, so the
+    module-level settings and Streamlit's caches start empty.
+    """
+    os.environ["FAIR_DATA_STATUS_URL"] = url
+    os.environ["FAIR_CACHE_DIR"] = cache_dir
+    os.environ["FAIR_HISTORY_DIR"] = os.path.join(cache_dir, "history")
+    os.environ["FAIR_CACHE_BACKEND"] = ""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP, default_timeout=120)
+    for key, value in session_state.items():
+        at.session_state[key] = value
+    at.run()
+    return {
+        "exceptions": [exception.message for exception in at.exception],
+        "warnings": [warning.value for warning in at.warning],
+        "info": [info.value for info in at.info],
+    }
+
+
+@pytest.fixture
+def app(tmp_path):
+    context = multiprocessing.get_context("spawn")
+
+    def run(url, session_state=None):
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            return pool.submit(
+                run_app, url, str(tmp_path), session_state or {}
+            ).result()
+
+    return run
+
+
+def test_empty_catalog(app):
+    with StubServer(json.dumps({"data": []}).encode()) as stub:
+        page = app(stub.url)
+    assert page["exceptions"] == []
+    assert page["warnings"].count(UNAVAILABLE) == 2
+
+
+def test_upstream_down_with_nothing_stored(app):
+    with StubServer(b"", status=503) as stub:
+        page = app(stub.url)
+        assert stub.requests > 0
+    assert page["exceptions"] == []
+    assert page["warnings"].count(UNAVAILABLE) == 2
+    assert "There are no unpublished datasets to show." not in page["info"]
+
+
+def test_selection_matching_nothing(app):
+    content = generate_payload(20)
+    datasets = json.loads(content)["data"]
+    pairs = {(dataset["organ"], dataset["group_name"]) for dataset in datasets}
+    organ, group = next(
+        (organ, group)
+        for organ, _ in pairs
+        for _, group in pairs
+        if (organ, group) not in pairs
+    )
+    with StubServer(content) as stub:
+        page = app(stub.url, {"facet_organ": [organ], "facet_group_name": [group]})
+    assert page["exceptions"] == []
+    assert page["info"] == [
+        "No published datasets match the selected filters.",
+        "No unpublished datasets match the selected filters.",
+    ]
@@ -0,0 +1,102 @@
+import time
+
+import pandas as pd
+import pytest
+
+from fair.backends import RedisBackend, SQLiteBackend, backend_from_url
+from fair.store import SummaryStore
+from fair.summary import FairSummary
+
+
+@pytest.fixture
+def backend(tmp_path):
+    return SQLiteBackend(str(tmp_path / "cache.sqlite3"))
+
+
+def test_set_get_delete(backend):
+    assert backend.get("key") is None
+    backend.set("key", b"one")
+    backend.set("key", b"two")
+    assert backend.get("key") == b"two"
+    backend.delete("key")
+    assert backend.get("key") is None
+
+
+def test_add_only_if_absent(backend):
+    assert backend.add("lock", b"first")
+    assert not backend.add("lock", b"second")
+    assert backend.get("lock") == b"first"
+    backend.delete("lock")
+    assert backend.add("lock", b"third")
+
+
+def test_add_replaces_expired_value(backend):
+    assert backend.add("lock", b"first", ttl=0.05)
+    time.sleep(0.1)
+    assert backend.add("lock", b"second", ttl=60)
+    assert backend.get("lock") == b"second"
+
+
+def test_ttl_expiry(backend):
+    backend.set("short", b"value", ttl=0.05)
+    backend.set("forever", b"value")
+    assert backend.get("short") == b"value"
+    time.sleep(0.1)
+    assert backend.get("short") is None
+    assert backend.get("forever") == b"value"
+
+
+def test_writes_sweep_expired_rows(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "cache.sqlite3"), sweep_interval=0)
+    backend.set("short", b"value", ttl=0.05)
+    backend.set("forever", b"value")
+    time.sleep(0.1)
+    backend.set("other", b"value", ttl=60)
+    with backend._connect() as conn:
+        keys = {key for (key,) in conn.execute("SELECT key FROM cache")}
+    assert keys == {"forever", "other"}
+
+
+def test_backend_from_url(tmp_path):
+    default = backend_from_url("", str(tmp_path))
+    assert isinstance(default, SQLiteBackend)
+    assert default.path == str(tmp_path / "cache.sqlite3")
+
+    path = tmp_path / "elsewhere" / "shared.db"
+    chosen = backend_from_url(f"sqlite:///{path}", str(tmp_path))
+    assert isinstance(chosen, SQLiteBackend)
+    assert chosen.path == str(path)
+    assert path.exists()
+
+    with pytest.raises(ValueError):
+        backend_from_url("memcached://localhost", str(tmp_path))
+
+
+def test_backend_from_url_redis(tmp_path):
+    pytest.importorskip("redis")
+    backend = backend_from_url("redis://localhost:6379/0", str(tmp_path))
+    assert isinstance(backend, RedisBackend)
+
+
+def test_summary_store_round_trip(backend):
+    frame = pd.DataFrame(
+        {
+            "status": ["Published", "Published", "QA"],
+            "data_access_level": ["public", "protected", None],
+            "group_name": ["Stanford TMC", "Stanford TMC", "UCSD TMC"],
+            "donor_hubmap_id": ["HBM1", "HBM2", None],
+            "has_data": [True, False, True],
+        }
+    )
+    summaries = FairSummary.from_frame(frame[:2]), FairSummary.from_frame(frame[2:])
+    store = SummaryStore(backend)
+    assert store.read("hash") is None
+    store.write("hash", summaries)
+
+    for stored, summary in zip(store.read("hash"), summaries):
+        assert stored.datasets == summary.datasets
+        assert stored.donors == summary.donors
+        assert stored.groups == summary.groups
+        assert stored.by_group.to_dict() == summary.by_group.to_dict()
+        assert stored.by_access_level.to_dict() == summary.by_access_level.to_dict()
+        assert stored.flags["has_data"].to_dict() == summary.flags["has_data"].to_dict()
@@ -0,0 +1,31 @@
+from fair.backends import SQLiteBackend
+from fair.charts import CHART_VERSION, ChartCache
+
+KEY = ("has_data", "content-hash")
+
+
+def test_backend_images_are_reused(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "cache.sqlite3"))
+    renders = []
+
+    def render():
+        renders.append(1)
+        return b"png"
+
+    assert ChartCache(backend=backend).get_or_render(KEY, render) == b"png"
+    assert ChartCache(backend=backend).get_or_render(KEY, render) == b"png"
+    assert len(renders) == 1
+
+
+def test_new_chart_version_renders_again(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "cache.sqlite3"))
+    old = ChartCache(backend=backend, version="old")
+    new = ChartCache(backend=backend, version="new")
+
+    assert old.get_or_render(KEY, lambda: b"old png") == b"old png"
+    assert new.get_or_render(KEY, lambda: b"new png") == b"new png"
+    assert (
+        ChartCache(backend=backend, version="new").get_or_render(KEY, lambda: b"unused")
+        == b"new png"
+    )
+    assert ChartCache().version == CHART_VERSION
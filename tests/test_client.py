@@ -0,0 +1,90 @@
+import time
+
+import pytest
+import requests
+
+from fair.client import CircuitBreaker, CircuitOpenError, IngestClient
+
+URL = "http://upstream.invalid/datasets/data-status"
+
+
+class FakeSession:
+    """
+    Stands in for `requests.Session`, answering each GET with the next of
+    `outcomes`: a status code to respond with or an exception to raise.
+    """
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def get(self, url, headers=None, timeout=None):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        response = requests.Response()
+        response.status_code = outcome
+        return response
+
+
+def client(outcomes, retries=1, breaker=None):
+    client = IngestClient(retries=retries, backoff=0, breaker=breaker)
+    client.session = FakeSession(outcomes)
+    return client
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        requests.ConnectionError("reset"),
+        requests.Timeout("read timed out"),
+        requests.exceptions.ChunkedEncodingError("body cut off"),
+        requests.exceptions.ContentDecodingError("bad gzip"),
+    ],
+)
+def test_request_errors_are_retried(error):
+    ingest = client([error, 200])
+    assert ingest.get(URL).status_code == 200
+    assert ingest.session.calls == 2
+    assert ingest.breaker.failures == 0
+
+
+@pytest.mark.parametrize(
+    "error", [requests.exceptions.ChunkedEncodingError("body cut off"), 503]
+)
+def test_failed_request_is_recorded(error):
+    ingest = client([error, error])
+    with pytest.raises(requests.RequestException):
+        ingest.get(URL)
+    assert ingest.session.calls == 2
+    assert ingest.breaker.failures == 1
+
+
+def test_breaker_opens_and_closes():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.2)
+    chunked = requests.exceptions.ChunkedEncodingError("body cut off")
+    ingest = client([chunked, 503, chunked, 200], retries=0, breaker=breaker)
+
+    # Opens after failure_threshold failed requests in a row
+    for _ in range(2):
+        with pytest.raises(requests.RequestException):
+            ingest.get(URL)
+    assert breaker.opened_at is not None
+    with pytest.raises(CircuitOpenError):
+        ingest.get(URL)
+    assert ingest.session.calls == 2
+
+    # After reset_timeout one trial goes through; failing reopens it
+    time.sleep(0.2)
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        ingest.get(URL)
+    with pytest.raises(CircuitOpenError):
+        ingest.get(URL)
+    assert ingest.session.calls == 3
+
+    # A successful trial closes it
+    time.sleep(0.2)
+    assert ingest.get(URL).status_code == 200
+    assert breaker.opened_at is None and breaker.failures == 0
+    assert ingest.session.calls == 4
@@ -0,0 +1,42 @@
+import json
+
+from benchmarks.stub_server import generate_payload
+from fair.delta import SnapshotDiff
+from fair.normalize import normalize
+from fair.parse import parse_datasets
+
+
+def catalog(datasets: list):
+    return normalize(parse_datasets(json.dumps({"data": datasets}).encode()))
+
+
+def test_status_changes_skip_status_missing_on_both_sides():
+    datasets = json.loads(generate_payload(4))["data"]
+    for dataset in datasets:
+        dataset["status"] = None
+    old = catalog(datasets)
+    # Every dataset changes, but only two of them in status
+    for dataset in datasets:
+        dataset["organ"] = "Heart" if dataset["organ"] != "Heart" else "Liver"
+    datasets[0]["status"] = "QA"
+    datasets[1]["status"] = "Published"
+    diff = SnapshotDiff.between(old, catalog(datasets))
+
+    assert len(diff.changed) == 4
+    changes = diff.status_changes
+    assert changes["uuid"].tolist() == [datasets[0]["uuid"], datasets[1]["uuid"]]
+    assert changes["status"].tolist() == ["QA", "Published"]
+    assert changes["previous_status"].isna().all()
+    assert diff.newly_published["uuid"].tolist() == [datasets[1]["uuid"]]
+
+
+def test_status_changes_to_missing():
+    datasets = json.loads(generate_payload(2))["data"]
+    datasets[0]["status"] = "QA"
+    old = catalog(datasets)
+    datasets[0]["status"] = None
+    changes = SnapshotDiff.between(old, catalog(datasets)).status_changes
+
+    assert changes["uuid"].tolist() == [datasets[0]["uuid"]]
+    assert changes["previous_status"].tolist() == ["QA"]
+    assert changes["status"].isna().all()
@@ -0,0 +1,38 @@
+import os
+import stat
+
+import pytest
+
+from fair.files import atomic_write
+from fair.metrics import Metrics
+
+
+@pytest.fixture
+def umask():
+    previous = os.umask(0o022)
+    yield 0o022
+    os.umask(previous)
+
+
+def mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_written_file_is_world_readable(tmp_path, umask):
+    path = tmp_path / "metrics.prom"
+    metrics = Metrics()
+    metrics.increment("runs_total")
+    metrics.write(str(path))
+    assert mode(path) == 0o644
+    assert "fair_runs_total 1.0" in path.read_text()
+
+
+def test_failed_write_keeps_old_file(tmp_path, umask):
+    path = tmp_path / "file.txt"
+    path.write_text("old")
+    with pytest.raises(RuntimeError):
+        with atomic_write(str(path)) as f:
+            f.write("partial")
+            raise RuntimeError("interrupted")
+    assert path.read_text() == "old"
+    assert os.listdir(tmp_path) == ["file.txt"]
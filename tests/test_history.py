@@ -0,0 +1,95 @@
+import json
+import random
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from benchmarks.stub_server import STATUSES, generate_payload
+from fair.delta import SnapshotDiff
+from fair.history import BASE_KEY, DEPTH_KEY, MAX_DELTA_DEPTH, HistoryStore
+from fair.normalize import normalize
+from fair.parse import parse_datasets
+from fair.snapshot import Snapshot
+
+DATASETS = 200
+
+
+def catalog(datasets: list):
+    return normalize(parse_datasets(json.dumps({"data": datasets}).encode()))
+
+
+def edits(steps: int, seed: int = 0):
+    """
+    A catalog followed by `steps` versions of it, each a few datasets
+    away from the one before.
+    """
+    rng = random.Random(seed)
+    datasets = json.loads(generate_payload(DATASETS, seed))["data"]
+    yield datasets
+    for step in range(steps):
+        datasets = [dict(dataset) for dataset in datasets]
+        for _ in range(rng.randint(0, 3)):
+            datasets.pop(rng.randrange(len(datasets)))
+        added = json.loads(generate_payload(rng.randint(0, 3), seed + step + 1))
+        datasets += added["data"]
+        for dataset in rng.sample(datasets, rng.randint(1, 3)):
+            dataset["status"] = rng.choice(STATUSES + (None,))
+        if step == steps // 2:
+            # A delta that removes a category altogether
+            organ = datasets[0]["organ"]
+            datasets = [dataset for dataset in datasets if dataset["organ"] != organ]
+        yield datasets
+
+
+def save_chain(store: HistoryStore, versions) -> list:
+    """
+    Save each version as the next fetch of the one before; returns the
+    content hashes and full frames in order.
+    """
+    saved = []
+    previous = None
+    for i, datasets in enumerate(versions):
+        frame = catalog(datasets)
+        content_hash = f"{i:04d}"
+        diff = None if previous is None else SnapshotDiff.between(previous[1], frame)
+        store.save(
+            Snapshot.from_frame(frame, float(i), content_hash),
+            previous=None if previous is None else previous[0],
+            diff=diff,
+        )
+        previous = (content_hash, frame)
+        saved.append(previous)
+    return saved
+
+
+def by_uuid(frame: pd.DataFrame) -> pd.DataFrame:
+    return frame.sort_values("uuid", ignore_index=True)
+
+
+def test_deltas_rebuild_every_frame(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    saved = save_chain(store, edits(MAX_DELTA_DEPTH + 5))
+
+    depths = []
+    for content_hash, frame in saved:
+        metadata = pq.read_schema(store.path(content_hash)).metadata
+        depths.append(int(metadata.get(DEPTH_KEY, b"0")))
+        assert (BASE_KEY in metadata) == (depths[-1] > 0)
+        pd.testing.assert_frame_equal(by_uuid(store.read(content_hash)), by_uuid(frame))
+        pd.testing.assert_frame_equal(
+            by_uuid(store.read(content_hash, ["uuid", "status"])),
+            by_uuid(frame[["uuid", "status"]]),
+        )
+    # The chain is cut every MAX_DELTA_DEPTH deltas by storing a whole frame
+    assert max(depths) == MAX_DELTA_DEPTH
+    assert depths[: MAX_DELTA_DEPTH + 2] == list(range(MAX_DELTA_DEPTH + 1)) + [0]
+
+
+def test_large_change_stores_the_whole_frame(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    first = json.loads(generate_payload(DATASETS))["data"]
+    second = first[: DATASETS // 2] + json.loads(generate_payload(DATASETS, 1))["data"]
+    (_, _), (content_hash, frame) = save_chain(store, [first, second])
+
+    assert BASE_KEY not in pq.read_schema(store.path(content_hash)).metadata
+    pd.testing.assert_frame_equal(store.read(content_hash), frame)
@@ -0,0 +1,61 @@
+import ast
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from fair.normalize import derivation_type
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "streamlit_app.py")
+DATASET_TYPES = [
+    "CODEX",
+    "snRNA-seq",
+    "CODEX [Cytokit + SPRM]",
+    "snATAC-seq [SnapATAC]",
+    "Visium [Salmon]",
+    "[",
+    "]",
+    "]reversed[",
+    "[]",
+    "only [open",
+    "only close]",
+    "[[nested]]",
+    "",
+    " ",
+    "Some Future Assay",
+    "unknown",
+]
+
+
+def determine_type():
+    """
+    The app's `determine_type`, read from its source without running the
+    page.
+    """
+    with open(APP) as f:
+        tree = ast.parse(f.read())
+    node = next(
+        node
+        for node in tree.body
+        if isinstance(node, ast.FunctionDef) and node.name == "determine_type"
+    )
+    namespace = {}
+    exec(compile(ast.Module([node], type_ignores=[]), APP, "exec"), namespace)
+    return namespace["determine_type"]
+
+
+@pytest.mark.parametrize("dtype", [object, "category"])
+def test_derivation_type_matches_determine_type(dtype):
+    types = pd.Series(DATASET_TYPES, dtype=dtype)
+    expected = [determine_type()(dataset_type) for dataset_type in DATASET_TYPES]
+    assert derivation_type(types).tolist() == expected
+
+
+@pytest.mark.parametrize("missing", [None, np.nan])
+def test_missing_dataset_type_is_primary(missing):
+    # determine_type cannot take a missing type at all
+    with pytest.raises(TypeError):
+        determine_type()(missing)
+    types = pd.Series(["CODEX [Cytokit + SPRM]", missing], dtype="category")
+    assert derivation_type(types).tolist() == ["Derived", "Primary"]
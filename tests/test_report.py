@@ -0,0 +1,31 @@
+import re
+
+from benchmarks.stub_server import generate_payload
+from fair import report
+
+
+def test_report_from_saved_payload_offline(tmp_path, monkeypatch):
+    monkeypatch.setattr(report, "STATIC_MAP", False)
+    snapshot = tmp_path / "data-status.json"
+    snapshot.write_bytes(generate_payload(200))
+    output = tmp_path / "report.html"
+
+    status = report.main(
+        ["--snapshot", str(snapshot), "--output", str(output), "--workers", "2"]
+    )
+
+    assert status == 0
+    page = output.read_text(encoding="utf-8")
+    images = re.findall(r'<img src="data:image/png;base64,[^"]+" alt="([^"]+)">', page)
+    assert images == [
+        "group_wordcloud",
+        *report.PUBLISHED_CHARTS,
+        *report.UNPUBLISHED_CHARTS,
+    ]
+    assert "Contributing sites by state" in page
+    assert "<script" not in page
+    assert not re.search(r'(src|href)="https?:', page)
+    assert {path.name for path in tmp_path.iterdir()} == {
+        "data-status.json",
+        "report.html",
+    }
@@ -0,0 +1,103 @@
+import threading
+import time
+
+from benchmarks.stub_server import StubServer, generate_payload
+from fair.backends import SQLiteBackend
+from fair.client import IngestClient
+from fair.parse import parse_datasets
+from fair.refresh import BackgroundRefresher
+from fair.singleflight import SingleFlight
+from fair.store import SnapshotStore, fetch_payload
+
+THREADS = 16
+DATASETS = 200
+
+
+def run_together(target, threads=THREADS):
+    barrier = threading.Barrier(threads)
+    results = []
+
+    def worker():
+        barrier.wait()
+        results.append(target())
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return results
+
+
+def test_cold_refresher_loads_once(tmp_path):
+    parses = []
+
+    def parse(content):
+        parses.append(1)
+        return parse_datasets(content)
+
+    with StubServer(generate_payload(DATASETS)) as stub:
+        store = SnapshotStore(SQLiteBackend(str(tmp_path / "cache.sqlite3")))
+        client = IngestClient()
+        refresher = BackgroundRefresher(
+            lambda: parse(fetch_payload(stub.url, store, client).content),
+            interval=3600,
+        )
+        results = run_together(refresher.get)
+
+        assert stub.requests == 1
+    assert len(parses) == 1
+    assert all(result is results[0] for result in results)
+    assert len(results[0]) == DATASETS
+
+
+class SlowReturn(SingleFlight):
+    """
+    Widen the gap between a flight releasing its key and its caller
+    getting the result back.
+    """
+
+    def do(self, key, fn):
+        result = super().do(key, fn)
+        time.sleep(0.2)
+        return result
+
+
+def test_caller_after_flight_does_not_reload():
+    loaded = threading.Event()
+    loads = []
+
+    def load():
+        loads.append(1)
+        loaded.set()
+        return len(loads)
+
+    refresher = BackgroundRefresher(load, 3600)
+    refresher._flight = SlowReturn()
+    leader = threading.Thread(target=refresher.get)
+    leader.start()
+    loaded.wait()
+    assert refresher.get() == 1
+    leader.join()
+    assert len(loads) == 1
+
+
+def test_refresher_keeps_value_after_flight():
+    loads = []
+    refresher = BackgroundRefresher(lambda: loads.append(1) or len(loads), 3600)
+
+    assert refresher.get() == 1
+    assert refresher.current == 1
+    assert refresher.get() == 1
+    assert refresher.refresh()
+    assert refresher.get() == 2
+    assert len(loads) == 2
+
+
+def test_failed_refresh_keeps_value():
+    values = iter([1])
+    refresher = BackgroundRefresher(lambda: next(values), 3600)
+
+    assert refresher.get() == 1
+    assert not refresher.refresh()
+    assert refresher.current == 1
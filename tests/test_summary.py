@@ -0,0 +1,101 @@
+import json
+import random
+
+import pytest
+
+from benchmarks.stub_server import STATUSES, generate_payload
+from fair.delta import SnapshotDiff
+from fair.normalize import normalize
+from fair.parse import parse_datasets
+from fair.snapshot import Snapshot
+from fair.summary import FairSummary
+
+DATASETS = 200
+
+
+def catalog(datasets: list):
+    return normalize(parse_datasets(json.dumps({"data": datasets}).encode()))
+
+
+def payload(seed: int = 0, datasets: int = DATASETS) -> list:
+    return json.loads(generate_payload(datasets, seed))["data"]
+
+
+def random_edit(datasets: list, rng: random.Random, seed: int) -> list:
+    """
+    A copy of `datasets` with a few removed, added and changed at random.
+    """
+    datasets = [dict(dataset) for dataset in datasets]
+    for _ in range(rng.randint(0, 5)):
+        datasets.pop(rng.randrange(len(datasets)))
+    datasets += payload(seed, rng.randint(0, 5))
+    for dataset in rng.sample(datasets, rng.randint(0, 5)):
+        dataset["status"] = rng.choice(STATUSES + (None,))
+    for dataset in rng.sample(datasets, rng.randint(0, 5)):
+        dataset[rng.choice(("organ", "group_name", "has_data"))] = None
+    return datasets
+
+
+def assert_updated_like_recounted(old: list, new: list):
+    before, after = catalog(old), catalog(new)
+    updated = Snapshot.from_frame(before).updated(
+        after, SnapshotDiff.between(before, after)
+    )
+    recounted = Snapshot.from_frame(after)
+    for name in ("published_summary", "unpublished_summary"):
+        assert (
+            getattr(updated, name).to_dict() == getattr(recounted, name).to_dict()
+        ), name
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_random_edits(seed):
+    rng = random.Random(seed)
+    datasets = payload()
+    # Apply a few edits in a row, each to the result of the last
+    for step in range(5):
+        edited = random_edit(datasets, rng, seed=1000 * (seed + 1) + step)
+        assert_updated_like_recounted(datasets, edited)
+        datasets = edited
+
+
+def test_add():
+    datasets = payload()
+    assert_updated_like_recounted(datasets, datasets + payload(seed=1, datasets=3))
+
+
+def test_remove():
+    datasets = payload()
+    assert_updated_like_recounted(datasets, datasets[3:])
+
+
+def test_status_change():
+    datasets = payload()
+    edited = [dict(dataset) for dataset in datasets]
+    published = next(i for i, d in enumerate(edited) if d["status"] == "Published")
+    unpublished = next(i for i, d in enumerate(edited) if d["status"] != "Published")
+    edited[published]["status"] = "QA"
+    edited[unpublished]["status"] = "Published"
+    assert_updated_like_recounted(datasets, edited)
+
+
+def test_delta_removes_a_category():
+    datasets = payload()
+    organ = datasets[0]["organ"]
+    edited = [dataset for dataset in datasets if dataset["organ"] != organ]
+    assert_updated_like_recounted(datasets, edited)
+
+    before = FairSummary.from_frame(catalog(datasets))
+    removed = catalog([dataset for dataset in datasets if dataset["organ"] == organ])
+    updated = before.updated(removed, removed.iloc[:0])
+    assert organ not in updated.value_counts["organ"]
+    assert updated.organs == before.organs - 1
+    assert updated.to_dict() == FairSummary.from_frame(catalog(edited)).to_dict()
+
+
+def test_delta_adds_a_category():
+    datasets = payload()
+    added = payload(seed=1, datasets=2)
+    for dataset in added:
+        dataset["organ"] = "Bladder"
+    assert_updated_like_recounted(datasets, datasets + added)